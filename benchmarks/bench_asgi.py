@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from common import create_user_and_login, http_load, seed_clients, start_server, stop_server
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Modo WSGI (gunicorn gthread) vs ASGI (uvicorn + AsyncSession) con N conexiones concurrentes")
+    parser.add_argument("-n", "--requests", type=int, default=20000, help="Peticiones por modo (default: 20000)")
+    parser.add_argument("-c", "--connections", type=int, default=500, help="Conexiones concurrentes (default: 500)")
+    parser.add_argument("-w", "--workers", type=int, default=2, help="Procesos por servidor (default: 2, como el Dockerfile)")
+    parser.add_argument("--threads", type=int, default=4, help="Hilos por worker gthread (default: 4)")
+    parser.add_argument("--seed", type=int, default=200, help="Clientes del usuario del benchmark (default: 200)")
+    parser.add_argument("--port", type=int, default=5077)
+    parser.add_argument("--paths", default="/clients?size=20,/clients?size=20&cursor=,/auth", help="GETs a rotar, separados por comas")
+    args = parser.parse_args(argv)
+
+    _, token = create_user_and_login()
+    seed_clients(token, args.seed)
+    headers = {"Authorization": f"Bearer {token}"}
+    paths = [p for p in args.paths.split(",") if p]
+    bind = f"127.0.0.1:{args.port}"
+    modes = {
+        "wsgi_gthread": [sys.executable, "-m", "gunicorn", "-w", str(args.workers), "-k", "gthread", "--threads", str(args.threads), "-b", bind, "src.app:app"],
+        "asgi_uvicorn": [sys.executable, "-m", "uvicorn", "--workers", str(args.workers), "--host", "127.0.0.1", "--port", str(args.port), "--no-access-log", "src.asgi:app"],
+    }
+    results = {}
+    for name, command in modes.items():
+        proc = start_server(command, port=args.port)
+        try:
+            http_load("127.0.0.1", args.port, paths, headers=headers, requests=min(args.requests, 500), connections=min(args.connections, 50))  # calentamiento
+            results[name] = http_load("127.0.0.1", args.port, paths, headers=headers, requests=args.requests, connections=args.connections)
+        finally:
+            stop_server(proc)
+    print(json.dumps({"paths": paths, "workers": args.workers, "results": results}, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import argparse
+import json
+
+from common import app, create_user_and_login, run_load, seed_clients
+
+from src.utils.principal_cache import principal_cache
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="QPS de GET /clients con y sin caché de principal")
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="Peticiones por modo (default: 2000)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Hilos concurrentes (default: 4)")
+    parser.add_argument("--clients", type=int, default=20, help="Clientes a sembrar para el usuario (default: 20)")
+    args = parser.parse_args(argv)
+
+    _, token = create_user_and_login()
+    seed_clients(token, args.clients)
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def list_clients() -> None:
+        r = client.get("/clients?page=1&size=10", headers=headers)
+        assert r.status_code == 200
+
+    ttl = principal_cache.ttl_seconds
+    results = {}
+    try:
+        principal_cache.ttl_seconds = 0
+        results["cache_off"] = run_load(list_clients, requests=args.requests, concurrency=args.concurrency)
+        principal_cache.ttl_seconds = ttl or 30
+        principal_cache.clear()
+        results["cache_on"] = run_load(list_clients, requests=args.requests, concurrency=args.concurrency)
+        results["cache_stats"] = principal_cache.stats()
+    finally:
+        principal_cache.ttl_seconds = ttl
+    off, on = results["cache_off"]["qps"], results["cache_on"]["qps"]
+    results["qps_gain_pct"] = round((on - off) / off * 100, 1) if off else None
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import json
+import uuid
+
+from common import app, create_user_and_login, random_nit, run_load
+
+from sqlalchemy import event
+
+from src.database import engine
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Latencia de POST /clients y sentencias SQL por creación")
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="Clientes a crear (default: 2000)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Hilos concurrentes (default: 4)")
+    args = parser.parse_args(argv)
+
+    _, token = create_user_and_login()
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    r = client.post("/companies", json={"nit": random_nit(), "business_name": "Create S.A.S."}, headers=headers)
+    company_id = r.get_json()["id"]
+
+    def create() -> None:
+        tag = uuid.uuid4().hex[:12]
+        r = client.post("/clients", json={"company_id": company_id, "email": f"n_{tag}@example.com", "phone": f"+57-{tag}"}, headers=headers)
+        assert r.status_code == 201, r.get_json()
+
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, params, context, executemany):
+        statements.append(statement.split(None, 1)[0].upper())
+
+    client.get("/auth", headers=headers)  # calienta la caché de principal
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        create()
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    print(json.dumps({
+        "statements_per_create": statements,
+        "load": run_load(create, requests=args.requests, concurrency=args.concurrency),
+    }, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
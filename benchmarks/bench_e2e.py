@@ -0,0 +1,296 @@
+"""Benchmark de punta a punta: siembra la base a escala, levanta la app WSGI real con gunicorn y
+la carga por HTTP con mezclas de escenarios. Emite JSON (throughput y p50/p95/p99 por escenario y
+por operación) para comparar corridas entre commits (--out / --compare).
+
+Pensado para un PostgreSQL local dedicado (DATABASE_URL): las filas sembradas se reconocen por el
+dominio @e2e.example.com y el prefijo "E2E " y se reutilizan entre corridas con la misma escala.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+from urllib.parse import quote
+
+from common import NAMES, PROJECT_ROOT, SURNAMES, HttpRequest, http_mix, start_server, stop_server
+
+from sqlalchemy import delete, func, select
+
+from scripts.generate_data import Spec, load, password_hash
+from src.database import SessionLocal
+from src.models.client import Client
+from src.models.company import Company
+from src.models.user import User
+from src.models.user_client import UserClient
+from src.utils.cursor import encode_cursor
+from src.utils.jwt import create_access_token
+
+
+DOMAIN = "e2e.example.com"
+PASSWORD = "benchpass123"
+
+# (compañías, clientes, usuarios)
+SCALES = {
+    "small": (100, 10_000, 500),
+    "medium": (1_000, 500_000, 5_000),
+    "large": (10_000, 5_000_000, 50_000),
+}
+
+# Escenario -> pesos por operación
+SCENARIOS: Dict[str, Dict[str, int]] = {
+    "login_storm": {"login": 1},
+    "search": {"search": 1},
+    "deep_pagination": {"page_offset": 1, "page_keyset": 1},
+    "churn": {"create": 1, "update": 1},
+    "auth": {"auth": 1},
+    "mixed": {"auth": 30, "search": 25, "get": 15, "page_keyset": 10, "create": 5, "update": 10, "login": 5},
+}
+
+
+def _e2e_counts(db) -> tuple[int, int, int]:
+    companies = db.execute(select(func.count()).select_from(Company).where(Company.business_name.like("E2E %"))).scalar_one()
+    clients = db.execute(select(func.count()).select_from(Client).where(Client.email.like(f"%@{DOMAIN}"))).scalar_one()
+    users = db.execute(select(func.count()).select_from(User).where(User.email.like(f"%@{DOMAIN}"))).scalar_one()
+    return companies, clients, users
+
+
+def reset(db) -> None:
+    users = select(User.id).where(User.email.like(f"%@{DOMAIN}"))
+    companies = select(Company.id).where(Company.business_name.like("E2E %"))
+    db.execute(delete(UserClient).where(UserClient.user_id.in_(users)))
+    db.execute(delete(Client).where(Client.company_id.in_(companies)))
+    db.execute(delete(Company).where(Company.id.in_(companies)))
+    db.execute(delete(User).where(User.email.like(f"%@{DOMAIN}")))
+    db.commit()
+
+
+def seed(db, *, companies: int, clients: int, users: int, seed: int, workers: int) -> Dict[str, Any]:
+    """Siembra con scripts/generate_data.py (COPY en paralelo en PostgreSQL), determinista por `seed`."""
+    db.commit()  # sin transacción abierta mientras escriben los workers
+    url = db.get_bind().url
+    spec = Spec(
+        seed=seed,
+        companies=companies,
+        clients=clients,
+        users=users,
+        password_hash=password_hash(PASSWORD, seed),
+        domain=DOMAIN,
+        company_prefix="E2E ",
+    )
+    target = "copy" if url.get_backend_name() == "postgresql" else "insert"
+    return load(spec, target=target, destination=url.render_as_string(hide_password=False), workers=workers if target == "copy" else 1)
+
+
+class Workload:
+    """Arma las peticiones de cada operación con datos reales de la base (muestras de ids, emails, cursores)."""
+
+    def __init__(self, db, *, seed: int, tokens: int = 256, sample: int = 2000, size: int = 20):
+        self.rng = random.Random(seed)
+        self.size = size
+        users = db.execute(select(User.id, User.email).where(User.email.like(f"%@{DOMAIN}")).order_by(User.id).limit(sample)).all()
+        clients = db.execute(
+            select(Client.id, Client.company_id, Client.contact_name, Client.email, Client.phone, Client.created_at)
+            .where(Client.email.like(f"%@{DOMAIN}")).order_by(Client.id).limit(sample)
+        ).all()
+        if not users or not clients:
+            raise SystemExit("sin datos E2E sembrados: ejecutar sin --skip-seed")
+        self.emails = [u.email for u in users]
+        # Tokens emitidos aquí (mismo JWT_SECRET que el servidor): la carga no depende de /login
+        self.tokens = [f"Bearer {create_access_token({'sub': u.id, 'ver': 0})}" for u in users[:tokens]]
+        self.clients = clients
+        self.company_ids = sorted({c.company_id for c in clients})
+        self.total = db.execute(select(func.count()).select_from(Client)).scalar_one()
+        # Emails/teléfonos de creación únicos entre escenarios, calentamientos y corridas; el
+        # subdominio los deja fuera del conteo de la siembra (se borran con su compañía en --reset)
+        self.run = uuid.uuid4().hex[:8]
+        self.created = itertools.count()
+        self.operations: Dict[str, Callable[[int], HttpRequest]] = {
+            "login": self.login,
+            "auth": self.auth,
+            "search": self.search,
+            "get": self.get,
+            "page_offset": self.page_offset,
+            "page_keyset": self.page_keyset,
+            "create": self.create,
+            "update": self.update,
+        }
+
+    def _headers(self, body: bool = False) -> Dict[str, str]:
+        headers = {"Authorization": self.rng.choice(self.tokens)}
+        if body:
+            headers["Content-Type"] = "application/json"
+        return headers
+
+    @staticmethod
+    def _json(payload: Dict[str, Any]) -> bytes:
+        return json.dumps(payload).encode()
+
+    def login(self, n: int) -> HttpRequest:
+        body = self._json({"identifier": self.rng.choice(self.emails), "password": PASSWORD})
+        return "login", "POST", "/login", {"Content-Type": "application/json"}, body
+
+    def auth(self, n: int) -> HttpRequest:
+        return "auth", "GET", "/auth", self._headers(), None
+
+    def search(self, n: int) -> HttpRequest:
+        q = quote(self.rng.choice(NAMES if n % 2 else SURNAMES))
+        return "search", "GET", f"/clients?q={q}&size={self.size}&total=estimate", self._headers(), None
+
+    def get(self, n: int) -> HttpRequest:
+        return "get", "GET", f"/clients/{self.rng.choice(self.clients).id}", self._headers(), None
+
+    def page_offset(self, n: int) -> HttpRequest:
+        last = max(1, self.total // self.size)
+        page = self.rng.randint(max(1, last // 2), last)
+        return "page_offset", "GET", f"/clients?size={self.size}&page={page}&total=none", self._headers(), None
+
+    def page_keyset(self, n: int) -> HttpRequest:
+        # Cursor de un cliente cualquiera: páginas a cualquier profundidad sin recorrer las anteriores
+        c = self.rng.choice(self.clients)
+        return "page_keyset", "GET", f"/clients?size={self.size}&total=none&cursor={encode_cursor(c.created_at, c.id)}", self._headers(), None
+
+    def create(self, n: int) -> HttpRequest:
+        tag = f"{self.run}{next(self.created)}"
+        body = self._json({"company_id": self.rng.choice(self.company_ids), "contact_name": f"Churn {tag}", "email": f"{tag}@churn.{DOMAIN}", "phone": f"+57-1{tag}"})
+        return "create", "POST", "/clients", self._headers(body=True), body
+
+    def update(self, n: int) -> HttpRequest:
+        c = self.rng.choice(self.clients)
+        body = self._json({"company_id": c.company_id, "contact_name": f"{c.contact_name.split(' #')[0]} #{n}", "email": c.email, "phone": c.phone})
+        return "update", "PUT", f"/clients/{c.id}", self._headers(body=True), body
+
+    def mix(self, weights: Dict[str, int]) -> Callable[[int], HttpRequest]:
+        names = list(weights)
+        cumulative = [sum(weights[name] for name in names[: i + 1]) for i in range(len(names))]
+
+        def next_request(n: int) -> HttpRequest:
+            pick = self.rng.random() * cumulative[-1]
+            name = next(name for name, bound in zip(names, cumulative) if pick < bound)
+            return self.operations[name](n)
+
+        return next_request
+
+
+# Variables que cambian el comportamiento del servidor: se registran con el resultado
+_SERVER_ENV = (
+    "AUTH_MODE", "BCRYPT_ROUNDS", "PASSWORD_HASH_WORKERS", "DB_POOL_SIZE", "DB_MAX_OVERFLOW",
+    "DATABASE_REPLICA_URLS", "CACHE_BACKEND", "AUTH_CACHE_TTL_SECONDS", "COMPANY_CACHE_TTL_SECONDS",
+    "METRICS_ENABLED", "QUERY_BUDGET_MODE", "ORM_RELATIONSHIP_LAZY",
+)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(base: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Variación relativa (%) de qps y percentiles por escenario frente a una corrida anterior."""
+    diff: Dict[str, Any] = {}
+    for name, result in current["scenarios"].items():
+        previous = base.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        diff[name] = {
+            key: round((result[key] - previous[key]) / previous[key] * 100, 1) if previous[key] else None
+            for key in ("qps", "p50_ms", "p95_ms", "p99_ms")
+        }
+    return {"base_commit": base.get("meta", {}).get("commit"), "pct_change": diff}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Carga HTTP de punta a punta contra gunicorn con escenarios mixtos")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Escala de la siembra (default: small)")
+    parser.add_argument("--companies", type=int, help="Sobrescribe las compañías de --scale")
+    parser.add_argument("--clients", type=int, help="Sobrescribe los clientes de --scale")
+    parser.add_argument("--users", type=int, help="Sobrescribe los usuarios de --scale")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de datos y de la carga (default: 42)")
+    parser.add_argument("--skip-seed", action="store_true", help="Usa los datos E2E ya sembrados, sin verificar la escala")
+    parser.add_argument("--seed-workers", type=int, default=os.cpu_count() or 1, help="Procesos de la siembra (default: CPUs)")
+    parser.add_argument("--reset", action="store_true", help="Borra los datos E2E antes de sembrar")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Separados por coma (default: {','.join(SCENARIOS)})")
+    parser.add_argument("-n", "--requests", type=int, default=5000, help="Peticiones por escenario (default: 5000)")
+    parser.add_argument("-c", "--connections", type=int, default=64, help="Conexiones concurrentes (default: 64)")
+    parser.add_argument("--warmup", type=int, default=200, help="Peticiones de calentamiento por escenario (default: 200)")
+    parser.add_argument("-w", "--workers", type=int, default=2, help="Workers de gunicorn (default: 2, como el Dockerfile)")
+    parser.add_argument("--threads", type=int, default=4, help="Hilos por worker gthread (default: 4)")
+    parser.add_argument("--port", type=int, default=5078)
+    parser.add_argument("--out", help="Escribe el resultado JSON en este archivo además de imprimirlo")
+    parser.add_argument("--compare", help="JSON de una corrida anterior: agrega la variación por escenario")
+    args = parser.parse_args(argv)
+
+    scenarios = [name for name in args.scenarios.split(",") if name]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"escenarios desconocidos: {', '.join(sorted(unknown))}")
+    companies, clients, users = SCALES[args.scale]
+    companies = args.companies if args.companies is not None else companies
+    clients = args.clients if args.clients is not None else clients
+    users = args.users if args.users is not None else users
+
+    db = SessionLocal()
+    try:
+        seeded = None
+        if args.reset:
+            reset(db)
+        if not args.skip_seed:
+            counts = _e2e_counts(db)
+            if counts == (0, 0, 0):
+                seeded = seed(db, companies=companies, clients=clients, users=users, seed=args.seed, workers=args.seed_workers)
+            elif counts != (companies, clients, users):
+                raise SystemExit(f"datos E2E con otra escala {counts}: usar --reset o --skip-seed")
+        dialect = db.get_bind().dialect.name
+        workload = Workload(db, seed=args.seed)
+    finally:
+        db.close()
+
+    bind = f"127.0.0.1:{args.port}"
+    command = [sys.executable, "-m", "gunicorn", "-w", str(args.workers), "-k", "gthread", "--threads", str(args.threads), "-b", bind, "src.app:app"]
+    results: Dict[str, Any] = {}
+    proc = start_server(command, port=args.port)
+    try:
+        for name in scenarios:
+            next_request = workload.mix(SCENARIOS[name])
+            if args.warmup:
+                http_mix("127.0.0.1", args.port, next_request, requests=args.warmup, connections=min(args.connections, 16))
+            results[name] = http_mix("127.0.0.1", args.port, next_request, requests=args.requests, connections=args.connections)
+    finally:
+        stop_server(proc)
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": dialect,
+            "scale": {"companies": companies, "clients": clients, "users": users, "seed": args.seed},
+            "seeded": seeded,
+            "server": {"workers": args.workers, "threads": args.threads, "env": {k: v for k, v in os.environ.items() if k in _SERVER_ENV}},
+            "load": {"requests": args.requests, "connections": args.connections, "warmup": args.warmup},
+        },
+        "scenarios": results,
+    }
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["compare"] = compare(json.load(f), report)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from common import app, create_user_and_login, random_nit
+
+from sqlalchemy import insert
+
+from src.database import SessionLocal
+from src.models.client import Client, ClientStatus
+from src.models.user_client import UserClient
+
+
+def seed(user_id: str, company_id: str, count: int, batch: int = 10000) -> None:
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        for start in range(0, count, batch):
+            rows = []
+            for i in range(start, min(count, start + batch)):
+                ts = now - timedelta(milliseconds=i)
+                rows.append({
+                    "id": str(uuid.uuid4()),
+                    "company_id": company_id,
+                    "contact_name": f"Cliente {i}",
+                    "email": f"x{i}_{uuid.uuid4().hex[:8]}@example.com",
+                    "status": ClientStatus.ACTIVE,
+                    "created_at": ts,
+                    "updated_at": ts,
+                })
+            db.execute(insert(Client), rows)
+            db.execute(insert(UserClient), [{"user_id": user_id, "client_id": r["id"]} for r in rows])
+            db.commit()
+    finally:
+        db.close()
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss en KB (Linux)
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="GET /clients/export: filas/seg y RSS máximo del proceso")
+    parser.add_argument("--rows", type=int, default=1000000, help="Clientes a sembrar y exportar (default: 1000000)")
+    parser.add_argument("--format", default="ndjson", choices=["ndjson", "csv"])
+    args = parser.parse_args(argv)
+
+    user_id, token = create_user_and_login()
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    r = client.post("/companies", json={"nit": random_nit(), "business_name": "Export S.A.S."}, headers=headers)
+    seed(user_id, r.get_json()["id"], args.rows)
+
+    rss_before = max_rss_mb()
+    started = time.perf_counter()
+    r = client.get(f"/clients/export?format={args.format}", headers=headers, buffered=False)
+    lines = size = 0
+    for chunk in r.response:
+        lines += chunk.count(b"\n")
+        size += len(chunk)
+    r.close()
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "format": args.format,
+        "lines": lines,
+        "bytes": size,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_second": round(lines / elapsed, 1) if elapsed > 0 else 0.0,
+        "max_rss_mb_before_export": rss_before,
+        "max_rss_mb_after_export": max_rss_mb(),
+    }, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from common import app, create_user_and_login, run_load, seed_clients
+
+from flask.json.provider import DefaultJSONProvider
+
+from src.utils.json_provider import OrjsonProvider
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return round(best * 1000, 3)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="GET /clients de 500 items: provider JSON de Flask vs orjson")
+    parser.add_argument("--size", type=int, default=500, help="Items por página (default: 500)")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="Peticiones por provider")
+    parser.add_argument("--repeat", type=int, default=50, help="Repeticiones de dumps/loads; se reporta la mejor")
+    args = parser.parse_args(argv)
+
+    _, token = create_user_and_login()
+    seed_clients(token, args.size)
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"/clients?size={args.size}"
+
+    results = {}
+    original = app.json
+    try:
+        for name, provider in (("flask", DefaultJSONProvider(app)), ("orjson", OrjsonProvider(app))):
+            app.json = provider
+            body = client.get(url, headers=headers).get_data()
+            with app.app_context():
+                payload = provider.loads(body)
+                results[name] = {
+                    "http": run_load(lambda: client.get(url, headers=headers), requests=args.requests),
+                    "dumps_ms": best_of(lambda: provider.response(payload), args.repeat),
+                    "loads_ms": best_of(lambda: provider.loads(body), args.repeat),
+                    "bytes": len(body),
+                }
+    finally:
+        app.json = original
+    print(json.dumps({"size": args.size, "results": results}, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
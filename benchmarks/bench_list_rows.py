@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from common import random_nit  # noqa: F401  (inicializa sys.path)
+
+from sqlalchemy import insert, select
+
+from src.dao.client_dao import ClientDAO
+from src.database import SessionLocal
+from src.models.client import Client, ClientStatus
+from src.models.company import Company, CompanyStatus
+from src.services.client_service import ClientService
+
+
+def seed(count: int) -> str:
+    """Inserta una compañía y `count` clientes; retorna el company_id."""
+    now = datetime.now(timezone.utc)
+    company_id = str(uuid.uuid4())
+    db = SessionLocal()
+    try:
+        db.execute(insert(Company), [{
+            "id": company_id,
+            "nit": random_nit(),
+            "business_name": "Bench Rows S.A.S.",
+            "status": CompanyStatus.ACTIVE,
+            "created_at": now,
+            "updated_at": now,
+        }])
+        rows = []
+        for i in range(count):
+            tag = uuid.uuid4().hex[:10]
+            ts = now - timedelta(milliseconds=i)
+            rows.append({
+                "id": str(uuid.uuid4()),
+                "company_id": company_id,
+                "contact_name": f"Cliente {tag}",
+                "email": f"r_{tag}@example.com",
+                "phone": f"+57-3{tag}",
+                "status": ClientStatus.ACTIVE,
+                "created_at": ts,
+                "updated_at": ts,
+            })
+        db.execute(insert(Client), rows)
+        db.commit()
+    finally:
+        db.close()
+    return company_id
+
+
+def orm_path(db, size: int) -> list[dict]:
+    # Camino anterior: entidades ORM -> DTO validado -> dict
+    clients = db.execute(select(Client).order_by(Client.created_at.desc(), Client.id.desc()).limit(size)).scalars().all()
+    return [ClientService._to_dto(c).model_dump() for c in clients]
+
+
+def fast_path(db, size: int) -> list[dict]:
+    # Camino de listados: filas Core -> DTO sin validar (model_construct) -> dict
+    rows = db.execute(ClientDAO(db).build_query().limit(size)).all()
+    return [ClientService._row_to_dto(r, False).model_dump() for r in rows]
+
+
+def measure(fn, size: int, repeat: int) -> dict:
+    """Mejor tiempo de CPU (process_time) y de reloj sobre `repeat` ejecuciones con sesión nueva."""
+    best_cpu = best_wall = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            c0, w0 = time.process_time(), time.perf_counter()
+            rows = len(fn(db, size))
+            best_cpu = min(best_cpu, time.process_time() - c0)
+            best_wall = min(best_wall, time.perf_counter() - w0)
+        finally:
+            db.close()
+    return {
+        "rows": rows,
+        "cpu_ms": round(best_cpu * 1000, 3),
+        "wall_ms": round(best_wall * 1000, 3),
+        "cpu_us_per_row": round(best_cpu * 1e6 / rows, 3) if rows else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="CPU por fila: listado con entidades ORM vs filas Core + model_construct")
+    parser.add_argument("--size", type=int, default=1000, help="Filas por página (default: 1000)")
+    parser.add_argument("--repeat", type=int, default=20, help="Repeticiones; se reporta la mejor")
+    parser.add_argument("--seed", type=int, default=0, help="Clientes sintéticos a insertar antes de medir")
+    args = parser.parse_args(argv)
+
+    if args.seed:
+        seed(args.seed)
+    orm = measure(orm_path, args.size, args.repeat)
+    fast = measure(fast_path, args.size, args.repeat)
+    saved = None
+    if orm["cpu_us_per_row"] and fast["cpu_us_per_row"]:
+        saved = round(orm["cpu_us_per_row"] - fast["cpu_us_per_row"], 3)
+    print(json.dumps({"size": args.size, "orm": orm, "fast": fast, "cpu_us_saved_per_row": saved}, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
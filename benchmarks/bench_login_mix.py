@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+
+from common import app, create_user_and_login, run_load, seed_clients, unique_email
+
+from src.utils import security
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Latencia de GET /clients durante una ráfaga de logins")
+    parser.add_argument("-n", "--requests", type=int, default=1000, help="Peticiones GET /clients por modo (default: 1000)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Hilos GET /clients (default: 4)")
+    parser.add_argument("--login-threads", type=int, default=8, help="Hilos haciendo login en bucle (default: 8)")
+    parser.add_argument("--workers", type=int, default=2, help="Procesos del pool de bcrypt en modo pool (default: 2)")
+    args = parser.parse_args(argv)
+
+    password = "benchpass123"
+    email = unique_email()
+    _, token = create_user_and_login(password, email=email)
+    seed_clients(token, 10)
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def list_clients() -> None:
+        assert client.get("/clients?page=1&size=10", headers=headers).status_code == 200
+
+    def measure(with_logins: bool) -> dict:
+        stop = threading.Event()
+        codes: dict[int, int] = {}
+
+        def login_storm() -> None:
+            c = app.test_client()
+            while not stop.is_set():
+                r = c.post("/login", json={"identifier": email, "password": password})
+                codes[r.status_code] = codes.get(r.status_code, 0) + 1
+
+        storm = [threading.Thread(target=login_storm) for _ in range(args.login_threads if with_logins else 0)]
+        for t in storm:
+            t.start()
+        try:
+            result = run_load(list_clients, requests=args.requests, concurrency=args.concurrency)
+        finally:
+            stop.set()
+            for t in storm:
+                t.join()
+        result["login_status_codes"] = codes
+        return result
+
+    workers, max_pending = security._workers, security._max_pending
+    results = {}
+    try:
+        results["baseline"] = measure(with_logins=False)
+        security.configure(workers=0)
+        results["logins_inline"] = measure(with_logins=True)
+        security.configure(workers=args.workers, max_pending=max(max_pending, args.workers))
+        results["logins_pool"] = measure(with_logins=True)
+    finally:
+        security.configure(workers=workers, max_pending=max_pending)
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from common import app, create_user_and_login, seed_clients
+
+from src.utils import instrumentation
+
+
+def per_request_us(fn, requests: int, repeat: int) -> float:
+    """Mejor promedio (µs por llamada) de `repeat` series de `requests` llamadas."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(requests):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / requests)
+    return round(best * 1e6, 2)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Costo por petición de las métricas Prometheus (METRICS_ENABLED)")
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="Peticiones por serie")
+    parser.add_argument("--repeat", type=int, default=5, help="Series por escenario; se reporta la mejor")
+    args = parser.parse_args(argv)
+
+    _, token = create_user_and_login()
+    seed_clients(token, 10)
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    scenarios = {
+        "healthcheck": lambda: client.get("/"),
+        "list_clients": lambda: client.get("/clients?size=10", headers=headers),
+    }
+
+    results = {}
+    original = instrumentation.enabled
+    try:
+        for name, fn in scenarios.items():
+            fn()
+            timings = {}
+            for enabled in (False, True):
+                instrumentation.enabled = enabled
+                timings["enabled" if enabled else "disabled"] = per_request_us(fn, args.requests, args.repeat)
+            results[name] = {**timings, "overhead_us": round(timings["enabled"] - timings["disabled"], 2)}
+    finally:
+        instrumentation.enabled = original
+
+    # Sólo los hooks y un par de listeners, sin HTTP ni base (el piso del costo)
+    conn = type("Conn", (), {"info": {}})()
+
+    def hooks_only():
+        instrumentation.start_request("clients", "clients.list_clients", "GET")
+        instrumentation._before_cursor_execute(conn, None, "", None, None, False)
+        instrumentation._after_cursor_execute(conn, None, "", None, None, False)
+        instrumentation.finish_request(200)
+
+    instrumentation.enabled = True
+    try:
+        results["hooks_one_query_us"] = per_request_us(hooks_only, args.requests * 10, args.repeat)
+    finally:
+        instrumentation.enabled = original
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
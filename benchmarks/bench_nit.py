@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Permite ejecutar el benchmark como script (python benchmarks/<bench>.py)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.utils.nit import compute_check_digit, compute_check_digits, validate_and_normalize_nit, validate_nits  # noqa: E402
+
+
+def rate(fn, count: int) -> dict:
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    return {"elapsed_s": round(elapsed, 4), "per_second": round(count / elapsed, 1) if elapsed > 0 else 0.0}
+
+
+def scalar_validate(values: list[str]) -> None:
+    for value in values:
+        try:
+            validate_and_normalize_nit(value)
+        except ValueError:
+            pass
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Throughput del DV de NIT: escalar vs vectorizado (NumPy)")
+    parser.add_argument("-n", "--count", type=int, default=1_000_000, help="NITs por medición (default: 1000000)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    ints = rng.integers(100_000_000, 1_000_000_000, size=args.count, dtype=np.int64)
+    bases = [str(b) for b in ints.tolist()]
+    nits = [f"{b}-{d}" for b, d in zip(bases, compute_check_digits(ints).tolist())]
+
+    print(json.dumps({
+        "count": args.count,
+        "check_digits": {
+            "scalar": rate(lambda: [compute_check_digit(b) for b in bases], args.count),
+            "vectorized_strings": rate(lambda: compute_check_digits(bases), args.count),
+            "vectorized_ints": rate(lambda: compute_check_digits(ints), args.count),
+        },
+        "validate": {
+            "scalar": rate(lambda: scalar_validate(nits), args.count),
+            "batch": rate(lambda: validate_nits(nits), args.count),
+        },
+    }, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, select
+
+# Permite ejecutar el benchmark como script (python benchmarks/<bench>.py)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.database import SessionLocal  # noqa: E402
+from src.models.company import Company, CompanyStatus  # noqa: E402
+from src.services.company_service import CompanyService  # noqa: E402
+from src.utils.cursor import encode_cursor  # noqa: E402
+
+
+def seed_companies(count: int, batch: int = 5000) -> None:
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        for start in range(0, count, batch):
+            rows = []
+            for i in range(start, min(count, start + batch)):
+                ts = now - timedelta(seconds=i)
+                rows.append({
+                    "id": str(uuid.uuid4()),
+                    "nit": str(uuid.uuid4().int)[:9],
+                    "business_name": f"Empresa {i}",
+                    "status": CompanyStatus.ACTIVE,
+                    "created_at": ts,
+                    "updated_at": ts,
+                })
+            db.execute(insert(Company), rows)
+            db.commit()
+    finally:
+        db.close()
+
+
+def cursor_for_page(db, page: int, size: int) -> str | None:
+    """Cursor que apunta al último registro de la página anterior (setup, no se mide)."""
+    if page <= 1:
+        return ""
+    stmt = CompanyService(db).dao.build_query().offset((page - 1) * size - 1).limit(1)
+    row = db.execute(stmt).first()
+    return encode_cursor(row.created_at, row.id) if row else None
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return round(best * 1000, 3)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Latencia OFFSET vs keyset en GET /companies (capa de servicio)")
+    parser.add_argument("--pages", default="1,1000,50000", help="Páginas a medir, separadas por coma")
+    parser.add_argument("--size", type=int, default=10, help="Tamaño de página (default: 10)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por medición; se reporta la mejor")
+    parser.add_argument("--total", default="exact", choices=["exact", "estimate", "none"], help="Modo de total (default: exact)")
+    parser.add_argument("--seed", type=int, default=0, help="Compañías sintéticas a insertar antes de medir")
+    args = parser.parse_args(argv)
+
+    if args.seed:
+        seed_companies(args.seed)
+    db = SessionLocal()
+    try:
+        service = CompanyService(db)
+        rows = db.execute(select(func.count()).select_from(Company)).scalar_one()
+        results = []
+        for page in (int(p) for p in args.pages.split(",")):
+            cursor = cursor_for_page(db, page, args.size)
+            if cursor is None:
+                results.append({"page": page, "skipped": f"sólo hay {rows} filas"})
+                continue
+            results.append({
+                "page": page,
+                "offset_ms": timed(lambda: service.list_paginated(page=page, size=args.size, total=args.total), args.repeat),
+                "keyset_ms": timed(lambda: service.list_keyset(cursor=cursor, size=args.size, total=args.total), args.repeat),
+            })
+    finally:
+        db.close()
+    print(json.dumps({"rows": rows, "size": args.size, "total": args.total, "results": results}, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
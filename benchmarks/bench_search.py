@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from common import NAMES, SURNAMES, random_nit
+
+from sqlalchemy import func, insert, select
+
+from src.dao.client_dao import ClientDAO
+from src.database import SessionLocal
+from src.models.client import Client, ClientStatus
+from src.models.company import Company
+
+
+# Coprimo con 10**9: i -> i * PHONE_STRIDE % 10**9 es una permutación (sin teléfonos repetidos)
+PHONE_STRIDE = 387_420_489
+
+
+def seed_clients(count: int, batch: int = 10000) -> None:
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        company_id = str(uuid.uuid4())
+        db.execute(insert(Company), [{"id": company_id, "nit": random_nit()[:9], "business_name": "Search Bench"}])
+        # clients.phone es único: se deriva del índice de fila (desde los clientes ya cargados, para
+        # poder sembrar más de una vez), permutado para que los dígitos no salgan consecutivos
+        offset = db.execute(select(func.count()).select_from(Client)).scalar_one()
+        for start in range(0, count, batch):
+            rows = []
+            for i in range(start, min(count, start + batch)):
+                name = f"{rng.choice(NAMES)} {rng.choice(SURNAMES)}"
+                tag = uuid.uuid4().hex[:8]
+                ts = now - timedelta(seconds=i)
+                rows.append({
+                    "id": str(uuid.uuid4()),
+                    "company_id": company_id,
+                    "contact_name": name,
+                    "email": f"{name.split()[0].lower()}.{tag}@example.com",
+                    "phone": f"+57-3{(offset + i) * PHONE_STRIDE % 10**9:09d}",
+                    "status": ClientStatus.ACTIVE,
+                    "created_at": ts,
+                    "updated_at": ts,
+                })
+            db.execute(insert(Client), rows)
+            db.commit()
+    finally:
+        db.close()
+
+
+def _index_names(plan: dict) -> list[str]:
+    names = [plan["Index Name"]] if "Index Name" in plan else []
+    for child in plan.get("Plans", []):
+        names.extend(_index_names(child))
+    return names
+
+
+def explain(db, stmt) -> dict:
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"render_postcompile": True})
+    sql = f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled}"
+    plan = db.connection().exec_driver_sql(sql, compiled.params).scalar_one()[0]
+    return {
+        "execution_ms": plan.get("Execution Time"),
+        "top_node": plan["Plan"]["Node Type"],
+        "indexes": sorted(set(_index_names(plan["Plan"]))),
+        "shared_hit_blocks": plan["Plan"].get("Shared Hit Blocks"),
+        "shared_read_blocks": plan["Plan"].get("Shared Read Blocks"),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Búsqueda de clientes: ILIKE vs ranked (FTS + trigram), con EXPLAIN en PostgreSQL")
+    parser.add_argument("--queries", default="ana,ana 300,perez gomez,maria 31,3001", help="Consultas separadas por coma")
+    parser.add_argument("--size", type=int, default=10, help="Tamaño de página (default: 10)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones; se reporta la mejor")
+    parser.add_argument("--seed", type=int, default=0, help="Clientes sintéticos a insertar antes de medir (p.ej. 5000000)")
+    args = parser.parse_args(argv)
+
+    if args.seed:
+        seed_clients(args.seed)
+    db = SessionLocal()
+    try:
+        dao = ClientDAO(db)
+        is_pg = db.get_bind().dialect.name == "postgresql"
+        rows = db.execute(select(func.count()).select_from(Client)).scalar_one()
+        results = []
+        for q in args.queries.split(","):
+            entry: dict = {"q": q}
+            for mode, stmt in (("ilike", dao.build_query(text=q)), ("ranked", dao.build_ranked_query(text=q))):
+                stmt = stmt.limit(args.size)
+                best = float("inf")
+                found = 0
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    found = len(db.execute(stmt).all())
+                    best = min(best, time.perf_counter() - t0)
+                entry[mode] = {"best_ms": round(best * 1000, 3), "rows": found}
+                if is_pg:
+                    entry[mode]["explain"] = explain(db, stmt)
+            results.append(entry)
+    finally:
+        db.close()
+    print(json.dumps({"clients": rows, "results": results}, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Permite ejecutar los benchmarks como scripts (python benchmarks/<bench>.py)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.app import app  # noqa: E402
+from scripts.generate_data import NAMES, SURNAMES  # noqa: E402,F401  (nombres de los datos sintéticos)
+from src.utils.nit import compute_check_digit  # noqa: E402
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, Any]:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "elapsed_s": round(elapsed, 4),
+        "qps": round(len(values) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+    }
+
+
+def run_load(fn: Callable[[], None], *, requests: int, concurrency: int = 1) -> Dict[str, Any]:
+    """Ejecuta `fn` `requests` veces repartidas en `concurrency` hilos."""
+    latencies: List[float] = []
+    lock = threading.Lock()
+    remaining = [requests]
+
+    def worker() -> None:
+        local: List[float] = []
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            t0 = time.perf_counter()
+            fn()
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(max(1, concurrency))]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def start_server(command: Sequence[str], *, port: int, env: Dict[str, str] | None = None, timeout: float = 30.0) -> subprocess.Popen:
+    """Lanza un servidor HTTP (gunicorn/uvicorn) desde la raíz del proyecto y espera a que acepte conexiones."""
+    proc = subprocess.Popen(list(command), cwd=PROJECT_ROOT, env={**os.environ, **(env or {})}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{command[0]} terminó con código {proc.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"{command[0]} no escucha en el puerto {port}")
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, bool]:
+    """(status, keep-alive) de una respuesta HTTP/1.1; el cuerpo se lee y se descarta."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {k.strip().lower(): v.strip() for k, v in (line.split(":", 1) for line in lines[1:] if ":" in line)}
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get("content-length", "0")))
+    return status, headers.get("connection", "").lower() != "close"
+
+
+# (operación, método, path con query, cabeceras, cuerpo) de una petición de la carga
+HttpRequest = Tuple[str, str, str, Dict[str, str], Optional[bytes]]
+
+
+async def _http_load(host: str, port: int, next_request: Callable[[int], HttpRequest], requests: int, connections: int) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    latencies: Dict[str, List[float]] = {}
+    statuses: Dict[str, Dict[str, int]] = {}
+    errors: Dict[str, int] = {}
+    remaining = [requests]
+    sequence = [0]
+
+    async def connection() -> None:
+        reader = writer = None
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            operation, method, path, headers, body = next_request(sequence[0])
+            sequence[0] += 1
+            head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+            if body is not None:
+                head += f"Content-Length: {len(body)}\r\n"
+            data = (head + "\r\n").encode() + (body or b"")
+            t0 = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+                writer.write(data)
+                await writer.drain()
+                status, keep_alive = await _read_response(reader)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors[operation] = errors.get(operation, 0) + 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                continue
+            latencies.setdefault(operation, []).append(time.perf_counter() - t0)
+            counts = statuses.setdefault(operation, {})
+            counts[str(status)] = counts.get(str(status), 0) + 1
+            if not keep_alive:
+                writer.close()
+                reader = writer = None
+        if writer is not None:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(connection() for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    result = summarize([value for values in latencies.values() for value in values], elapsed)
+    merged: Dict[str, int] = {}
+    for counts in statuses.values():
+        for status, n in counts.items():
+            merged[status] = merged.get(status, 0) + n
+    result.update(connections=connections, statuses=merged, errors=sum(errors.values()))
+    operations = {
+        operation: {**summarize(latencies.get(operation, []), elapsed), "statuses": statuses.get(operation, {}), "errors": errors.get(operation, 0)}
+        for operation in sorted(set(latencies) | set(errors))
+    }
+    return result, operations
+
+
+def http_load(host: str, port: int, paths: Sequence[str], *, headers: Dict[str, str] | None = None, requests: int, connections: int) -> Dict[str, Any]:
+    """Carga HTTP/1.1 keep-alive real (asyncio): `connections` conexiones concurrentes reparten
+    `requests` GET rotando `paths`; latencias por petición, códigos de estado y errores de conexión."""
+    paths, headers = list(paths), headers or {}
+    result, _ = asyncio.run(_http_load(host, port, lambda n: ("GET", "GET", paths[n % len(paths)], headers, None), requests, connections))
+    return result
+
+
+def http_mix(host: str, port: int, next_request: Callable[[int], HttpRequest], *, requests: int, connections: int) -> Dict[str, Any]:
+    """Como http_load, pero cada petición la arma `next_request(n)` (cualquier método y cuerpo);
+    agrega el desglose por operación en "operations" (qps de cada una sobre el tiempo total)."""
+    result, operations = asyncio.run(_http_load(host, port, next_request, requests, connections))
+    return {**result, "operations": operations}
+
+
+def random_nit() -> str:
+    base = str(uuid.uuid4().int)[:9].rjust(9, "1")
+    return f"{base}-{compute_check_digit(base)}"
+
+
+def unique_email(prefix: str = "bench") -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:12]}@example.com"
+
+
+def create_user_and_login(password: str = "benchpass123", email: str | None = None) -> tuple[str, str]:
+    client = app.test_client()
+    email = email or unique_email()
+    r = client.post("/users", json={"name": "Bench", "email": email, "password": password})
+    assert r.status_code == 201, r.get_json()
+    user_id = r.get_json()["id"]
+    r = client.post("/login", json={"identifier": email, "password": password})
+    assert r.status_code == 200, r.get_json()
+    return user_id, r.get_json()["access_token"]
+
+
+def seed_clients(token: str, count: int) -> str:
+    """Crea una compañía y `count` clientes del usuario del token; retorna el company_id."""
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    r = client.post("/companies", json={"nit": random_nit(), "business_name": "Bench S.A.S."}, headers=headers)
+    assert r.status_code == 201, r.get_json()
+    company_id = r.get_json()["id"]
+    for _ in range(count):
+        tag = uuid.uuid4().hex[:10]
+        r = client.post(
+            "/clients",
+            json={"company_id": company_id, "contact_name": f"Cliente {tag}", "email": f"c_{tag}@example.com", "phone": f"+57-3{tag}"},
+            headers=headers,
+        )
+        assert r.status_code == 201, r.get_json()
+    return company_id
@@ -0,0 +1,24 @@
+"""Hooks de gunicorn (se carga automáticamente desde la raíz del proyecto).
+
+Con PROMETHEUS_MULTIPROC_DIR cada worker escribe sus métricas en ese directorio y /metrics
+las agrega: se vacía al arrancar el master y se marcan los workers que terminan (sus gauges
+`livesum` dejan de sumar).
+"""
+
+import glob
+import os
+
+
+def on_starting(server):
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "*.db")):
+            os.remove(path)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
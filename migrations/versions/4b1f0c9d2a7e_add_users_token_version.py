@@ -0,0 +1,29 @@
+"""add users.token_version and updated_at index
+
+Revision ID: 4b1f0c9d2a7e
+Revises: 7ccab2225c10
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1f0c9d2a7e'
+down_revision: Union[str, None] = '7ccab2225c10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+    # Refresco incremental del mapa de revocación: WHERE updated_at >= :since
+    op.create_index('ix_users_updated_at', 'users', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_updated_at', table_name='users')
+    op.drop_column('users', 'token_version')
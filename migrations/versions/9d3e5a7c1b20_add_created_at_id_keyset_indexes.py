@@ -0,0 +1,45 @@
+"""add (created_at, id) indexes for keyset pagination
+
+Revision ID: 9d3e5a7c1b20
+Revises: 4b1f0c9d2a7e
+Create Date: 2026-10-18 10:02:11.540391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3e5a7c1b20'
+down_revision: Union[str, None] = '4b1f0c9d2a7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY para no bloquear escrituras en tablas grandes (requiere fuera de transacción)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_clients_created_at_id",
+            "clients",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_companies_created_at_id",
+            "companies",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_companies_created_at_id", table_name="companies", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_clients_created_at_id", table_name="clients", postgresql_concurrently=True, if_exists=True)
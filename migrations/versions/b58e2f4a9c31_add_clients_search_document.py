@@ -0,0 +1,64 @@
+"""add clients search document (tsvector + unaccent) and trigram search text
+
+Revision ID: b58e2f4a9c31
+Revises: 9d3e5a7c1b20
+Create Date: 2026-10-18 11:20:47.903512
+
+Costo en PostgreSQL: añadir columnas GENERATED ... STORED reescribe toda la tabla `clients`
+bajo ACCESS EXCLUSIVE (bloquea lecturas y escrituras durante la reescritura, proporcional al
+tamaño de la tabla), y los CREATE INDEX sin CONCURRENTLY bloquean escrituras mientras se
+construyen. En tablas grandes, aplicarla en una ventana de mantenimiento. Las columnas se
+prefirieron a índices por expresión para que ranking y filtros no recalculen el documento
+por fila ni dependan de repetir la expresión exacta en cada consulta.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b58e2f4a9c31'
+down_revision: Union[str, None] = '9d3e5a7c1b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    # unaccent() no es IMMUTABLE; el wrapper con diccionario explícito sí puede usarse en columnas generadas
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+    # Documento FTS: nombre sin tildes + partes del email separadas (ana.perez@acme.co -> ana perez acme co)
+    op.execute(
+        """
+        ALTER TABLE clients ADD COLUMN search_document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', f_unaccent(coalesce(contact_name, ''))), 'A') ||
+            setweight(to_tsvector('simple', regexp_replace(coalesce(email, ''), '[@._+-]+', ' ', 'g')), 'B')
+        ) STORED
+        """
+    )
+    # Texto plano para el fallback trigram (tokens cortos, numéricos o subcadenas de teléfono)
+    op.execute(
+        """
+        ALTER TABLE clients ADD COLUMN search_text text GENERATED ALWAYS AS (
+            lower(f_unaccent(coalesce(contact_name, '') || ' ' || coalesce(email, '') || ' ' || coalesce(phone, '')))
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_clients_search_document ON clients USING gin (search_document)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_clients_search_text_trgm ON clients USING gin (search_text gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_clients_search_text_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_clients_search_document")
+    op.drop_column('clients', 'search_text')
+    op.drop_column('clients', 'search_document')
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
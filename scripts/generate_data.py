@@ -0,0 +1,356 @@
+"""Generador de datos sintéticos a escala (compañías, usuarios, clientes y su asignación a usuarios).
+
+- Determinista por --seed: cada bloque de BLOCK filas tiene su propia semilla, así el resultado
+  no depende de --workers ni de --shard-size.
+- Compañías con NIT válido (se guarda la base de 9 dígitos, como la API tras validar el DV),
+  razón social, dirección, teléfono y ciudad colombianas.
+- Clientes con nombres colombianos y email/teléfono únicos (permutaciones del índice).
+- Usuarios con un hash bcrypt precalculado una vez (todos con --password; sal derivada de la
+  semilla y el costo de BCRYPT_ROUNDS, el mismo que verifica la API).
+- user_clients: cada cliente pertenece a un usuario elegido con distribución Zipf (--zipf).
+- Destinos: COPY en paralelo a PostgreSQL (por defecto con DATABASE_URL de PostgreSQL),
+  inserts por lotes (otras bases), archivos de texto de COPY (--out) o sólo generar (--target none).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+import unicodedata
+import uuid
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Permite ejecución tanto dentro como fuera del paquete
+try:
+    from src.database import DATABASE_URL  # type: ignore
+except Exception:  # pragma: no cover
+    # fallback cuando se ejecuta como script directo sin PYTHONPATH
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from src.database import DATABASE_URL  # type: ignore
+
+from sqlalchemy import create_engine, insert, make_url, text  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from src.database import Base  # noqa: E402
+from src.models import client, company, user, user_client  # noqa: E402,F401  (registra las tablas)
+
+
+NAMES = [
+    "Ana", "Andrés", "Camila", "Carlos", "Daniela", "José", "Juan", "Laura", "María", "Sofía", "Valentina", "Santiago",
+    "Alejandro", "Catalina", "Diego", "Felipe", "Gabriela", "Isabella", "Jorge", "Juliana", "Luis", "Manuela",
+    "Mariana", "Mateo", "Natalia", "Paula", "Sebastián", "Sara", "Tomás", "Daniel", "Nicolás", "Luisa",
+]
+SURNAMES = [
+    "Pérez", "Gómez", "Rodríguez", "Martínez", "García", "López", "Hernández", "Díaz", "Muñoz", "Rojas",
+    "Moreno", "Jiménez", "Álvarez", "Romero", "Vargas", "Torres", "Ramírez", "Castro", "Suárez", "Sánchez",
+    "Ortiz", "Restrepo", "Ospina", "Cárdenas", "Quintero", "Giraldo", "Zapata", "Arango", "Mejía", "Londoño",
+]
+CITIES = [
+    "Bogotá", "Medellín", "Cali", "Barranquilla", "Cartagena", "Bucaramanga", "Pereira", "Manizales", "Cúcuta",
+    "Ibagué", "Santa Marta", "Villavicencio", "Pasto", "Montería", "Neiva", "Armenia", "Popayán", "Valledupar",
+    "Sincelejo", "Tunja",
+]
+_COMPANY_KINDS = ["Inversiones", "Comercializadora", "Distribuidora", "Constructora", "Servicios", "Transportes", "Inmobiliaria", "Agropecuaria", "Soluciones", "Consultores"]
+_COMPANY_FORMS = ["S.A.S.", "S.A.", "Ltda.", "y Cía. S.A.S."]
+_STREETS = ["Calle", "Carrera", "Avenida", "Diagonal", "Transversal"]
+
+
+def _ascii(value: str) -> str:
+    return unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode().lower()
+
+
+_ASCII_NAMES = [_ascii(n) for n in NAMES]
+_ASCII_SURNAMES = [_ascii(s) for s in SURNAMES]
+
+# Filas por semilla de bloque: los shards son múltiplos de BLOCK
+BLOCK = 10_000
+# Fechas de creación repartidas en los dos años anteriores (fijo: determinismo)
+REFERENCE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+_SPAN_SECONDS = 2 * 365 * 86400
+
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "companies": ("id", "nit", "business_name", "description", "address", "phone", "city", "status", "created_at", "updated_at"),
+    "users": ("id", "name", "email", "nickname", "password", "company", "status", "token_version", "created_at", "updated_at"),
+    "clients": ("id", "company_id", "contact_name", "email", "phone", "status", "created_at", "updated_at"),
+    "user_clients": ("id", "client_id", "user_id", "created_at"),
+}
+
+
+@dataclass(frozen=True)
+class Spec:
+    """Qué generar; igual Spec (incluida la semilla) = mismas filas."""
+
+    seed: int
+    companies: int
+    clients: int
+    users: int
+    password_hash: str
+    zipf: float = 1.1
+    domain: str = "example.com"
+    company_prefix: str = ""
+    inactive_clients: float = 0.1
+
+
+def password_hash(password: str, seed: int) -> str:
+    """bcrypt de `password` con sal derivada de `seed` (mismo hash en cada corrida) y costo BCRYPT_ROUNDS."""
+    from passlib.hash import bcrypt
+
+    rng = random.Random(f"{seed}:password")
+    alphabet = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    # El último carácter de la sal sólo lleva 2 bits útiles
+    salt = "".join(rng.choice(alphabet) for _ in range(21)) + rng.choice(".Oeu")
+    return bcrypt.using(rounds=int(os.getenv("BCRYPT_ROUNDS", "12")), salt=salt, ident="2b").hash(password)
+
+
+def row_id(seed: int, table: str, index: int) -> str:
+    """UUID v4 determinista de la fila `index` de `table` (calculable desde cualquier worker)."""
+    digest = hashlib.blake2b(f"{seed}:{table}:{index}".encode(), digest_size=16).digest()
+    return str(uuid.UUID(bytes=digest, version=4))
+
+
+@lru_cache(maxsize=None)
+def _affine(seed: int, salt: str, n: int) -> Tuple[int, int]:
+    """(a, b) con a coprimo con n: i -> (a*i + b) % n es una permutación de [0, n)."""
+    rng = random.Random(f"{seed}:{salt}")
+    a = rng.randrange(1, n)
+    while math.gcd(a, n) != 1:
+        a += 1
+    return a, rng.randrange(n)
+
+
+def _permute(seed: int, salt: str, n: int, index: int) -> int:
+    a, b = _affine(seed, salt, n)
+    return (a * index + b) % n
+
+
+@lru_cache(maxsize=4)
+def _zipf_cdf(n: int, s: float) -> List[float]:
+    return list(accumulate(1.0 / (rank ** s) for rank in range(1, n + 1)))
+
+
+def _zipf(rng: random.Random, cdf: List[float]) -> int:
+    """Índice en [0, n) con P(k) ∝ 1/(k+1)^s: el índice 0 es el más frecuente."""
+    return min(bisect_right(cdf, rng.random() * cdf[-1]), len(cdf) - 1)
+
+
+def _phone(number: int) -> str:
+    # Celular colombiano: +57 3XX XXX XXXX (number < 10^9)
+    return f"+57 3{number // 10**7:02d} {number // 10**4 % 1000:03d} {number % 10**4:04d}"
+
+
+def _created_at(rng: random.Random) -> datetime:
+    return REFERENCE - timedelta(seconds=rng.randrange(_SPAN_SECONDS))
+
+
+def generate_block(spec: Spec, table: str, block: int) -> Dict[str, List[tuple]]:
+    """Filas del bloque `block` de `table` (en el orden de COLUMNS); "clients" trae también sus user_clients."""
+    rng = random.Random(f"{spec.seed}:{table}:{block}")
+    total = {"companies": spec.companies, "users": spec.users, "clients": spec.clients}[table]
+    indexes = range(block * BLOCK, min(total, (block + 1) * BLOCK))
+    seed = spec.seed
+    if table == "companies":
+        rows = []
+        for i in indexes:
+            # Bases de 9 dígitos sin 0 inicial, únicas: cualquier base tiene un DV válido
+            base = 100_000_000 + _permute(seed, "nit", 900_000_000, i)
+            surname = rng.choice(SURNAMES)
+            name = f"{spec.company_prefix}{rng.choice(_COMPANY_KINDS)} {surname} {rng.choice(SURNAMES)} {rng.choice(_COMPANY_FORMS)}"
+            created = _created_at(rng)
+            address = f"{rng.choice(_STREETS)} {rng.randint(1, 150)} # {rng.randint(1, 120)}-{rng.randint(1, 99)}"
+            phone = f"+57 60{rng.randint(1, 8)} {rng.randint(200, 999)} {rng.randint(0, 9999):04d}"
+            rows.append((row_id(seed, "companies", i), str(base), name, None, address, phone, rng.choice(CITIES), "ACTIVE", created, created))
+        return {"companies": rows}
+    if table == "users":
+        rows = []
+        for i in indexes:
+            first, last = rng.randrange(len(NAMES)), rng.randrange(len(SURNAMES))
+            created = _created_at(rng)
+            email = f"{_ASCII_NAMES[first]}.{_ASCII_SURNAMES[last]}.u{i}@{spec.domain}"
+            rows.append((row_id(seed, "users", i), f"{NAMES[first]} {SURNAMES[last]}", email, None, spec.password_hash, None, "ACTIVE", 0, created, created))
+        return {"users": rows}
+    clients, owners = [], []
+    cdf = _zipf_cdf(spec.users, spec.zipf) if spec.users else None
+    for i in indexes:
+        first, last, second = rng.randrange(len(NAMES)), rng.randrange(len(SURNAMES)), rng.randrange(len(SURNAMES))
+        client_id = row_id(seed, "clients", i)
+        created = _created_at(rng)
+        status = "INACTIVE" if rng.random() < spec.inactive_clients else "ACTIVE"
+        clients.append((
+            client_id,
+            row_id(seed, "companies", rng.randrange(spec.companies)),
+            f"{NAMES[first]} {SURNAMES[last]} {SURNAMES[second]}",
+            f"{_ASCII_NAMES[first]}.{_ASCII_SURNAMES[last]}.{i}@{spec.domain}",
+            _phone(_permute(seed, "phone", 10**9, i)),
+            status,
+            created,
+            created,
+        ))
+        if cdf is not None:
+            owners.append((row_id(seed, "user_clients", i), client_id, row_id(seed, "users", _zipf(rng, cdf)), created))
+    return {"clients": clients, "user_clients": owners}
+
+
+def _copy_text(rows: List[tuple]) -> str:
+    # Formato texto de COPY; los valores generados no tienen tabs, saltos de línea ni barras
+    return "".join(
+        "\t".join("\\N" if v is None else v.isoformat() if isinstance(v, datetime) else str(v) for v in row) + "\n"
+        for row in rows
+    )
+
+
+_engine: Any = None
+
+
+def _worker_engine(url: str) -> Any:
+    global _engine
+    if _engine is None:
+        _engine = create_engine(url, poolclass=NullPool)
+    return _engine
+
+
+def load_shard(spec: Spec, table: str, start_block: int, stop_block: int, target: str, destination: str) -> Dict[str, int]:
+    """Genera los bloques [start_block, stop_block) de `table` y los escribe en `destination`."""
+    counts: Dict[str, int] = {}
+    blocks: Iterator[Dict[str, List[tuple]]] = (generate_block(spec, table, b) for b in range(start_block, stop_block))
+    if target == "none":
+        for rows in blocks:
+            for name, values in rows.items():
+                counts[name] = counts.get(name, 0) + len(values)
+        return counts
+    if target == "files":
+        handles: Dict[str, Any] = {}
+        try:
+            for rows in blocks:
+                for name, values in rows.items():
+                    if name not in handles:
+                        handles[name] = open(os.path.join(destination, f"{name}.{start_block:06d}.tsv"), "w", encoding="utf-8")
+                    handles[name].write(_copy_text(values))
+                    counts[name] = counts.get(name, 0) + len(values)
+        finally:
+            for handle in handles.values():
+                handle.close()
+        return counts
+    engine = _worker_engine(destination)
+    if target == "copy":
+        raw = engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            for rows in blocks:
+                # clients antes que sus user_clients (misma transacción)
+                for name, values in rows.items():
+                    with cursor.copy(f"COPY {name} ({', '.join(COLUMNS[name])}) FROM STDIN") as copy:
+                        copy.write(_copy_text(values))
+                    counts[name] = counts.get(name, 0) + len(values)
+            raw.commit()
+        finally:
+            raw.close()
+        return counts
+    with engine.begin() as conn:
+        for rows in blocks:
+            for name, values in rows.items():
+                if values:
+                    conn.execute(insert(Base.metadata.tables[name]), [dict(zip(COLUMNS[name], row)) for row in values])
+                counts[name] = counts.get(name, 0) + len(values)
+    return counts
+
+
+def _shards(total: int, shard_blocks: int) -> List[Tuple[int, int]]:
+    blocks = -(-total // BLOCK)
+    return [(start, min(blocks, start + shard_blocks)) for start in range(0, blocks, shard_blocks)]
+
+
+def load(spec: Spec, *, target: str, destination: str, workers: int = 1, shard_size: int = 100_000) -> Dict[str, Any]:
+    """Genera y escribe todo `spec` con `workers` procesos: compañías y usuarios, luego clientes (FKs)."""
+    shard_blocks = max(1, -(-shard_size // BLOCK))
+    started = time.perf_counter()
+    counts: Dict[str, int] = {}
+    phases = [
+        [("companies", shard) for shard in _shards(spec.companies, shard_blocks)] + [("users", shard) for shard in _shards(spec.users, shard_blocks)],
+        [("clients", shard) for shard in _shards(spec.clients, shard_blocks)],
+    ]
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        for tasks in phases:
+            futures = [pool.submit(load_shard, spec, table, start, stop, target, destination) for table, (start, stop) in tasks]
+            for future in futures:
+                for name, n in future.result().items():
+                    counts[name] = counts.get(name, 0) + n
+    if target in ("copy", "insert"):
+        engine = create_engine(destination, poolclass=NullPool)
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("ANALYZE"))
+        finally:
+            engine.dispose()
+    seconds = time.perf_counter() - started
+    rows = sum(counts.values())
+    return {
+        "rows": counts,
+        "total_rows": rows,
+        "seconds": round(seconds, 2),
+        "rows_per_minute": round(rows / seconds * 60) if seconds > 0 else None,
+        "target": target,
+        "workers": workers,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generador determinista de datos sintéticos (COPY en paralelo a PostgreSQL)")
+    parser.add_argument("--companies", type=int, default=10_000, help="Compañías (default: 10000)")
+    parser.add_argument("--clients", type=int, default=1_000_000, help="Clientes, cada uno con un usuario dueño (default: 1000000)")
+    parser.add_argument("--users", type=int, default=50_000, help="Usuarios (default: 50000)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla (default: 42)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Exponente de la distribución de clientes por usuario (default: 1.1)")
+    parser.add_argument("--password", default="benchpass123", help="Contraseña de todos los usuarios (se hashea una vez)")
+    parser.add_argument("--domain", default="example.com", help="Dominio de los emails (default: example.com)")
+    parser.add_argument("--target", choices=["copy", "insert", "files", "none"], help="Destino (default: copy en PostgreSQL, insert en otras bases, files con --out)")
+    parser.add_argument("--out", help="Directorio para los archivos de COPY (--target files)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="Procesos (default: CPUs)")
+    parser.add_argument("--shard-size", type=int, default=100_000, help=f"Filas por tarea/transacción, múltiplo de {BLOCK} (default: 100000)")
+    args = parser.parse_args(argv)
+
+    if min(args.companies, args.users, args.clients) < 0 or (args.clients and not args.companies):
+        print("los conteos deben ser >= 0 y los clientes requieren compañías", file=sys.stderr)
+        return 2
+    url = make_url(DATABASE_URL)
+    target = args.target or ("files" if args.out else "copy" if url.get_backend_name() == "postgresql" else "insert")
+    if target == "copy" and url.get_backend_name() != "postgresql":
+        print("--target copy requiere una DATABASE_URL de PostgreSQL", file=sys.stderr)
+        return 2
+    if target == "files":
+        if not args.out:
+            print("--target files requiere --out", file=sys.stderr)
+            return 2
+        os.makedirs(args.out, exist_ok=True)
+    workers = args.workers
+    if target == "insert" and url.get_backend_name() == "sqlite":
+        workers = 1  # SQLite admite un solo escritor
+
+    spec = Spec(
+        seed=args.seed,
+        companies=args.companies,
+        clients=args.clients,
+        users=args.users,
+        password_hash=password_hash(args.password, args.seed),
+        zipf=args.zipf,
+        domain=args.domain,
+    )
+    destination = args.out if target == "files" else url.render_as_string(hide_password=False)
+    summary = load(spec, target=target, destination=destination, workers=workers, shard_size=args.shard_size)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
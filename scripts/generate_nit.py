@@ -7,12 +7,15 @@ import sys
 
 # Permite ejecución tanto dentro como fuera del paquete
 try:
-    from src.utils.nit import compute_check_digit  # type: ignore
+    from src.utils.nit import compute_check_digit, compute_check_digits, np  # type: ignore
 except Exception:  # pragma: no cover
     # fallback cuando se ejecuta como script directo sin PYTHONPATH
     import os
     sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    from src.utils.nit import compute_check_digit  # type: ignore
+    from src.utils.nit import compute_check_digit, compute_check_digits, np  # type: ignore
+
+# NITs por bloque al escribir en modo texto (acota la memoria con --count grandes)
+_BLOCK = 1_000_000
 
 
 def generate_base_9_digits(rng: random.Random) -> str:
@@ -26,6 +29,22 @@ def format_nit(base9: str, dv: int, with_dash: bool) -> str:
     return f"{base9}-{dv}" if with_dash else f"{base9}{dv}"
 
 
+def generate_block(rng: "np.random.Generator", count: int) -> tuple["np.ndarray", "np.ndarray"]:
+    """Bases (enteros de 9 dígitos sin 0 inicial) y sus DV, vectorizado."""
+    bases = rng.integers(100_000_000, 1_000_000_000, size=count, dtype=np.int64)
+    return bases, compute_check_digits(bases)
+
+
+def render_block(bases: "np.ndarray", dvs: "np.ndarray", with_dash: bool) -> bytes:
+    """Una línea por NIT armada como matriz de bytes ASCII (sin formatear cadena por cadena)."""
+    digits = (bases[:, None] // 10 ** np.arange(8, -1, -1, dtype=np.int64)) % 10
+    columns = [digits, dvs[:, None]]
+    if with_dash:
+        columns.insert(1, np.full((len(bases), 1), ord("-") - ord("0")))
+    columns.append(np.full((len(bases), 1), ord("\n") - ord("0")))
+    return (np.hstack(columns) + ord("0")).astype(np.uint8).tobytes()
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Generador de NITs válidos aleatorios (Colombia)")
     parser.add_argument("-n", "--count", type=int, default=1, help="Cantidad de NITs a generar (default: 1)")
@@ -39,6 +58,23 @@ def main(argv: list[str] | None = None) -> int:
         print("--count debe ser >= 1", file=sys.stderr)
         return 2
 
+    if np is not None:
+        rng_np = np.random.default_rng(args.seed)
+        if not args.json:
+            out = sys.stdout.buffer
+            for start in range(0, args.count, _BLOCK):
+                bases, dvs = generate_block(rng_np, min(_BLOCK, args.count - start))
+                out.write(render_block(bases, dvs, with_dash=args.dash))
+            out.flush()
+            return 0
+        bases, dvs = generate_block(rng_np, args.count)
+        items = [
+            {"base": str(b), "dv": d, "canonical": f"{b}{d}", "nit": format_nit(str(b), d, with_dash=args.dash)}
+            for b, d in zip(bases.tolist(), dvs.tolist())
+        ]
+        print(json.dumps(items if args.count > 1 else items[0], ensure_ascii=False))
+        return 0
+
     rng = random.Random(args.seed)
 
     items: list[dict[str, str | int]] = []
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+# Permite ejecución tanto dentro como fuera del paquete
+try:
+    from src.database import SessionLocal  # type: ignore
+except Exception:  # pragma: no cover
+    # fallback cuando se ejecuta como script directo sin PYTHONPATH
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from src.database import SessionLocal  # type: ignore
+
+from src.services.company_service import CompanyService  # noqa: E402
+from src.utils.bulk import BULK_MAX_CHUNK_SIZE, iter_records  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Carga masiva de compañías desde CSV (upsert por NIT)")
+    parser.add_argument("path", help="Archivo CSV con encabezado (nit,business_name,description,address,phone,city,status); '-' = stdin")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Filas por lote/transacción (default: 1000)")
+    parser.add_argument("--dry-run", action="store_true", help="Sólo validar; no escribe en la base")
+    parser.add_argument("--max-errors", type=int, default=50, help="Errores a listar en la salida (default: 50)")
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.batch_size <= BULK_MAX_CHUNK_SIZE:
+        print(f"--batch-size debe estar entre 1 y {BULK_MAX_CHUNK_SIZE}", file=sys.stderr)
+        return 2
+
+    stream = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    db = SessionLocal()
+    try:
+        result = CompanyService(db).bulk_upsert(iter_records(stream, "text/csv"), batch_size=args.batch_size, dry_run=args.dry_run)
+    finally:
+        db.close()
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+    summary = result.model_dump(exclude={"errors"})
+    summary["errors"] = [e.model_dump() for e in result.errors[: args.max_errors]]
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,15 +2,22 @@ from flask import Flask
 import os
 from flask_cors import CORS
 from dotenv import load_dotenv
+from .database import init_app as init_db_session
+from .utils.instrumentation import init_app as init_metrics
+from .utils.json_provider import init_app as init_json
+from .utils.query_budget import init_app as init_query_budget
 from .routes.users import bp as users_bp
 from .routes.auth import bp as auth_bp
 from .routes.clients import bp as clients_bp
 from .routes.companies import bp as companies_bp
 from .routes.docs import bp as docs_bp
+from .routes.internal import bp as internal_bp
+from .routes.metrics import bp as metrics_bp
 
 
 load_dotenv()
 app = Flask(__name__)
+init_json(app)
 # CORS configurable por variable de entorno CORS_ORIGINS (separada por comas). Por defecto: "*".
 _cors_origins_env = os.getenv("CORS_ORIGINS", "*")
 if _cors_origins_env.strip() == "*":
@@ -19,12 +26,18 @@ else:
     _cors_origins = [o.strip() for o in _cors_origins_env.split(",") if o.strip()]
     if not _cors_origins:
         _cors_origins = "*"
+# Primero: la latencia medida incluye los demás hooks (sesión, CORS)
+init_metrics(app)
+init_query_budget(app)
+init_db_session(app)
 CORS(app, resources={r"/*": {"origins": _cors_origins}}, supports_credentials=False)
 app.register_blueprint(users_bp)
 app.register_blueprint(auth_bp)
 app.register_blueprint(clients_bp)
 app.register_blueprint(companies_bp)
 app.register_blueprint(docs_bp)
+app.register_blueprint(internal_bp)
+app.register_blueprint(metrics_bp)
 
 
 @app.get("/")
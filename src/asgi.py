@@ -0,0 +1,80 @@
+"""Modo de servicio ASGI (opcional; requiere requirements-async.txt).
+
+Las rutas dominadas por espera de base (CRUD y listados de clients/companies, GET /auth) se
+atienden con vistas async sobre AsyncSession en una app Quart; el resto de endpoints (login
+con bcrypt, bulk, export, docs, internal, users) siguen en la app Flask, servida por el mismo
+proceso a través de un adaptador WSGI -> ASGI (en hilos).
+
+    uvicorn src.asgi:app --workers 2
+    gunicorn -w 2 -k uvicorn.workers.UvicornWorker src.asgi:app
+"""
+
+from __future__ import annotations
+
+from asgiref.wsgi import WsgiToAsgi
+from quart import Quart, request
+from werkzeug.exceptions import HTTPException
+
+from .app import _cors_origins, app as wsgi_app
+from .database_async import async_engine, init_app as init_db_session
+from .routes.async_auth import bp as auth_bp
+from .routes.async_clients import bp as clients_bp
+from .routes.async_companies import bp as companies_bp
+from .utils.instrumentation import init_async_app as init_metrics
+from .utils.json_provider import init_app as init_json
+from .utils.query_budget import init_async_app as init_query_budget
+
+
+async_app = Quart(__name__)
+init_json(async_app)
+init_metrics(async_app)
+init_query_budget(async_app, wsgi_app.view_functions)
+init_db_session(async_app)
+async_app.register_blueprint(auth_bp)
+async_app.register_blueprint(clients_bp)
+async_app.register_blueprint(companies_bp)
+
+
+@async_app.after_request
+async def _cors(response):
+    # Mismas cabeceras que Flask-Cors en la app WSGI (los preflight OPTIONS van a esa app)
+    origin = request.headers.get("Origin")
+    if origin and (_cors_origins == "*" or origin in _cors_origins):
+        response.headers["Access-Control-Allow-Origin"] = origin
+        response.vary.add("Origin")
+    elif _cors_origins == "*":
+        response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+@async_app.after_serving
+async def _dispose_engine() -> None:
+    await async_engine.dispose()
+
+
+_wsgi = WsgiToAsgi(wsgi_app)
+_async_endpoints = frozenset(async_app.view_functions) - {"static"}
+_routes = wsgi_app.url_map.bind("localhost")
+
+
+def served_async(method: str, path: str) -> bool:
+    """True si la app Flask resolvería (method, path) a un endpoint que tiene versión async.
+
+    Se resuelve con el url_map de Flask para que las reglas estáticas (/clients/export) tengan
+    prioridad sobre las variables (/clients/<client_id>) igual que en el modo WSGI; 404, 405 y
+    redirecciones las responde la app Flask.
+    """
+    if method == "OPTIONS":
+        return False
+    try:
+        endpoint, _ = _routes.match(path, method)
+    except HTTPException:
+        return False
+    return endpoint in _async_endpoints
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan" or (scope["type"] == "http" and served_async(scope["method"], scope["path"])):
+        await async_app(scope, receive, send)
+    else:
+        await _wsgi(scope, receive, send)
@@ -1,20 +1,56 @@
 from __future__ import annotations
 
+import re
+from datetime import datetime
 from typing import Iterable, Optional
 
-from sqlalchemy import Select, select
+from sqlalchemy import ColumnElement, Row, Select, Text, and_, func, insert, literal_column, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.models.client import Client, ClientStatus
+from src.models.company import Company
 from src.models.user_client import UserClient
+from src.utils.instrumentation import instrument_dao
 
 
+# Columnas de los listados: filas Core (sin hidratar entidades ni identity map)
+LIST_COLUMNS = (
+    Client.id,
+    Client.company_id,
+    Client.contact_name,
+    Client.phone,
+    Client.email,
+    Client.status,
+    Client.created_at,
+    Client.updated_at,
+)
+# Columnas de la compañía que se proyectan con include=company (su id es Client.company_id)
+COMPANY_SUMMARY_COLUMNS = (
+    Company.nit.label("company_nit"),
+    Company.business_name.label("company_business_name"),
+    Company.city.label("company_city"),
+    Company.status.label("company_status"),
+)
+
+# Columnas generadas por la migración b58e2f4a9c31 (sólo PostgreSQL; no se mapean en el modelo)
+_search_document = literal_column("clients.search_document", TSVECTOR)
+_search_text = literal_column("clients.search_text", Text)
+_simple = literal_column("'simple'::regconfig")
+
+
+@instrument_dao
 class ClientDAO:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_by_id(self, client_id: str) -> Optional[Client]:
-        return self.db.get(Client, client_id)
+    def get_by_id(self, client_id: str, *, for_update: bool = False) -> Optional[Client]:
+        return self.db.get(Client, client_id, with_for_update=for_update or None)
+
+    def get_updated_at(self, client_id: str) -> Optional[datetime]:
+        """Sólo updated_at (versión para ETag/Last-Modified), sin cargar la entidad."""
+        return self.db.execute(select(Client.updated_at).where(Client.id == client_id)).scalar_one_or_none()
 
     def get_by_email(self, email: str) -> Optional[Client]:
         stmt = select(Client).where(Client.email == email)
@@ -24,21 +60,46 @@ class ClientDAO:
         stmt = select(Client).where(Client.phone == phone)
         return self.db.execute(stmt).scalar_one_or_none()
 
+    def find_taken(self, emails: Iterable[str], phones: Iterable[str]) -> tuple[set[str], set[str]]:
+        """Emails y teléfonos (de los dados) que ya existen, en una sola consulta."""
+        emails, phones = list(emails), list(phones)
+        conditions = []
+        if emails:
+            conditions.append(Client.email.in_(emails))
+        if phones:
+            conditions.append(Client.phone.in_(phones))
+        if not conditions:
+            return set(), set()
+        rows = self.db.execute(select(Client.email, Client.phone).where(or_(*conditions))).all()
+        wanted_emails, wanted_phones = set(emails), set(phones)
+        return (
+            {r.email for r in rows if r.email in wanted_emails},
+            {r.phone for r in rows if r.phone in wanted_phones},
+        )
+
+    def insert_returning(self, values: dict) -> Row:
+        """INSERT ... RETURNING de las columnas de listado (sin commit ni refresh)."""
+        return self.db.execute(insert(Client).values(**values).returning(*LIST_COLUMNS)).one()
+
+    def insert_many(self, rows: list[dict]) -> list[str]:
+        """INSERT multi-fila con RETURNING (sin commit: lo hace el llamador por lote)."""
+        if not rows:
+            return []
+        return list(self.db.execute(insert(Client).returning(Client.id), rows).scalars())
+
     def create(self, client: Client) -> Client:
         self.db.add(client)
-        self.db.commit()
-        self.db.refresh(client)
+        self.db.flush()
         return client
 
     def update(self, client: Client) -> Client:
         self.db.add(client)
-        self.db.commit()
-        self.db.refresh(client)
+        self.db.flush()
         return client
 
     def delete(self, client: Client) -> None:
         self.db.delete(client)
-        self.db.commit()
+        self.db.flush()
 
     def build_query(
         self,
@@ -47,7 +108,7 @@ class ClientDAO:
         text: str | None = None,
         user_id: str | None = None,
     ) -> Select:
-        stmt = select(Client)
+        stmt = select(*LIST_COLUMNS)
         if user_id:
             stmt = stmt.join(UserClient, UserClient.client_id == Client.id).where(UserClient.user_id == user_id)
         if status is not None:
@@ -57,6 +118,79 @@ class ClientDAO:
             stmt = stmt.where(
                 (Client.contact_name.ilike(like)) | (Client.phone.ilike(like)) | (Client.email.ilike(like))
             )
-        return stmt.order_by(Client.created_at.desc())
+        # id como desempate: orden total estable, requerido por la paginación keyset
+        return stmt.order_by(Client.created_at.desc(), Client.id.desc())
+
+    @staticmethod
+    def with_company(stmt: Select) -> Select:
+        """Agrega al SELECT de clientes sólo las columnas resumen de su compañía (una sola consulta)."""
+        return stmt.join(Company, Client.company).add_columns(*COMPANY_SUMMARY_COLUMNS)
+
+    def build_ranked_query(
+        self,
+        *,
+        text: str,
+        status: ClientStatus | None = None,
+        user_id: str | None = None,
+    ) -> Select:
+        """Búsqueda multi-token ("ana 300"): todos los tokens deben coincidir; orden por relevancia.
+
+        Tokens alfabéticos de 3+ caracteres van por FTS con prefijo (search_document); el resto
+        (cortos, numéricos o mixtos como "300a1b") por trigram sobre search_text, que también
+        incluye el teléfono.
+        """
+        stmt = self.build_query(status=status, user_id=user_id).order_by(None)
+        tokens = re.findall(r"[^\W_]+", text.lower())
+        if not tokens:
+            return stmt.order_by(Client.created_at.desc(), Client.id.desc())
+        if self.db.get_bind().dialect.name != "postgresql":
+            # Sin FTS/pg_trgm: AND de tokens sobre las columnas del ILIKE
+            for tok in tokens:
+                like = f"%{tok}%"
+                stmt = stmt.where(or_(Client.contact_name.ilike(like), Client.phone.ilike(like), Client.email.ilike(like)))
+            return stmt.order_by(Client.created_at.desc(), Client.id.desc())
+
+        fts_terms = [t for t in tokens if t.isalpha() and len(t) >= 3]
+        trgm_terms = [t for t in tokens if t not in fts_terms]
+        conditions = []
+        rank = func.similarity(_search_text, func.f_unaccent(" ".join(tokens)))
+        if fts_terms:
+            tsquery = func.to_tsquery(_simple, func.f_unaccent(" & ".join(f"{t}:*" for t in fts_terms)))
+            conditions.append(_search_document.op("@@")(tsquery))
+            rank = rank + func.ts_rank(_search_document, tsquery)
+        for tok in trgm_terms:
+            conditions.append(_search_text.like(func.f_unaccent(f"%{tok}%")))
+        stmt = stmt.where(and_(*conditions))
+        return stmt.order_by(rank.desc(), Client.created_at.desc(), Client.id.desc())
+
+    @staticmethod
+    def after_cursor(created_at: datetime, client_id: str) -> ColumnElement[bool]:
+        # (created_at, id) < (:c, :i) recorre ix_clients_created_at_id como un range scan
+        return tuple_(Client.created_at, Client.id) < tuple_(created_at, client_id)
 
 
+@instrument_dao
+class AsyncClientDAO:
+    """Operaciones de ClientDAO usadas por el modo ASGI, sobre AsyncSession."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, client_id: str, *, for_update: bool = False) -> Optional[Client]:
+        return await self.db.get(Client, client_id, with_for_update=for_update or None)
+
+    async def get_updated_at(self, client_id: str) -> Optional[datetime]:
+        return (await self.db.execute(select(Client.updated_at).where(Client.id == client_id))).scalar_one_or_none()
+
+    async def insert_returning(self, values: dict) -> Row:
+        result = await self.db.execute(insert(Client).values(**values).returning(*LIST_COLUMNS))
+        return result.one()
+
+    async def update(self, client: Client) -> Client:
+        self.db.add(client)
+        await self.db.flush()
+        return client
+
+    async def delete(self, client: Client) -> None:
+        await self.db.delete(client)
+        await self.db.flush()
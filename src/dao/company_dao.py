@@ -1,19 +1,52 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.models.company import Company
+from src.utils.instrumentation import instrument_dao
 
 
+# Columnas de los listados: filas Core (sin hidratar entidades ni identity map)
+LIST_COLUMNS = (
+    Company.id,
+    Company.nit,
+    Company.business_name,
+    Company.description,
+    Company.address,
+    Company.phone,
+    Company.city,
+    Company.status,
+    Company.created_at,
+    Company.updated_at,
+)
+
+# Parámetros máximos por sentencia (PostgreSQL: 65535; SQLite >= 3.32: 32766)
+_MAX_BIND_PARAMS = {"postgresql": 65535, "sqlite": 32766}
+
+
+@instrument_dao
 class CompanyDAO:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_by_id(self, company_id: str) -> Optional[Company]:
-        return self.db.get(Company, company_id)
+    def get_by_id(self, company_id: str, *, for_update: bool = False, primary: bool = False) -> Optional[Company]:
+        """`primary`: leer del primario aunque la sesión lea de réplicas (ver RoutingSession)."""
+        return self.db.get(
+            Company,
+            company_id,
+            with_for_update=for_update or None,
+            bind_arguments={"primary": True} if primary else None,
+        )
+
+    def get_updated_at(self, company_id: str) -> Optional[datetime]:
+        """Sólo updated_at (versión para ETag/Last-Modified), sin cargar la entidad."""
+        return self.db.execute(select(Company.updated_at).where(Company.id == company_id)).scalar_one_or_none()
 
     def get_by_nit(self, nit: str) -> Optional[Company]:
         stmt = select(Company).where(Company.nit == nit)
@@ -21,28 +54,63 @@ class CompanyDAO:
 
     def create(self, company: Company) -> Company:
         self.db.add(company)
-        self.db.commit()
-        self.db.refresh(company)
+        self.db.flush()
         return company
 
     def update(self, company: Company) -> Company:
         self.db.add(company)
-        self.db.commit()
-        self.db.refresh(company)
+        self.db.flush()
         return company
 
     def delete(self, company: Company) -> None:
         self.db.delete(company)
-        self.db.commit()
+        self.db.flush()
 
     def build_query(self, *, status: str | None = None, text: str | None = None):
-        stmt = select(Company)
+        stmt = select(*LIST_COLUMNS)
         if status:
             stmt = stmt.where(Company.status == status)
         if text:
             like = f"%{text.lower()}%"
             stmt = stmt.where((Company.business_name.ilike(like)) | (Company.city.ilike(like)) | (Company.nit.ilike(like)))
-        return stmt.order_by(Company.created_at.desc())
+        return stmt.order_by(Company.created_at.desc(), Company.id.desc())
+
+    @staticmethod
+    def after_cursor(created_at: datetime, company_id: str) -> ColumnElement[bool]:
+        return tuple_(Company.created_at, Company.id) < tuple_(created_at, company_id)
+
+    def ids_by_nit(self, nits: Sequence[str]) -> dict[str, str]:
+        """nit -> id de las compañías existentes con esos NITs."""
+        if not nits:
+            return {}
+        rows = self.db.execute(select(Company.nit, Company.id).where(Company.nit.in_(list(nits))))
+        return {nit: company_id for nit, company_id in rows}
+
+    def upsert_many(self, rows: list[dict], update_columns: Sequence[str]) -> None:
+        """INSERT ... ON CONFLICT (nit) DO UPDATE multi-fila (sin commit: lo hace el llamador por lote).
+
+        Si el NIT ya existe sólo se actualizan `update_columns` (más updated_at): las columnas que
+        no vienen en la entrada conservan su valor. Los NIT deben ser únicos dentro de `rows`
+        (PostgreSQL no actualiza dos veces la misma fila).
+        """
+        if not rows:
+            return
+        dialect = self.db.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        # Un parámetro por columna y fila: se parte en sentencias que no pasen el límite del driver
+        step = max(1, _MAX_BIND_PARAMS.get(dialect, 32766) // len(rows[0]))
+        for start in range(0, len(rows), step):
+            stmt = insert(Company).values(rows[start:start + step])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Company.nit],
+                set_={name: stmt.excluded[name] for name in (*update_columns, "updated_at")},
+            )
+            self.db.execute(stmt)
+
+    def existing_ids(self, ids: Sequence[str]) -> set[str]:
+        if not ids:
+            return set()
+        return set(self.db.execute(select(Company.id).where(Company.id.in_(list(ids)))).scalars())
 
     def get_by_ids(self, ids: Sequence[str]) -> list[Company]:
         if not ids:
@@ -51,3 +119,29 @@ class CompanyDAO:
         return list(self.db.execute(stmt).scalars().all())
 
 
+@instrument_dao
+class AsyncCompanyDAO:
+    """Operaciones de CompanyDAO usadas por el modo ASGI, sobre AsyncSession."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, company_id: str, *, for_update: bool = False) -> Optional[Company]:
+        return await self.db.get(Company, company_id, with_for_update=for_update or None)
+
+    async def get_updated_at(self, company_id: str) -> Optional[datetime]:
+        return (await self.db.execute(select(Company.updated_at).where(Company.id == company_id))).scalar_one_or_none()
+
+    async def create(self, company: Company) -> Company:
+        self.db.add(company)
+        await self.db.flush()
+        return company
+
+    async def update(self, company: Company) -> Company:
+        self.db.add(company)
+        await self.db.flush()
+        return company
+
+    async def delete(self, company: Company) -> None:
+        await self.db.delete(company)
+        await self.db.flush()
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.models.user_client import UserClient
+from src.utils.instrumentation import instrument_dao
 
 
+@instrument_dao
 class UserClientDAO:
     def __init__(self, db: Session):
         self.db = db
@@ -18,8 +21,21 @@ class UserClientDAO:
 
     def create(self, entity: UserClient) -> UserClient:
         self.db.add(entity)
-        self.db.commit()
-        self.db.refresh(entity)
+        self.db.flush()
         return entity
 
+    def create_many(self, *, user_id: str, client_ids: Sequence[str]) -> None:
+        """Asocia el usuario a clientes recién creados (sin commit)."""
+        if client_ids:
+            self.db.execute(insert(UserClient), [{"user_id": user_id, "client_id": cid} for cid in client_ids])
 
+
+@instrument_dao
+class AsyncUserClientDAO:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_many(self, *, user_id: str, client_ids: Sequence[str]) -> None:
+        """Asocia el usuario a clientes recién creados (sin commit)."""
+        if client_ids:
+            await self.db.execute(insert(UserClient), [{"user_id": user_id, "client_id": cid} for cid in client_ids])
@@ -3,17 +3,21 @@ from __future__ import annotations
 from typing import Optional
 
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.models.user import User
+from src.utils.instrumentation import instrument_dao
 
 
+@instrument_dao
 class UserDAO:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_by_id(self, user_id: str) -> Optional[User]:
-        return self.db.get(User, user_id)
+    def get_by_id(self, user_id: str, *, primary: bool = False) -> Optional[User]:
+        """`primary`: leer del primario aunque la sesión lea de réplicas (ver RoutingSession)."""
+        return self.db.get(User, user_id, bind_arguments={"primary": True} if primary else None)
 
     def get_by_email(self, email: str) -> Optional[User]:
         stmt = select(User).where(User.email == email)
@@ -25,14 +29,21 @@ class UserDAO:
 
     def create(self, user: User) -> User:
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self.db.flush()
         return user
 
     def update(self, user: User) -> User:
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self.db.flush()
         return user
 
 
+@instrument_dao
+class AsyncUserDAO:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, user_id: str, *, primary: bool = False) -> Optional[User]:
+        # AsyncSession.get() no acepta bind_arguments
+        stmt = select(User).where(User.id == user_id)
+        return (await self.db.execute(stmt, bind_arguments={"primary": True} if primary else None)).scalar_one_or_none()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict
+
+from quart import Quart, g
+from sqlalchemy import URL, event, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .database import DATABASE_URL, _enable_sqlite_foreign_keys, engine_options
+from .utils.instrumentation import instrument_engine
+from .utils.query_budget import watch_engine
+
+
+def async_url(url: URL) -> URL:
+    """Driver asíncrono equivalente a DATABASE_URL: psycopg (3) en PostgreSQL, aiosqlite en SQLite."""
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        return url.set(drivername="postgresql+psycopg")
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+def async_engine_options(url: URL) -> Dict[str, Any]:
+    options = engine_options(url)
+    options.pop("future", None)
+    if "poolclass" in options:
+        # Mismos pool_size/max_overflow/pool_timeout, con el pool apto para drivers asíncronos
+        # (explícito: aiosqlite usaría NullPool por defecto)
+        options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+
+# ASYNC_DATABASE_URL permite un DSN distinto; por defecto es DATABASE_URL con el driver asíncrono
+ASYNC_DATABASE_URL = make_url(os.getenv("ASYNC_DATABASE_URL") or async_url(make_url(DATABASE_URL)))
+
+async_engine: AsyncEngine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_options(ASYNC_DATABASE_URL))
+instrument_engine(async_engine.sync_engine)
+watch_engine(async_engine.sync_engine)
+if async_engine.dialect.name == "sqlite":
+    event.listen(async_engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+
+
+def _dispose_after_fork() -> None:
+    async_engine.sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_after_fork)
+
+# Mismo criterio que SessionLocal: el service hace commit y los objetos siguen usables sin recargar
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+def get_async_session() -> AsyncSession:
+    """Sesión asíncrona de la petición en curso (compartida por auth, services y DAOs)."""
+    if "db" not in g:
+        g.db = AsyncSessionLocal()
+    return g.db
+
+
+def init_app(app: Quart) -> None:
+    @app.teardown_request
+    async def _close_session(exc: BaseException | None) -> None:
+        db = g.pop("db", None)
+        if db is None:
+            return
+        if exc is not None:
+            await db.rollback()
+        await db.close()
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import List
+from pydantic import BaseModel
+
+
+class BulkRowErrorDTO(BaseModel):
+    row: int
+    error: str | List[str]
+
+
+class BulkResultDTO(BaseModel):
+    received: int
+    created: int
+    updated: int = 0
+    failed: int
+    errors: List[BulkRowErrorDTO]
+    elapsed_seconds: float
+    rows_per_second: float
+    dry_run: bool = False
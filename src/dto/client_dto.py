@@ -28,3 +28,14 @@ class ClientDTO(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+
+class CompanySummaryDTO(BaseModel):
+    id: str
+    nit: str
+    business_name: str
+    city: str | None = None
+    status: ClientStatus
+
+
+class ClientWithCompanyDTO(ClientDTO):
+    company: CompanySummaryDTO | None = None
@@ -22,6 +22,15 @@ class CompanyCreateDTO(BaseModel):
         return validate_and_normalize_nit(v)
 
 
+class CompanyImportDTO(CompanyCreateDTO):
+    """Fila de la carga masiva: el NIT ya llega normalizado por `validate_nits` (por lote)."""
+
+    @field_validator("nit")
+    @classmethod
+    def validate_nit(cls, v: str) -> str:
+        return v
+
+
 class CompanyDTO(BaseModel):
     id: str
     nit: str
@@ -1,2 +1,4 @@
 # Makes models a package
-
+# Importa todos los modelos: las relationship() se resuelven por nombre al configurar los mappers,
+# así que cualquier import de un modelo debe registrar también los demás.
+from . import client, company, user, user_client  # noqa: F401,E402
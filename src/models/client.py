@@ -4,10 +4,15 @@ import uuid
 from datetime import datetime, timezone
 from enum import Enum
 
+from typing import TYPE_CHECKING
+
 from sqlalchemy import String, DateTime, Enum as SAEnum, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..database import Base, RELATIONSHIP_LAZY
 
-from ..database import Base
+if TYPE_CHECKING:
+    from .company import Company
 
 
 class ClientStatus(str, Enum):
@@ -37,6 +42,8 @@ class Client(Base):
         DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc)
     )
 
+    company: Mapped["Company"] = relationship(back_populates="clients", lazy=RELATIONSHIP_LAZY)
+
     def __repr__(self) -> str:  # pragma: no cover - developer helper
         return f"<Client id={self.id} nit={self.nit} status={self.status}>"
 
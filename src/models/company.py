@@ -4,10 +4,15 @@ import uuid
 from datetime import datetime, timezone
 from enum import Enum
 
+from typing import TYPE_CHECKING
+
 from sqlalchemy import String, DateTime, Enum as SAEnum
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..database import Base, RELATIONSHIP_LAZY
 
-from ..database import Base
+if TYPE_CHECKING:
+    from .client import Client
 
 
 class CompanyStatus(str, Enum):
@@ -39,6 +44,9 @@ class Company(Base):
         DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc)
     )
 
+    # ON DELETE CASCADE en la FK: el ORM no carga ni actualiza los clientes al borrar la compañía
+    clients: Mapped[list["Client"]] = relationship(back_populates="company", lazy=RELATIONSHIP_LAZY, passive_deletes=True)
+
     def __repr__(self) -> str:  # pragma: no cover
         return f"<Company id={self.id} nit={self.nit} status={self.status}>"
 
@@ -4,10 +4,15 @@ import uuid
 from datetime import datetime, timezone
 
 from enum import Enum
-from sqlalchemy import String, DateTime, Enum as SAEnum
-from sqlalchemy.orm import Mapped, mapped_column
+from typing import TYPE_CHECKING
 
-from ..database import Base
+from sqlalchemy import String, DateTime, Integer, Enum as SAEnum
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..database import Base, RELATIONSHIP_LAZY
+
+if TYPE_CHECKING:
+    from .client import Client
 
 
 class User(Base):
@@ -36,13 +41,19 @@ class User(Base):
         SAEnum(UserStatus, name="user_status"), nullable=False, default=UserStatus.ACTIVE
     )
 
+    # Se incrementa al desactivar, cambiar password o hacer logout: invalida tokens con `ver` anterior
+    token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), nullable=False, index=True, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc)
     )
 
+    # Sólo lectura: la asociación se gestiona con UserClient/UserClientDAO
+    clients: Mapped[list["Client"]] = relationship(secondary="user_clients", lazy=RELATIONSHIP_LAZY, viewonly=True)
+
     def __repr__(self) -> str:  # pragma: no cover - developer helper
         return f"<User id={self.id} email={self.email}>"
 
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from quart import Blueprint, jsonify, request
+
+from src.database_async import get_async_session
+from src.dto.user_dto import UserReadDTO
+from src.services.auth_service import AsyncAuthService
+
+
+# Sólo la introspección; /login (bcrypt) y /logout los atiende la app WSGI (ver src/asgi.py)
+bp = Blueprint("auth", __name__)
+
+
+@bp.get("/auth")
+async def auth():
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return jsonify({"error": "MISSING_TOKEN"}), 401
+    token = auth_header.split(" ", 1)[1]
+    try:
+        # Introspección: valida usuario y versión del token aun en modo stateless; los datos salen de la
+        # caché de principal (write-through) o de la base, como en el resto de rutas en modo db
+        user = await AsyncAuthService(get_async_session()).authenticate(token, stateless=False)
+        dto = UserReadDTO(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            nickname=user.nickname,
+            company=user.company,
+            status=user.status.value,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+        return jsonify(dto.model_dump()), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 401
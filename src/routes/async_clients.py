@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from pydantic import ValidationError
+from quart import Blueprint, current_app, g, jsonify, request
+
+from src.database_async import get_async_session
+from src.dto.client_dto import ClientCreateDTO
+from src.routes.clients import list_arguments, version_arguments
+from src.services.client_service import AsyncClientService
+from src.utils.async_auth import require_auth
+from src.utils.conditional import entity_etag, has_validators, is_not_modified, list_etag, not_modified, set_validators
+from src.utils.pagination import page_body
+
+
+# Mismo nombre de blueprint y de vistas que src/routes/clients.py: src/asgi.py despacha por endpoint
+bp = Blueprint("clients", __name__, url_prefix="/clients")
+
+
+@bp.post("")
+@require_auth
+async def create_client():
+    try:
+        dto = ClientCreateDTO(**await request.get_json(force=True))
+    except ValidationError as e:
+        return jsonify({"error": [err.get("msg") for err in e.errors()]}), 400
+    try:
+        c = await AsyncClientService(get_async_session()).create(dto, current_user_id=g.current_user.id)
+        return jsonify(c.model_dump()), 201
+    except ValueError as e:
+        if str(e) in {"EMAIL_TAKEN", "PHONE_TAKEN"}:
+            return jsonify({"error": str(e)}), 409
+        return jsonify({"error": str(e)}), 400
+
+
+@bp.get("")
+@require_auth
+async def list_clients():
+    try:
+        keyset, options = list_arguments(request.args)
+        service = AsyncClientService(get_async_session())
+        scope = (g.current_user.id, request.query_string)
+        if request.if_none_match and options["total"] == "exact":
+            version = await service.list_version(current_user_id=g.current_user.id, **version_arguments(options))
+            etag = list_etag(version, *scope)
+            if is_not_modified(request, etag):
+                return not_modified(current_app.response_class, etag, weak=True)
+        if keyset:
+            page_result = await service.list_keyset(current_user_id=g.current_user.id, **options)
+        else:
+            page_result = await service.list_paginated(current_user_id=g.current_user.id, **options)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    result = [i.model_dump() for i in page_result.items]
+    response = jsonify(page_body(page_result, result, keyset=keyset, total_mode=options["total"]))
+    if page_result.version is not None:
+        response.set_etag(list_etag(page_result.version, *scope), weak=True)
+    return response, 200
+
+
+@bp.put("/<client_id>")
+@require_auth
+async def update_client(client_id: str):
+    try:
+        dto = ClientCreateDTO(**await request.get_json(force=True))
+    except ValidationError as e:
+        return jsonify({"error": [err.get("msg") for err in e.errors()]}), 400
+    try:
+        c = await AsyncClientService(get_async_session()).update(client_id, dto, if_match=request.if_match or None)
+        return set_validators(jsonify(c.model_dump()), entity_etag(c.id, c.updated_at), c.updated_at), 200
+    except ValueError as e:
+        if str(e) == "NOT_FOUND":
+            return jsonify({"error": "NOT_FOUND"}), 404
+        if str(e) == "PRECONDITION_FAILED":
+            return jsonify({"error": "PRECONDITION_FAILED"}), 412
+        if str(e) in {"EMAIL_TAKEN", "PHONE_TAKEN"}:
+            return jsonify({"error": str(e)}), 409
+        return jsonify({"error": str(e)}), 400
+
+
+@bp.post("/<client_id>/deactivate")
+@require_auth
+async def deactivate_client(client_id: str):
+    try:
+        c = await AsyncClientService(get_async_session()).deactivate(client_id)
+        return jsonify(c.model_dump()), 200
+    except ValueError as e:
+        code = 404 if str(e) == "NOT_FOUND" else 400
+        return jsonify({"error": str(e)}), code
+
+
+@bp.delete("/<client_id>")
+@require_auth
+async def delete_client(client_id: str):
+    try:
+        await AsyncClientService(get_async_session()).delete(client_id)
+        return ("", 204)
+    except ValueError as e:
+        code = 404 if str(e) == "NOT_FOUND" else 400
+        return jsonify({"error": str(e)}), code
+
+
+@bp.get("/<client_id>")
+@require_auth
+async def get_client(client_id: str):
+    service = AsyncClientService(get_async_session())
+    if has_validators(request):
+        updated_at = await service.dao.get_updated_at(client_id)
+        if updated_at is not None and is_not_modified(request, entity_etag(client_id, updated_at), updated_at):
+            return not_modified(current_app.response_class, entity_etag(client_id, updated_at), updated_at)
+    try:
+        c = await service.get(client_id)
+        return set_validators(jsonify(c.model_dump()), entity_etag(c.id, c.updated_at), c.updated_at), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
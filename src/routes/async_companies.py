@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from pydantic import ValidationError
+from quart import Blueprint, current_app, jsonify, request
+
+from src.database_async import get_async_session
+from src.dto.company_dto import CompanyCreateDTO
+from src.routes.companies import list_arguments
+from src.services.company_service import AsyncCompanyService
+from src.utils.async_auth import require_auth
+from src.utils.conditional import entity_etag, has_validators, is_not_modified, list_etag, not_modified, set_validators
+from src.utils.pagination import page_body
+
+
+# Mismo nombre de blueprint y de vistas que src/routes/companies.py: src/asgi.py despacha por endpoint
+bp = Blueprint("companies", __name__, url_prefix="/companies")
+
+
+@bp.post("")
+@require_auth
+async def create_company():
+    try:
+        dto = CompanyCreateDTO(**await request.get_json(force=True))
+    except ValidationError as e:
+        return jsonify({"error": [err.get("msg") for err in e.errors()]}), 400
+    try:
+        c = await AsyncCompanyService(get_async_session()).create(dto)
+        return jsonify(c.model_dump()), 201
+    except ValueError as e:
+        code = 409 if str(e) == "NIT_TAKEN" else 400
+        return jsonify({"error": str(e)}), code
+
+
+@bp.get("")
+@require_auth
+async def list_companies():
+    keyset, options = list_arguments(request.args)
+    service = AsyncCompanyService(get_async_session())
+    if request.if_none_match and options["total"] == "exact":
+        etag = list_etag(await service.list_version(status=options["status"], text=options["text"]), request.query_string)
+        if is_not_modified(request, etag):
+            return not_modified(current_app.response_class, etag, weak=True)
+    try:
+        if keyset:
+            page_result = await service.list_keyset(**options)
+        else:
+            page_result = await service.list_paginated(**options)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    items = [i.model_dump() for i in page_result.items]
+    response = jsonify(page_body(page_result, items, keyset=keyset, total_mode=options["total"]))
+    if page_result.version is not None:
+        response.set_etag(list_etag(page_result.version, request.query_string), weak=True)
+    return response, 200
+
+
+@bp.get("/<company_id>")
+@require_auth
+async def get_company(company_id: str):
+    service = AsyncCompanyService(get_async_session())
+    if has_validators(request):
+        updated_at = await service.get_updated_at(company_id)
+        if updated_at is not None and is_not_modified(request, entity_etag(company_id, updated_at), updated_at):
+            return not_modified(current_app.response_class, entity_etag(company_id, updated_at), updated_at)
+    try:
+        c = await service.get(company_id)
+        return set_validators(jsonify(c.model_dump()), entity_etag(c.id, c.updated_at), c.updated_at), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+
+
+@bp.put("/<company_id>")
+@require_auth
+async def update_company(company_id: str):
+    try:
+        dto = CompanyCreateDTO(**await request.get_json(force=True))
+    except ValidationError as e:
+        return jsonify({"error": [err.get("msg") for err in e.errors()]}), 400
+    try:
+        c = await AsyncCompanyService(get_async_session()).update(company_id, dto, if_match=request.if_match or None)
+        return set_validators(jsonify(c.model_dump()), entity_etag(c.id, c.updated_at), c.updated_at), 200
+    except ValueError as e:
+        if str(e) == "NOT_FOUND":
+            return jsonify({"error": "NOT_FOUND"}), 404
+        if str(e) == "PRECONDITION_FAILED":
+            return jsonify({"error": "PRECONDITION_FAILED"}), 412
+        if str(e) == "NIT_TAKEN":
+            return jsonify({"error": "NIT_TAKEN"}), 409
+        return jsonify({"error": str(e)}), 400
+
+
+@bp.delete("/<company_id>")
+@require_auth
+async def delete_company(company_id: str):
+    try:
+        await AsyncCompanyService(get_async_session()).delete(company_id)
+        return ("", 204)
+    except ValueError:
+        return jsonify({"error": "NOT_FOUND"}), 404
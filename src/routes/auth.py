@@ -1,41 +1,48 @@
 from __future__ import annotations
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 
-from src.database import get_db
+from src.database import get_session
 from src.dto.user_dto import UserReadDTO
 from src.services.auth_service import AuthService
+from src.services.user_service import UserService
+from src.utils.auth import require_auth
+from src.utils.query_budget import query_budget
 
 
 bp = Blueprint("auth", __name__)
 
 
 @bp.post("/login")
+@query_budget(3)
 def login():
     body = request.get_json(force=True) or {}
     identifier = body.get("identifier") or body.get("email") or body.get("nickname")
     password = body.get("password")
     if not identifier or not password:
         return jsonify({"error": "MISSING_CREDENTIALS"}), 400
-    db = next(get_db())
+    db = get_session()
     try:
         token = AuthService(db).login(identifier, password)
         return jsonify({"access_token": token, "token_type": "bearer", "expires_in": 1800}), 200
     except ValueError as e:
+        if str(e) == "AUTH_BUSY":
+            return jsonify({"error": "AUTH_BUSY"}), 503, {"Retry-After": "1"}
         return jsonify({"error": str(e)}), 401
-    finally:
-        db.close()
 
 
 @bp.get("/auth")
+@query_budget(1)
 def auth():
     auth_header = request.headers.get("Authorization", "")
     if not auth_header.startswith("Bearer "):
         return jsonify({"error": "MISSING_TOKEN"}), 401
     token = auth_header.split(" ", 1)[1]
-    db = next(get_db())
+    db = get_session()
     try:
-        user = AuthService(db).authenticate(token)
+        # Introspección: valida usuario y versión del token aun en modo stateless; los datos salen de la
+        # caché de principal (write-through) o de la base, como en el resto de rutas en modo db
+        user = AuthService(db).authenticate(token, stateless=False)
         dto = UserReadDTO(
             id=user.id,
             name=user.name,
@@ -49,7 +56,15 @@ def auth():
         return jsonify(dto.model_dump()), 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 401
-    finally:
-        db.close()
 
 
+@bp.post("/logout")
+@query_budget(3)
+@require_auth
+def logout():
+    db = get_session()
+    try:
+        UserService(db).revoke_tokens(g.current_user.id)
+        return ("", 204)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 401
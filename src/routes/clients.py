@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from pydantic import ValidationError
 
-from src.database import get_db
+from src.database import get_session
 from src.dto.client_dto import ClientCreateDTO, ClientStatus
 from src.services.client_service import ClientService
 from src.utils.auth import require_auth
+from src.utils.bulk import BULK_CHUNK_SIZE, BULK_MAX_CHUNK_SIZE, iter_records
+from src.utils.conditional import entity_etag, has_validators, is_not_modified, list_etag, not_modified, set_validators
+from src.utils.export import export_response
+from src.utils.pagination import page_body
+from src.utils.query_budget import query_budget
 from flask import g
 
 
@@ -14,13 +19,14 @@ bp = Blueprint("clients", __name__, url_prefix="/clients")
 
 
 @bp.post("")
+@query_budget(3)
 @require_auth
 def create_client():
     try:
         dto = ClientCreateDTO(**request.get_json(force=True))
     except ValidationError as e:
         return jsonify({"error": [err.get("msg") for err in e.errors()]}), 400
-    db = next(get_db())
+    db = get_session()
     try:
         service = ClientService(db)
         c = service.create(dto, current_user_id=g.current_user.id)
@@ -29,105 +35,164 @@ def create_client():
         if str(e) in {"EMAIL_TAKEN", "PHONE_TAKEN"}:
             return jsonify({"error": str(e)}), 409
         return jsonify({"error": str(e)}), 400
-    finally:
-        db.close()
 
 
-@bp.get("")
+@bp.post("/bulk")
+@query_budget(None)
 @require_auth
-def list_clients():
-    page = int(request.args.get("page", 1))
-    size = int(request.args.get("size", 10))
+def bulk_create_clients():
+    """Importa clientes desde NDJSON (application/x-ndjson) o CSV (text/csv) leídos en streaming."""
+    try:
+        chunk_size = int(request.args.get("chunk_size", BULK_CHUNK_SIZE))
+    except ValueError:
+        return jsonify({"error": "INVALID_CHUNK_SIZE"}), 400
+    if not 1 <= chunk_size <= BULK_MAX_CHUNK_SIZE:
+        return jsonify({"error": "INVALID_CHUNK_SIZE"}), 400
+    try:
+        records = iter_records(request.stream, request.mimetype)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 415
+    db = get_session()
+    result = ClientService(db).bulk_create(records, current_user_id=g.current_user.id, chunk_size=chunk_size)
+    return jsonify(result.model_dump()), 200
+
+
+@bp.get("/export")
+@query_budget(None)
+@require_auth
+def export_clients():
+    """Exporta todos los clientes del usuario (mismos filtros status/q que el listado) en streaming."""
     status = request.args.get("status")
-    text = request.args.get("q")
-    include_company = request.args.get("include_company") == "true"
     status_enum = ClientStatus(status) if status in {"ACTIVE", "INACTIVE"} else None
-    db = next(get_db())
+    db = get_session()
+    stmt = ClientService(db).dao.build_query(status=status_enum, text=request.args.get("q"), user_id=g.current_user.id)
     try:
-        service = ClientService(db)
-        total, items = service.list_paginated(page=page, size=size, status=status_enum, text=text, current_user_id=g.current_user.id)
-        result = [i.model_dump() for i in items]
-        if include_company:
-            # naive join: fetch companies by batch
-            from src.dao.company_dao import CompanyDAO
-
-            company_ids = {it["company_id"] for it in result if it.get("company_id")}
-            companies = {c.id: c for c in CompanyDAO(db).get_by_ids(list(company_ids))}
-            for it in result:
-                cid = it.get("company_id")
-                comp = companies.get(cid)
-                if comp:
-                    it["company"] = {
-                        "id": comp.id,
-                        "nit": comp.nit,
-                        "business_name": comp.business_name,
-                        "city": comp.city,
-                        "status": comp.status.value,
-                    }
-        return jsonify({"total": total, "items": result}), 200
-    finally:
-        db.close()
+        return export_response(db, stmt, fmt=request.args.get("format", "ndjson"), filename="clients")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def list_arguments(args) -> tuple[bool, dict]:
+    """(keyset, kwargs de list_keyset/list_paginated) de GET /clients; ValueError(código) si son inválidos.
+
+    Compartido con la vista async (src/routes/async_clients.py).
+    """
+    size = int(args.get("size", 10))
+    status = args.get("status")
+    # include=company (lista separada por comas); include_company=true se mantiene por compatibilidad
+    includes = {part.strip() for part in args.get("include", "").split(",") if part.strip()}
+    if includes - {"company"}:
+        raise ValueError("INVALID_INCLUDE")
+    include_company = "company" in includes or args.get("include_company") == "true"
+    status_enum = ClientStatus(status) if status in {"ACTIVE", "INACTIVE"} else None
+    # `cursor` presente (aunque vacío) activa la paginación keyset; sin él se mantiene page/size
+    cursor = args.get("cursor")
+    search_mode = args.get("search", "ilike")
+    if search_mode not in {"ilike", "ranked"}:
+        raise ValueError("INVALID_SEARCH_MODE")
+    ranked = search_mode == "ranked"
+    if ranked and cursor is not None:
+        # el orden por relevancia no es compatible con el cursor (created_at, id)
+        raise ValueError("CURSOR_NOT_SUPPORTED")
+    common = dict(size=size, status=status_enum, text=args.get("q"), total=args.get("total", "exact"), include_company=include_company)
+    if cursor is not None:
+        return True, dict(common, cursor=cursor)
+    return False, dict(common, page=int(args.get("page", 1)), ranked=ranked)
+
+
+def version_arguments(options: dict) -> dict:
+    """kwargs de list_version (sólo el filtro) a partir de los de list_arguments."""
+    return dict(status=options["status"], text=options["text"], ranked=options.get("ranked", False), include_company=options["include_company"])
+
+
+@bp.get("")
+@query_budget(3)
+@require_auth
+def list_clients():
+    try:
+        keyset, options = list_arguments(request.args)
+        service = ClientService(get_session())
+        # ETag débil = (count, max(updated_at)) del filtro; con If-None-Match vigente no se arma la página
+        scope = (g.current_user.id, request.query_string)
+        if request.if_none_match and options["total"] == "exact":
+            version = service.list_version(current_user_id=g.current_user.id, **version_arguments(options))
+            etag = list_etag(version, *scope)
+            if is_not_modified(request, etag):
+                return not_modified(current_app.response_class, etag, weak=True)
+        if keyset:
+            page_result = service.list_keyset(current_user_id=g.current_user.id, **options)
+        else:
+            page_result = service.list_paginated(current_user_id=g.current_user.id, **options)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    result = [i.model_dump() for i in page_result.items]
+    response = jsonify(page_body(page_result, result, keyset=keyset, total_mode=options["total"]))
+    if page_result.version is not None:
+        response.set_etag(list_etag(page_result.version, *scope), weak=True)
+    return response, 200
 
 
 @bp.put("/<client_id>")
+@query_budget(3)
 @require_auth
 def update_client(client_id: str):
     try:
         dto = ClientCreateDTO(**request.get_json(force=True))
     except ValidationError as e:
         return jsonify({"error": [err.get("msg") for err in e.errors()]}), 400
-    db = next(get_db())
+    db = get_session()
     try:
-        c = ClientService(db).update(client_id, dto)
-        return jsonify(c.model_dump()), 200
+        c = ClientService(db).update(client_id, dto, if_match=request.if_match or None)
+        return set_validators(jsonify(c.model_dump()), entity_etag(c.id, c.updated_at), c.updated_at), 200
     except ValueError as e:
         if str(e) == "NOT_FOUND":
             return jsonify({"error": "NOT_FOUND"}), 404
+        if str(e) == "PRECONDITION_FAILED":
+            return jsonify({"error": "PRECONDITION_FAILED"}), 412
         if str(e) in {"EMAIL_TAKEN", "PHONE_TAKEN"}:
             return jsonify({"error": str(e)}), 409
         return jsonify({"error": str(e)}), 400
-    finally:
-        db.close()
 
 
 @bp.post("/<client_id>/deactivate")
+@query_budget(3)
 @require_auth
 def deactivate_client(client_id: str):
-    db = next(get_db())
+    db = get_session()
     try:
         c = ClientService(db).deactivate(client_id)
         return jsonify(c.model_dump()), 200
     except ValueError as e:
         code = 404 if str(e) == "NOT_FOUND" else 400
         return jsonify({"error": str(e)}), code
-    finally:
-        db.close()
 
 
 @bp.delete("/<client_id>")
+@query_budget(3)
 @require_auth
 def delete_client(client_id: str):
-    db = next(get_db())
+    db = get_session()
     try:
         ClientService(db).delete(client_id)
         return ("", 204)
     except ValueError as e:
         code = 404 if str(e) == "NOT_FOUND" else 400
         return jsonify({"error": str(e)}), code
-    finally:
-        db.close()
 
 
 @bp.get("/<client_id>")
+@query_budget(2)
 @require_auth
 def get_client(client_id: str):
-    db = next(get_db())
-    try:
-        c = ClientService(db).dao.get_by_id(client_id)
-        if not c:
-            return jsonify({"error": "NOT_FOUND"}), 404
-        dto = ClientService._to_dto(c)
-        return jsonify(dto.model_dump()), 200
-    finally:
-        db.close()
+    dao = ClientService(get_session()).dao
+    if has_validators(request):
+        # Revalidación: sólo updated_at; si no cambió, 304 sin cargar la entidad ni armar el DTO
+        updated_at = dao.get_updated_at(client_id)
+        if updated_at is not None and is_not_modified(request, entity_etag(client_id, updated_at), updated_at):
+            return not_modified(current_app.response_class, entity_etag(client_id, updated_at), updated_at)
+    c = dao.get_by_id(client_id)
+    if not c:
+        return jsonify({"error": "NOT_FOUND"}), 404
+    dto = ClientService._to_dto(c)
+    return set_validators(jsonify(dto.model_dump()), entity_etag(c.id, c.updated_at), c.updated_at), 200
 
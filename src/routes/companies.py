@@ -1,94 +1,159 @@
 from __future__ import annotations
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from pydantic import ValidationError
 
-from src.database import get_db
+from src.database import get_session
 from src.dto.company_dto import CompanyCreateDTO
 from src.services.company_service import CompanyService
 from src.utils.auth import require_auth
+from src.utils.conditional import entity_etag, has_validators, is_not_modified, list_etag, not_modified, set_validators
+from src.utils.export import export_response
+from src.utils.nit import validate_nits
+from src.utils.pagination import page_body
+from src.utils.query_budget import query_budget
 
 
 bp = Blueprint("companies", __name__, url_prefix="/companies")
 
+# Máximo de NITs por petición en POST /companies/nit/validate
+NIT_VALIDATE_MAX_BATCH = 10000
+
 
 @bp.post("")
+@query_budget(2)
 @require_auth
 def create_company():
     try:
         dto = CompanyCreateDTO(**request.get_json(force=True))
     except ValidationError as e:
         return jsonify({"error": [err.get("msg") for err in e.errors()]}), 400
-    db = next(get_db())
+    db = get_session()
     try:
         c = CompanyService(db).create(dto)
         return jsonify(c.model_dump()), 201
     except ValueError as e:
         code = 409 if str(e) == "NIT_TAKEN" else 400
         return jsonify({"error": str(e)}), code
-    finally:
-        db.close()
+
+
+@bp.post("/nit/validate")
+@query_budget(1)
+@require_auth
+def validate_nit_batch():
+    body = request.get_json(force=True)
+    nits = body.get("nits") if isinstance(body, dict) else None
+    if not isinstance(nits, list):
+        return jsonify({"error": "NITS_REQUIRED"}), 400
+    if len(nits) > NIT_VALIDATE_MAX_BATCH:
+        return jsonify({"error": "BATCH_TOO_LARGE"}), 400
+    if not all(isinstance(nit, str) for nit in nits):
+        return jsonify({"error": "NIT_MUST_BE_STRING"}), 400
+    results = []
+    for raw, (nit, error) in zip(nits, validate_nits(nits)):
+        if error is None:
+            results.append({"input": raw, "valid": True, "nit": nit})
+        else:
+            results.append({"input": raw, "valid": False, "error": error})
+    valid = sum(1 for r in results if r["valid"])
+    return jsonify({"valid": valid, "invalid": len(results) - valid, "results": results}), 200
+
+
+def list_arguments(args) -> tuple[bool, dict]:
+    """(keyset, kwargs de list_keyset/list_paginated) de GET /companies (compartido con la vista async)."""
+    common = dict(size=int(args.get("size", 10)), status=args.get("status"), text=args.get("q"), total=args.get("total", "exact"))
+    cursor = args.get("cursor")
+    if cursor is not None:
+        return True, dict(common, cursor=cursor)
+    return False, dict(common, page=int(args.get("page", 1)))
 
 
 @bp.get("")
+@query_budget(3)
 @require_auth
 def list_companies():
-    page = int(request.args.get("page", 1))
-    size = int(request.args.get("size", 10))
-    status = request.args.get("status")
-    text = request.args.get("q")
-    db = next(get_db())
+    keyset, options = list_arguments(request.args)
+    service = CompanyService(get_session())
+    # ETag débil (ver list_clients); el listado de compañías no depende del usuario
+    if request.if_none_match and options["total"] == "exact":
+        etag = list_etag(service.list_version(status=options["status"], text=options["text"]), request.query_string)
+        if is_not_modified(request, etag):
+            return not_modified(current_app.response_class, etag, weak=True)
+    try:
+        if keyset:
+            page_result = service.list_keyset(**options)
+        else:
+            page_result = service.list_paginated(**options)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    items = [i.model_dump() for i in page_result.items]
+    response = jsonify(page_body(page_result, items, keyset=keyset, total_mode=options["total"]))
+    if page_result.version is not None:
+        response.set_etag(list_etag(page_result.version, request.query_string), weak=True)
+    return response, 200
+
+
+@bp.get("/export")
+@query_budget(None)
+@require_auth
+def export_companies():
+    """Exporta todas las compañías (mismos filtros status/q que el listado) en streaming."""
+    db = get_session()
+    stmt = CompanyService(db).dao.build_query(status=request.args.get("status"), text=request.args.get("q"))
     try:
-        total, items = CompanyService(db).list_paginated(page=page, size=size, status=status, text=text)
-        return jsonify({"total": total, "items": [i.model_dump() for i in items]}), 200
-    finally:
-        db.close()
+        return export_response(db, stmt, fmt=request.args.get("format", "ndjson"), filename="companies")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
 
 @bp.get("/<company_id>")
+@query_budget(2)
 @require_auth
 def get_company(company_id: str):
-    db = next(get_db())
+    service = CompanyService(get_session())
+    if has_validators(request):
+        # Revalidación: sólo updated_at (caché o columna); si no cambió, 304 sin cargar la entidad ni armar el DTO
+        updated_at = service.get_updated_at(company_id)
+        if updated_at is not None and is_not_modified(request, entity_etag(company_id, updated_at), updated_at):
+            return not_modified(current_app.response_class, entity_etag(company_id, updated_at), updated_at)
     try:
-        c = CompanyService(db).get(company_id)
-        return jsonify(c.model_dump()), 200
+        c = service.get(company_id)
+        return set_validators(jsonify(c.model_dump()), entity_etag(c.id, c.updated_at), c.updated_at), 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
-    finally:
-        db.close()
 
 
 @bp.put("/<company_id>")
+@query_budget(3)
 @require_auth
 def update_company(company_id: str):
     try:
         dto = CompanyCreateDTO(**request.get_json(force=True))
     except ValidationError as e:
         return jsonify({"error": [err.get("msg") for err in e.errors()]}), 400
-    db = next(get_db())
+    db = get_session()
     try:
-        c = CompanyService(db).update(company_id, dto)
-        return jsonify(c.model_dump()), 200
+        c = CompanyService(db).update(company_id, dto, if_match=request.if_match or None)
+        return set_validators(jsonify(c.model_dump()), entity_etag(c.id, c.updated_at), c.updated_at), 200
     except ValueError as e:
         if str(e) == "NOT_FOUND":
             return jsonify({"error": "NOT_FOUND"}), 404
+        if str(e) == "PRECONDITION_FAILED":
+            return jsonify({"error": "PRECONDITION_FAILED"}), 412
         if str(e) == "NIT_TAKEN":
             return jsonify({"error": "NIT_TAKEN"}), 409
         return jsonify({"error": str(e)}), 400
-    finally:
-        db.close()
 
 
 @bp.delete("/<company_id>")
+@query_budget(3)
 @require_auth
 def delete_company(company_id: str):
-    db = next(get_db())
+    db = get_session()
     try:
         CompanyService(db).delete(company_id)
         return ("", 204)
     except ValueError:
         return jsonify({"error": "NOT_FOUND"}), 404
-    finally:
-        db.close()
 
 
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import os
+
+from flask import Blueprint, abort, jsonify
+
+from src.database import pool_status, replicas
+from src.utils.cache import caches
+from src.utils.metrics import CACHE_METRICS, POOL_METRICS, snapshot
+from src.utils.principal_cache import principal_cache
+
+
+bp = Blueprint("internal", __name__, url_prefix="/internal")
+
+
+@bp.before_request
+def _only_when_enabled():
+    # Deshabilitado por defecto: exponer sólo en redes internas
+    if os.getenv("INTERNAL_ENDPOINTS_ENABLED", "false").lower() not in {"1", "true", "yes", "on"}:
+        abort(404)
+
+
+@bp.get("/pool")
+def pool():
+    return jsonify({
+        "pool": pool_status(),
+        "replicas": replicas.status(),
+        "metrics": snapshot(POOL_METRICS + CACHE_METRICS),
+        "auth_cache": principal_cache.stats(),
+        "caches": {name: cache.stats() for name, cache in caches.items()},
+    }), 200
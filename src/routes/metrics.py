@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import os
+
+from flask import Blueprint, Response, abort
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+
+from src.utils import instrumentation
+
+
+bp = Blueprint("metrics", __name__)
+
+
+@bp.get("/metrics")
+def metrics():
+    # Deshabilitado por defecto (METRICS_ENABLED): exponer sólo al scraper de Prometheus
+    if not instrumentation.enabled:
+        abort(404)
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Agrega los archivos de todos los workers (vivos y, para contadores, terminados)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
@@ -3,41 +3,44 @@ from __future__ import annotations
 from flask import Blueprint, request, jsonify
 from pydantic import ValidationError
 
-from src.database import get_db
+from src.database import get_session
 from src.dto.user_dto import UserCreateDTO, UserUpdateDTO
 from src.services.user_service import UserService
 from src.utils.auth import require_auth
+from src.utils.query_budget import query_budget
 
 
 bp = Blueprint("users", __name__, url_prefix="/users")
 
 
 @bp.post("")
+@query_budget(2)
 def create_user():
     try:
         dto = UserCreateDTO(**request.get_json(force=True))
     except ValidationError as e:
         return jsonify({"error": e.errors()}), 400
-    db = next(get_db())
+    db = get_session()
     try:
         service = UserService(db)
         user = service.create_user(dto)
         return jsonify(user.model_dump()), 201
     except ValueError as e:
+        if str(e) == "AUTH_BUSY":
+            return jsonify({"error": "AUTH_BUSY"}), 503, {"Retry-After": "1"}
         code = 409 if str(e) in {"EMAIL_TAKEN", "NICKNAME_TAKEN"} else 400
         return jsonify({"error": str(e)}), code
-    finally:
-        db.close()
 
 
 @bp.patch("/<user_id>")
+@query_budget(3)
 @require_auth
 def update_user(user_id: str):
     try:
         dto = UserUpdateDTO(**request.get_json(force=True))
     except ValidationError as e:
         return jsonify({"error": e.errors()}), 400
-    db = next(get_db())
+    db = get_session()
     try:
         service = UserService(db)
         user = service.update_user(user_id, dto)
@@ -48,36 +51,34 @@ def update_user(user_id: str):
             return jsonify({"error": msg}), 404
         if msg == "NICKNAME_TAKEN":
             return jsonify({"error": msg}), 409
+        if msg == "AUTH_BUSY":
+            return jsonify({"error": msg}), 503, {"Retry-After": "1"}
         return jsonify({"error": msg}), 400
-    finally:
-        db.close()
 
 
 @bp.post("/<user_id>/activate")
+@query_budget(3)
 @require_auth
 def activate_user(user_id: str):
-    db = next(get_db())
+    db = get_session()
     try:
         service = UserService(db)
         user = service.set_active(user_id, True)
         return jsonify(user.model_dump()), 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
-    finally:
-        db.close()
 
 
 @bp.post("/<user_id>/deactivate")
+@query_budget(3)
 @require_auth
 def deactivate_user(user_id: str):
-    db = next(get_db())
+    db = get_session()
     try:
         service = UserService(db)
         user = service.set_active(user_id, False)
         return jsonify(user.model_dump()), 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
-    finally:
-        db.close()
 
 
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import os
+
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.dao.user_dao import UserDAO
+from src.dao.user_dao import AsyncUserDAO, UserDAO
+from src.database import recent_writes
 from src.models.user import User
 from src.utils.jwt import create_access_token, decode_token
-from src.utils.security import verify_password
+from src.utils.cache import MISS
+from src.utils.principal_cache import Principal, principal_cache
+from src.utils.revocation import revocations
+from src.utils.security import verify_and_update_password
+
+
+# "db": valida estado del usuario contra la base (con caché); "stateless": sólo JWT + mapa de revocación
+AUTH_MODE = os.getenv("AUTH_MODE", "db")
 
 
 class AuthService:
@@ -18,20 +29,27 @@ class AuthService:
         user = self._find_user(identifier)
         if not user or user.status != User.UserStatus.ACTIVE:
             raise ValueError("INVALID_CREDENTIALS")
-        if not verify_password(password, user.password):
+        valid, new_hash = verify_and_update_password(password, user.password)
+        if not valid:
             raise ValueError("INVALID_CREDENTIALS")
-        token = create_access_token({"sub": user.id})
+        if new_hash:
+            # re-hash transparente cuando cambia BCRYPT_ROUNDS
+            user.password = new_hash
+            self.users.update(user)
+            self.db.commit()
+        token = create_access_token({"sub": user.id, "ver": user.token_version or 0})
+        # Las primeras lecturas con el token nuevo van al primario (el usuario puede ser recién creado)
+        recent_writes.mark(user.id)
         return token
 
-    def authenticate(self, token: str) -> User:
-        data = decode_token(token)
-        user_id = data.get("sub")
-        if not user_id:
-            raise ValueError("INVALID_TOKEN")
-        user = self.users.get_by_id(user_id)
-        if not user or user.status != User.UserStatus.ACTIVE:
-            raise ValueError("INVALID_TOKEN")
-        return user
+    def authenticate(self, token: str, *, stateless: bool | None = None) -> Principal:
+        user_id, version, principal = _resolve_without_db(token, stateless)
+        # Usuario de la petición: RoutingSession aplica read-your-writes con él
+        self.db.info["user_id"] = user_id
+        if principal is None:
+            # El principal se cachea: leerlo de una réplica atrasada guardaría un token_version o estado viejos
+            principal = _principal_for(user_id, self.users.get_by_id(user_id, primary=True))
+        return _check_version(principal, version)
 
     def _find_user(self, identifier: str) -> User | None:
         # identifier can be email or nickname
@@ -41,3 +59,60 @@ class AuthService:
         return self.users.get_by_nickname(identifier)
 
 
+class AsyncAuthService:
+    """Autenticación por token del modo ASGI (mismas reglas que AuthService.authenticate)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.users = AsyncUserDAO(db)
+
+    async def authenticate(self, token: str, *, stateless: bool | None = None) -> Principal:
+        if stateless is None:
+            stateless = AUTH_MODE == "stateless"
+        if stateless:
+            await revocations.refresh_if_due()
+        user_id, version, principal = _resolve_without_db(token, stateless, refresh_revocations=False)
+        if principal is None:
+            principal = _principal_for(user_id, await self.users.get_by_id(user_id, primary=True))
+        return _check_version(principal, version)
+
+
+def _resolve_without_db(token: str, stateless: bool | None, *, refresh_revocations: bool = True) -> tuple[str, int | None, Principal | None]:
+    """(sub, ver, principal) del token; principal es None cuando hay que leer el usuario de la base.
+
+    `refresh_revocations=False`: el mapa de revocación no se refresca aquí (modo ASGI, que lo
+    refresca fuera del event loop antes de llamar).
+    """
+    data = decode_token(token)
+    user_id = data.get("sub")
+    if not user_id:
+        raise ValueError("INVALID_TOKEN")
+    version = data.get("ver")
+    if stateless is None:
+        stateless = AUTH_MODE == "stateless"
+    if stateless:
+        # Desactivar, cambiar password o logout incrementan la versión: basta con el mapa
+        if version is None or revocations.is_revoked(user_id, version, refresh=refresh_revocations):
+            raise ValueError("INVALID_TOKEN")
+        return user_id, version, Principal(id=user_id, status=User.UserStatus.ACTIVE, token_version=version)
+    # Sólo se cachean usuarios ACTIVE; None = inexistente o inactivo (caché negativa)
+    cached = principal_cache.get(user_id)
+    if cached is None:
+        raise ValueError("INVALID_TOKEN")
+    return user_id, version, None if cached is MISS else cached
+
+
+def _principal_for(user_id: str, user: User | None) -> Principal:
+    if not user or user.status != User.UserStatus.ACTIVE:
+        principal_cache.set(user_id, None)
+        raise ValueError("INVALID_TOKEN")
+    principal = Principal.from_user(user)
+    principal_cache.set(user_id, principal)
+    return principal
+
+
+def _check_version(principal: Principal, version: int | None) -> Principal:
+    # Tokens emitidos antes de existir `ver` se aceptan mientras no expiren
+    if version is not None and version != principal.token_version:
+        raise ValueError("INVALID_TOKEN")
+    return principal
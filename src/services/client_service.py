@@ -1,16 +1,39 @@
 from __future__ import annotations
 
-from typing import Tuple
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable
 
-from sqlalchemy import func, select
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.dao.client_dao import ClientDAO
-from src.dto.client_dto import ClientCreateDTO, ClientDTO, ClientStatus
-from src.models.client import Client
+from src.dao.client_dao import AsyncClientDAO, ClientDAO
+from src.dto.bulk_dto import BulkResultDTO, BulkRowErrorDTO
+from src.dto.client_dto import ClientCreateDTO, ClientDTO, ClientStatus, ClientWithCompanyDTO, CompanySummaryDTO
+from src.models.client import Client, ClientStatus as ModelStatus
+from src.models.company import Company, CompanyStatus
 from src.dao.company_dao import CompanyDAO
-from src.dao.user_client_dao import UserClientDAO
-from src.models.user_client import UserClient
+from src.dao.user_client_dao import AsyncUserClientDAO, UserClientDAO
+from src.utils.bulk import BULK_CHUNK_SIZE, Record, chunked
+from src.utils.conditional import entity_etag, if_match_satisfied
+from src.utils.cursor import decode_cursor, encode_cursor
+from src.utils.db_errors import async_constraint_errors, constraint_errors, error_code
+from src.utils.pagination import Page, fetch_page, fetch_version
+
+
+# Enums del modelo -> enum del DTO (mismo valor), resueltos una sola vez
+_STATUS = {s: ClientStatus(s.value) for s in ModelStatus}
+_COMPANY_STATUS = {s: ClientStatus(s.value) for s in CompanyStatus}
+
+# Constraints de clients (nombres por defecto de PostgreSQL) -> código de error de la API
+CONSTRAINT_ERRORS = {
+    "clients_email_key": "EMAIL_TAKEN",
+    "clients_phone_key": "PHONE_TAKEN",
+    "clients_company_id_fkey": "COMPANY_NOT_FOUND",
+}
 
 
 class ClientService:
@@ -19,53 +42,135 @@ class ClientService:
         self.dao = ClientDAO(db)
 
     def create(self, dto: ClientCreateDTO, *, current_user_id: str | None = None) -> ClientDTO:
-        if dto.email and self.dao.get_by_email(dto.email):
-            raise ValueError("EMAIL_TAKEN")
-        if dto.phone and self.dao.get_by_phone(dto.phone):
-            raise ValueError("PHONE_TAKEN")
-        if not CompanyDAO(self.db).get_by_id(dto.company_id):
-            raise ValueError("COMPANY_NOT_FOUND")
-        client = Client(
-            company_id=dto.company_id,
-            contact_name=dto.contact_name,
-            phone=dto.phone,
-            email=dto.email,
-            status=ClientStatus(dto.status.value),
+        """Un INSERT ... RETURNING del cliente y otro de su asociación, en una sola transacción.
+
+        La unicidad de email/teléfono y la existencia de la compañía las valida la base; las
+        violaciones se traducen por nombre de constraint (sin consultas previas ni carreras).
+        """
+        with constraint_errors(self.db, CONSTRAINT_ERRORS, foreign_key="COMPANY_NOT_FOUND"):
+            row = self.dao.insert_returning(self._insert_values(dto))
+            # Asociar el usuario creador si se proporcionó
+            if current_user_id:
+                UserClientDAO(self.db).create_many(user_id=current_user_id, client_ids=[row.id])
+            self.db.commit()
+        return self._row_to_dto(row, False)
+
+    def bulk_create(self, records: Iterable[Record], *, current_user_id: str | None = None, chunk_size: int = BULK_CHUNK_SIZE) -> BulkResultDTO:
+        """Importa clientes por lotes: por lote, una consulta de email/teléfono, una de compañías,
+        un INSERT multi-fila y un INSERT de asociaciones; commit por lote.
+
+        Las filas inválidas o duplicadas (en la base o en el mismo archivo) se reportan y se omiten.
+        """
+        started = time.perf_counter()
+        received = created = 0
+        errors: list[BulkRowErrorDTO] = []
+        seen_emails: set[str] = set()
+        seen_phones: set[str] = set()
+        for chunk in chunked(records, chunk_size):
+            received += len(chunk)
+            valid: list[tuple[int, ClientCreateDTO]] = []
+            for row, data, error in chunk:
+                if error is not None:
+                    errors.append(BulkRowErrorDTO(row=row, error=error))
+                    continue
+                try:
+                    valid.append((row, ClientCreateDTO(**data)))
+                except (ValidationError, TypeError) as e:
+                    messages = [err.get("msg") for err in e.errors()] if isinstance(e, ValidationError) else [str(e)]
+                    errors.append(BulkRowErrorDTO(row=row, error=messages))
+            created += self._insert_chunk(valid, errors, seen_emails, seen_phones, current_user_id)
+        elapsed = time.perf_counter() - started
+        errors.sort(key=lambda e: e.row)
+        return BulkResultDTO(
+            received=received,
+            created=created,
+            failed=received - created,
+            errors=errors,
+            elapsed_seconds=round(elapsed, 4),
+            rows_per_second=round(received / elapsed, 2) if elapsed > 0 else 0.0,
         )
-        client = self.dao.create(client)
-        # Asociar el usuario creador si se proporcionó
-        if current_user_id:
-            uc_dao = UserClientDAO(self.db)
-            existing = uc_dao.get_by_user_and_client(user_id=current_user_id, client_id=client.id)
-            if not existing:
-                uc_dao.create(UserClient(user_id=current_user_id, client_id=client.id))
-        return self._to_dto(client)
 
-    def update(self, client_id: str, dto: ClientCreateDTO) -> ClientDTO:
-        client = self.dao.get_by_id(client_id)
+    def _insert_chunk(self, valid: list[tuple[int, ClientCreateDTO]], errors: list[BulkRowErrorDTO], seen_emails: set[str], seen_phones: set[str], current_user_id: str | None) -> int:
+        if not valid:
+            return 0
+        taken_emails, taken_phones = self.dao.find_taken(
+            {dto.email for _, dto in valid if dto.email},
+            {dto.phone for _, dto in valid if dto.phone},
+        )
+        companies = CompanyDAO(self.db).existing_ids({dto.company_id for _, dto in valid})
+        now = datetime.now(timezone.utc)
+        rows: list[tuple[int, dict]] = []
+        for row, dto in valid:
+            if dto.email and (dto.email in taken_emails or dto.email in seen_emails):
+                errors.append(BulkRowErrorDTO(row=row, error="EMAIL_TAKEN"))
+            elif dto.phone and (dto.phone in taken_phones or dto.phone in seen_phones):
+                errors.append(BulkRowErrorDTO(row=row, error="PHONE_TAKEN"))
+            elif dto.company_id not in companies:
+                errors.append(BulkRowErrorDTO(row=row, error="COMPANY_NOT_FOUND"))
+            else:
+                if dto.email:
+                    seen_emails.add(dto.email)
+                if dto.phone:
+                    seen_phones.add(dto.phone)
+                rows.append((row, {
+                    "id": str(uuid.uuid4()),
+                    "company_id": dto.company_id,
+                    "contact_name": dto.contact_name,
+                    "phone": dto.phone,
+                    "email": dto.email,
+                    "status": ModelStatus(dto.status.value),
+                    "created_at": now,
+                    "updated_at": now,
+                }))
+        if not rows:
+            return 0
+        try:
+            ids = self.dao.insert_many([values for _, values in rows])
+            if current_user_id:
+                UserClientDAO(self.db).create_many(user_id=current_user_id, client_ids=ids)
+            self.db.commit()
+            return len(ids)
+        except IntegrityError:
+            # Carrera con otra escritura concurrente: se reintenta fila a fila para aislar el conflicto
+            self.db.rollback()
+            return self._insert_rows_one_by_one(rows, errors, current_user_id)
+
+    def _insert_rows_one_by_one(self, rows: list[tuple[int, dict]], errors: list[BulkRowErrorDTO], current_user_id: str | None) -> int:
+        created = 0
+        for row, values in rows:
+            try:
+                with self.db.begin_nested():
+                    ids = self.dao.insert_many([values])
+                    if current_user_id:
+                        UserClientDAO(self.db).create_many(user_id=current_user_id, client_ids=ids)
+                created += 1
+            except IntegrityError as e:
+                code = error_code(e, CONSTRAINT_ERRORS, foreign_key="COMPANY_NOT_FOUND")
+                errors.append(BulkRowErrorDTO(row=row, error=code or "CONFLICT"))
+        self.db.commit()
+        return created
+
+    def update(self, client_id: str, dto: ClientCreateDTO, *, if_match=None) -> ClientDTO:
+        """`if_match` (ETags de If-Match): la fila se bloquea (FOR UPDATE) y se compara su ETag
+        antes de escribir; PRECONDITION_FAILED si otro la modificó."""
+        client = self.dao.get_by_id(client_id, for_update=bool(if_match))
         if not client:
             raise ValueError("NOT_FOUND")
-        if dto.email and dto.email != client.email and self.dao.get_by_email(dto.email):
-            raise ValueError("EMAIL_TAKEN")
-        if dto.phone and dto.phone != client.phone and self.dao.get_by_phone(dto.phone):
-            raise ValueError("PHONE_TAKEN")
-        if dto.company_id and dto.company_id != client.company_id and not CompanyDAO(self.db).get_by_id(dto.company_id):
-            raise ValueError("COMPANY_NOT_FOUND")
-
-        client.contact_name = dto.contact_name
-        client.company_id = dto.company_id
-        client.phone = dto.phone
-        client.email = dto.email
-        client.status = ClientStatus(dto.status.value)
-        client = self.dao.update(client)
+        self._check_if_match(client, if_match)
+        self._apply(client, dto)
+        # Unicidad y compañía las valida la base (ver create)
+        with constraint_errors(self.db, CONSTRAINT_ERRORS, foreign_key="COMPANY_NOT_FOUND"):
+            client = self.dao.update(client)
+            self.db.commit()
         return self._to_dto(client)
 
     def deactivate(self, client_id: str) -> ClientDTO:
         client = self.dao.get_by_id(client_id)
         if not client:
             raise ValueError("NOT_FOUND")
-        client.status = ClientStatus.INACTIVE
+        client.status = ModelStatus.INACTIVE
         client = self.dao.update(client)
+        self.db.commit()
         return self._to_dto(client)
 
     def delete(self, client_id: str) -> None:
@@ -73,13 +178,93 @@ class ClientService:
         if not client:
             raise ValueError("NOT_FOUND")
         self.dao.delete(client)
+        self.db.commit()
+
+    def list_paginated(self, *, page: int = 1, size: int = 10, status: ClientStatus | None = None, text: str | None = None, current_user_id: str | None = None, total: str = "exact", ranked: bool = False, include_company: bool = False) -> Page:
+        stmt = self._list_stmt(status, text, current_user_id, ranked, include_company)
+        count_key = self._count_key(status, text, current_user_id) + (ranked,)
+        result = fetch_page(self.db, stmt, size=size, offset=(page - 1) * size, total=total, count_key=count_key, version_columns=self._version_columns(include_company))
+        return result._replace(items=[self._row_to_dto(r, include_company) for r in result.items])
 
-    def list_paginated(self, *, page: int = 1, size: int = 10, status: ClientStatus | None = None, text: str | None = None, current_user_id: str | None = None) -> Tuple[int, list[ClientDTO]]:
+    def list_keyset(self, *, cursor: str | None = None, size: int = 10, status: ClientStatus | None = None, text: str | None = None, current_user_id: str | None = None, total: str = "exact", include_company: bool = False) -> Page:
+        """Página keyset: `cursor` vacío/None = primera página; `next_cursor` es None en la última."""
         stmt = self.dao.build_query(status=status, text=text, user_id=current_user_id)
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = self.db.execute(count_stmt).scalar_one()
-        items = self.db.execute(stmt.limit(size).offset((page - 1) * size)).scalars().all()
-        return total, [self._to_dto(c) for c in items]
+        if include_company:
+            stmt = self.dao.with_company(stmt)
+        after = self.dao.after_cursor(*decode_cursor(cursor)) if cursor else None
+        result = fetch_page(self.db, stmt, size=size, after=after, total=total, count_key=self._count_key(status, text, current_user_id), version_columns=self._version_columns(include_company))
+        last = result.items[-1] if result.has_more else None
+        return result._replace(
+            items=[self._row_to_dto(r, include_company) for r in result.items],
+            next_cursor=encode_cursor(last.created_at, last.id) if last else None,
+        )
+
+    @staticmethod
+    def _insert_values(dto: ClientCreateDTO) -> dict:
+        return dict(
+            company_id=dto.company_id,
+            contact_name=dto.contact_name,
+            phone=dto.phone,
+            email=dto.email,
+            status=ModelStatus(dto.status.value),
+        )
+
+    @staticmethod
+    def _apply(client: Client, dto: ClientCreateDTO) -> None:
+        client.contact_name = dto.contact_name
+        client.company_id = dto.company_id
+        client.phone = dto.phone
+        client.email = dto.email
+        client.status = ModelStatus(dto.status.value)
+
+    def list_version(self, *, status: ClientStatus | None = None, text: str | None = None, current_user_id: str | None = None, ranked: bool = False, include_company: bool = False) -> tuple:
+        """(count, max(updated_at)[, max(updated_at) de compañías]) del filtro: base del ETag del listado."""
+        stmt = self._list_stmt(status, text, current_user_id, ranked, include_company)
+        return fetch_version(self.db, stmt, *self._version_columns(include_company))
+
+    def _list_stmt(self, status: ClientStatus | None, text: str | None, user_id: str | None, ranked: bool, include_company: bool):
+        if ranked and text:
+            stmt = self.dao.build_ranked_query(text=text, status=status, user_id=user_id)
+        else:
+            stmt = self.dao.build_query(status=status, text=text, user_id=user_id)
+        return self.dao.with_company(stmt) if include_company else stmt
+
+    @staticmethod
+    def _version_columns(include_company: bool) -> tuple:
+        return (Client.updated_at, Company.updated_at) if include_company else (Client.updated_at,)
+
+    @staticmethod
+    def _check_if_match(client: Client, if_match) -> None:
+        if if_match and not if_match_satisfied(if_match, entity_etag(client.id, client.updated_at)):
+            raise ValueError("PRECONDITION_FAILED")
+
+    @staticmethod
+    def _count_key(status: ClientStatus | None, text: str | None, user_id: str | None) -> tuple:
+        return ("clients", status.value if status else None, (text or "").strip().lower() or None, user_id)
+
+    @staticmethod
+    def _row_to_dto(row, include_company: bool) -> ClientDTO:
+        # Fila de listado (LIST_COLUMNS): datos escritos por la propia API, sin re-validar
+        fields = dict(
+            id=row.id,
+            company_id=row.company_id,
+            contact_name=row.contact_name,
+            phone=row.phone,
+            email=row.email,
+            status=_STATUS[row.status],
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+        if not include_company:
+            return ClientDTO.model_construct(**fields)
+        company = CompanySummaryDTO.model_construct(
+            id=row.company_id,
+            nit=row.company_nit,
+            business_name=row.company_business_name,
+            city=row.company_city,
+            status=_COMPANY_STATUS[row.company_status],
+        )
+        return ClientWithCompanyDTO.model_construct(**fields, company=company)
 
     @staticmethod
     def _to_dto(c: Client) -> ClientDTO:
@@ -95,3 +280,63 @@ class ClientService:
         )
 
 
+class AsyncClientService:
+    """ClientService sobre AsyncSession (modo ASGI): mismas reglas, códigos de error y DTOs.
+
+    Los listados ejecutan ClientService con `run_sync`: la sesión síncrona que recibe usa la
+    conexión asíncrona (greenlet), así que el I/O no bloquea el event loop.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.dao = AsyncClientDAO(db)
+
+    async def get(self, client_id: str) -> ClientDTO:
+        client = await self.dao.get_by_id(client_id)
+        if not client:
+            raise ValueError("NOT_FOUND")
+        return ClientService._to_dto(client)
+
+    async def create(self, dto: ClientCreateDTO, *, current_user_id: str | None = None) -> ClientDTO:
+        async with async_constraint_errors(self.db, CONSTRAINT_ERRORS, foreign_key="COMPANY_NOT_FOUND"):
+            row = await self.dao.insert_returning(ClientService._insert_values(dto))
+            if current_user_id:
+                await AsyncUserClientDAO(self.db).create_many(user_id=current_user_id, client_ids=[row.id])
+            await self.db.commit()
+        return ClientService._row_to_dto(row, False)
+
+    async def update(self, client_id: str, dto: ClientCreateDTO, *, if_match=None) -> ClientDTO:
+        client = await self.dao.get_by_id(client_id, for_update=bool(if_match))
+        if not client:
+            raise ValueError("NOT_FOUND")
+        ClientService._check_if_match(client, if_match)
+        ClientService._apply(client, dto)
+        async with async_constraint_errors(self.db, CONSTRAINT_ERRORS, foreign_key="COMPANY_NOT_FOUND"):
+            client = await self.dao.update(client)
+            await self.db.commit()
+        return ClientService._to_dto(client)
+
+    async def deactivate(self, client_id: str) -> ClientDTO:
+        client = await self.dao.get_by_id(client_id)
+        if not client:
+            raise ValueError("NOT_FOUND")
+        client.status = ModelStatus.INACTIVE
+        client = await self.dao.update(client)
+        await self.db.commit()
+        return ClientService._to_dto(client)
+
+    async def delete(self, client_id: str) -> None:
+        client = await self.dao.get_by_id(client_id)
+        if not client:
+            raise ValueError("NOT_FOUND")
+        await self.dao.delete(client)
+        await self.db.commit()
+
+    async def list_paginated(self, **kwargs) -> Page:
+        return await self.db.run_sync(lambda session: ClientService(session).list_paginated(**kwargs))
+
+    async def list_keyset(self, **kwargs) -> Page:
+        return await self.db.run_sync(lambda session: ClientService(session).list_keyset(**kwargs))
+
+    async def list_version(self, **kwargs) -> tuple:
+        return await self.db.run_sync(lambda session: ClientService(session).list_version(**kwargs))
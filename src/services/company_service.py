@@ -1,12 +1,49 @@
 from __future__ import annotations
 
-from typing import Tuple
-from sqlalchemy import func, select
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable
+
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.dao.company_dao import CompanyDAO
-from src.dto.company_dto import CompanyCreateDTO, CompanyDTO, ClientStatus
+from src.dao.company_dao import AsyncCompanyDAO, CompanyDAO
+from src.dto.bulk_dto import BulkResultDTO, BulkRowErrorDTO
+from src.dto.company_dto import CompanyCreateDTO, CompanyDTO, CompanyImportDTO, ClientStatus
 from src.models.company import Company, CompanyStatus
+from src.utils.bulk import BULK_CHUNK_SIZE, Record, chunked
+from src.utils.cache import MISS, build_cache
+from src.utils.conditional import entity_etag, if_match_satisfied
+from src.utils.cursor import decode_cursor, encode_cursor
+from src.utils.db_errors import async_constraint_errors, constraint_errors
+from src.utils.nit import validate_nits
+from src.utils.pagination import Page, fetch_page, fetch_version
+
+
+# Enum del modelo -> enum del DTO (mismo valor), resuelto una sola vez
+_STATUS = {s: ClientStatus(s.value) for s in CompanyStatus}
+
+# Índice único de nit: ix_companies_nit en PostgreSQL; companies_nit_key es el nombre reconstruido en SQLite
+CONSTRAINT_ERRORS = {"ix_companies_nit": "NIT_TAKEN", "companies_nit_key": "NIT_TAKEN"}
+# Columnas que la carga masiva puede actualizar en una compañía existente
+_UPDATABLE = ("business_name", "description", "address", "phone", "city", "status")
+
+# CompanyDTO por id (GET /companies/<id> y su revalidación). None = no existe (caché negativa);
+# create/update escriben el DTO nuevo tras el commit, delete y bulk_upsert lo invalidan. El
+# write-through sólo llega a los demás workers con un backend compartido (redis): con el local,
+# cada worker puede servir su copia hasta el TTL, así que por defecto es de pocos segundos.
+# FakeRedis ("fake") vive en cada proceso: cuenta como local.
+_SHARED_CACHE = os.getenv("CACHE_BACKEND", "local").lower() == "redis"
+company_cache = build_cache(
+    "companies",
+    ttl_seconds=float(os.getenv("COMPANY_CACHE_TTL_SECONDS", "60" if _SHARED_CACHE else "3")),
+    max_size=int(os.getenv("COMPANY_CACHE_MAX_SIZE", "10000")),
+    negative_ttl_seconds=float(os.getenv("COMPANY_CACHE_NEGATIVE_TTL_SECONDS", "5")),
+)
 
 
 class CompanyService:
@@ -15,32 +52,176 @@ class CompanyService:
         self.dao = CompanyDAO(db)
 
     def create(self, dto: CompanyCreateDTO) -> CompanyDTO:
-        if self.dao.get_by_nit(dto.nit):
-            raise ValueError("NIT_TAKEN")
-        company = Company(
-            nit=dto.nit,
-            business_name=dto.business_name,
-            description=dto.description,
-            address=dto.address,
-            phone=dto.phone,
-            city=dto.city,
-            status=CompanyStatus(dto.status.value),
+        company = Company()
+        self._apply(company, dto)
+        with constraint_errors(self.db, CONSTRAINT_ERRORS):
+            company = self.dao.create(company)
+            self.db.commit()
+        return self._cached(self._to_dto(company))
+
+    def bulk_upsert(self, records: Iterable[Record], *, batch_size: int = BULK_CHUNK_SIZE, dry_run: bool = False) -> BulkResultDTO:
+        """Carga compañías por lotes: NITs validados en bloque y upsert por NIT, una transacción por lote.
+
+        Con `dry_run` sólo valida (no consulta ni escribe). Un NIT repetido en la entrada se
+        reporta como DUPLICATE_NIT; si un lote falla en la base, sus filas se reportan como BATCH_FAILED.
+        Las compañías existentes sólo cambian en las columnas presentes en la entrada.
+        """
+        started = time.perf_counter()
+        received = created = updated = 0
+        errors: list[BulkRowErrorDTO] = []
+        seen: set[str] = set()
+        for batch in chunked(records, batch_size):
+            received += len(batch)
+            parsed = []
+            for row, data, error in batch:
+                if error is not None:
+                    errors.append(BulkRowErrorDTO(row=row, error=error))
+                else:
+                    parsed.append((row, data))
+            nits = validate_nits([str(data.get("nit") or "") for _, data in parsed])
+            valid: list[tuple[int, CompanyImportDTO]] = []
+            # NITs del lote: pasan a `seen` sólo si el lote se confirma (uno fallido puede reintentarse)
+            batch_nits: set[str] = set()
+            for (row, data), (nit, nit_error) in zip(parsed, nits):
+                if nit_error is not None:
+                    errors.append(BulkRowErrorDTO(row=row, error=[nit_error]))
+                    continue
+                if nit in seen or nit in batch_nits:
+                    errors.append(BulkRowErrorDTO(row=row, error="DUPLICATE_NIT"))
+                    continue
+                try:
+                    valid.append((row, CompanyImportDTO(**{**data, "nit": nit})))
+                except ValidationError as e:
+                    errors.append(BulkRowErrorDTO(row=row, error=[err.get("msg") for err in e.errors()]))
+                    continue
+                batch_nits.add(nit)
+            if dry_run or not valid:
+                seen |= batch_nits
+                continue
+            try:
+                existing = self.dao.ids_by_nit([dto.nit for _, dto in valid])
+                for columns, dtos in self._by_columns([dto for _, dto in valid]).items():
+                    self.dao.upsert_many(self._upsert_rows(dtos), columns)
+                self.db.commit()
+            except DBAPIError:
+                self.db.rollback()
+                errors.extend(BulkRowErrorDTO(row=row, error="BATCH_FAILED") for row, _ in valid)
+                continue
+            seen |= batch_nits
+            company_cache.delete(*existing.values())
+            updated += len(existing)
+            created += len(valid) - len(existing)
+        elapsed = time.perf_counter() - started
+        errors.sort(key=lambda e: e.row)
+        return BulkResultDTO(
+            received=received,
+            created=created,
+            updated=updated,
+            failed=len(errors),
+            errors=errors,
+            elapsed_seconds=round(elapsed, 4),
+            rows_per_second=round(received / elapsed, 2) if elapsed > 0 else 0.0,
+            dry_run=dry_run,
         )
-        company = self.dao.create(company)
-        return self._to_dto(company)
+
+    @staticmethod
+    def _by_columns(dtos: list[CompanyImportDTO]) -> dict[tuple[str, ...], list[CompanyImportDTO]]:
+        """Agrupa por columnas actualizables presentes en la entrada (en CSV, las del encabezado)."""
+        groups: dict[tuple[str, ...], list[CompanyImportDTO]] = {}
+        for dto in dtos:
+            columns = tuple(name for name in _UPDATABLE if name in dto.model_fields_set)
+            groups.setdefault(columns, []).append(dto)
+        return groups
+
+    @staticmethod
+    def _upsert_rows(dtos: list[CompanyImportDTO]) -> list[dict]:
+        now = datetime.now(timezone.utc)
+        return [
+            {
+                "id": str(uuid.uuid4()),
+                "nit": dto.nit,
+                "business_name": dto.business_name,
+                "description": dto.description,
+                "address": dto.address,
+                "phone": dto.phone,
+                "city": dto.city,
+                "status": CompanyStatus(dto.status.value),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for dto in dtos
+        ]
 
     def get(self, company_id: str) -> CompanyDTO:
-        c = self.dao.get_by_id(company_id)
+        dto = company_cache.get_or_load(company_id, lambda: self._load(company_id))
+        if dto is None:
+            raise ValueError("NOT_FOUND")
+        return dto
+
+    def get_updated_at(self, company_id: str) -> datetime | None:
+        """updated_at (ETag/Last-Modified): de la caché si está; si no, sólo esa columna."""
+        dto = company_cache.get(company_id)
+        if dto is MISS:
+            return self.dao.get_updated_at(company_id)
+        return dto.updated_at if dto is not None else None
+
+    def _load(self, company_id: str) -> CompanyDTO | None:
+        # Del primario: una réplica atrasada dejaría en la caché una versión vieja (o una ausencia)
+        c = self.dao.get_by_id(company_id, primary=True)
+        return self._to_dto(c) if c else None
+
+    def update(self, company_id: str, dto: CompanyCreateDTO, *, if_match=None) -> CompanyDTO:
+        """`if_match`: ver ClientService.update."""
+        c = self.dao.get_by_id(company_id, for_update=bool(if_match))
         if not c:
             raise ValueError("NOT_FOUND")
-        return self._to_dto(c)
+        self._check_if_match(c, if_match)
+        self._apply(c, dto)
+        with constraint_errors(self.db, CONSTRAINT_ERRORS):
+            c = self.dao.update(c)
+            self.db.commit()
+        return self._cached(self._to_dto(c))
 
-    def update(self, company_id: str, dto: CompanyCreateDTO) -> CompanyDTO:
+    def delete(self, company_id: str) -> None:
         c = self.dao.get_by_id(company_id)
         if not c:
             raise ValueError("NOT_FOUND")
-        if dto.nit != c.nit and self.dao.get_by_nit(dto.nit):
-            raise ValueError("NIT_TAKEN")
+        self.dao.delete(c)
+        self.db.commit()
+        company_cache.set(company_id, None)
+
+    def list_paginated(self, *, page: int = 1, size: int = 10, status: str | None = None, text: str | None = None, total: str = "exact") -> Page:
+        stmt = self.dao.build_query(status=status, text=text)
+        result = fetch_page(self.db, stmt, size=size, offset=(page - 1) * size, total=total, count_key=self._count_key(status, text), version_columns=(Company.updated_at,))
+        return result._replace(items=[self._row_to_dto(r) for r in result.items])
+
+    def list_keyset(self, *, cursor: str | None = None, size: int = 10, status: str | None = None, text: str | None = None, total: str = "exact") -> Page:
+        stmt = self.dao.build_query(status=status, text=text)
+        after = self.dao.after_cursor(*decode_cursor(cursor)) if cursor else None
+        result = fetch_page(self.db, stmt, size=size, after=after, total=total, count_key=self._count_key(status, text), version_columns=(Company.updated_at,))
+        last = result.items[-1] if result.has_more else None
+        return result._replace(
+            items=[self._row_to_dto(r) for r in result.items],
+            next_cursor=encode_cursor(last.created_at, last.id) if last else None,
+        )
+
+    def list_version(self, *, status: str | None = None, text: str | None = None) -> tuple:
+        """(count, max(updated_at)) del filtro: base del ETag del listado."""
+        return fetch_version(self.db, self.dao.build_query(status=status, text=text), Company.updated_at)
+
+    @staticmethod
+    def _cached(dto: CompanyDTO) -> CompanyDTO:
+        # Write-through tras el commit (una lectura concurrente anterior puede pisarla hasta el TTL)
+        company_cache.set(dto.id, dto)
+        return dto
+
+    @staticmethod
+    def _check_if_match(c: Company, if_match) -> None:
+        if if_match and not if_match_satisfied(if_match, entity_etag(c.id, c.updated_at)):
+            raise ValueError("PRECONDITION_FAILED")
+
+    @staticmethod
+    def _apply(c: Company, dto: CompanyCreateDTO) -> None:
         c.nit = dto.nit
         c.business_name = dto.business_name
         c.description = dto.description
@@ -48,20 +229,26 @@ class CompanyService:
         c.phone = dto.phone
         c.city = dto.city
         c.status = CompanyStatus(dto.status.value)
-        c = self.dao.update(c)
-        return self._to_dto(c)
 
-    def delete(self, company_id: str) -> None:
-        c = self.dao.get_by_id(company_id)
-        if not c:
-            raise ValueError("NOT_FOUND")
-        self.dao.delete(c)
+    @staticmethod
+    def _count_key(status: str | None, text: str | None) -> tuple:
+        return ("companies", status or None, (text or "").strip().lower() or None)
 
-    def list_paginated(self, *, page: int = 1, size: int = 10, status: str | None = None, text: str | None = None) -> Tuple[int, list[CompanyDTO]]:
-        stmt = self.dao.build_query(status=status, text=text)
-        total = self.db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one()
-        items = self.db.execute(stmt.limit(size).offset((page - 1) * size)).scalars().all()
-        return total, [self._to_dto(i) for i in items]
+    @staticmethod
+    def _row_to_dto(row) -> CompanyDTO:
+        # Fila de listado (LIST_COLUMNS): datos escritos por la propia API, sin re-validar
+        return CompanyDTO.model_construct(
+            id=row.id,
+            nit=row.nit,
+            business_name=row.business_name,
+            description=row.description,
+            address=row.address,
+            phone=row.phone,
+            city=row.city,
+            status=_STATUS[row.status],
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
 
     @staticmethod
     def _to_dto(c: Company) -> CompanyDTO:
@@ -79,3 +266,61 @@ class CompanyService:
         )
 
 
+class AsyncCompanyService:
+    """CompanyService sobre AsyncSession (modo ASGI); listados vía `run_sync` como AsyncClientService."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.dao = AsyncCompanyDAO(db)
+
+    async def get(self, company_id: str) -> CompanyDTO:
+        dto = company_cache.get(company_id)
+        if dto is MISS:
+            c = await self.dao.get_by_id(company_id)
+            dto = CompanyService._to_dto(c) if c else None
+            company_cache.set(company_id, dto)
+        if dto is None:
+            raise ValueError("NOT_FOUND")
+        return dto
+
+    async def get_updated_at(self, company_id: str) -> datetime | None:
+        dto = company_cache.get(company_id)
+        if dto is MISS:
+            return await self.dao.get_updated_at(company_id)
+        return dto.updated_at if dto is not None else None
+
+    async def create(self, dto: CompanyCreateDTO) -> CompanyDTO:
+        company = Company()
+        CompanyService._apply(company, dto)
+        async with async_constraint_errors(self.db, CONSTRAINT_ERRORS):
+            company = await self.dao.create(company)
+            await self.db.commit()
+        return CompanyService._cached(CompanyService._to_dto(company))
+
+    async def update(self, company_id: str, dto: CompanyCreateDTO, *, if_match=None) -> CompanyDTO:
+        c = await self.dao.get_by_id(company_id, for_update=bool(if_match))
+        if not c:
+            raise ValueError("NOT_FOUND")
+        CompanyService._check_if_match(c, if_match)
+        CompanyService._apply(c, dto)
+        async with async_constraint_errors(self.db, CONSTRAINT_ERRORS):
+            c = await self.dao.update(c)
+            await self.db.commit()
+        return CompanyService._cached(CompanyService._to_dto(c))
+
+    async def delete(self, company_id: str) -> None:
+        c = await self.dao.get_by_id(company_id)
+        if not c:
+            raise ValueError("NOT_FOUND")
+        await self.dao.delete(c)
+        await self.db.commit()
+        company_cache.set(company_id, None)
+
+    async def list_paginated(self, **kwargs) -> Page:
+        return await self.db.run_sync(lambda session: CompanyService(session).list_paginated(**kwargs))
+
+    async def list_keyset(self, **kwargs) -> Page:
+        return await self.db.run_sync(lambda session: CompanyService(session).list_keyset(**kwargs))
+
+    async def list_version(self, **kwargs) -> tuple:
+        return await self.db.run_sync(lambda session: CompanyService(session).list_version(**kwargs))
@@ -5,19 +5,30 @@ from sqlalchemy.orm import Session
 from src.dao.user_dao import UserDAO
 from src.dto.user_dto import UserCreateDTO, UserUpdateDTO, UserReadDTO
 from src.models.user import User
+from src.utils.db_errors import constraint_errors
+from src.utils.principal_cache import Principal, principal_cache
+from src.utils.revocation import revocations
 from src.utils.security import hash_password
 
 
+# Índices únicos de users (PostgreSQL) y nombres reconstruidos en SQLite
+CONSTRAINT_ERRORS = {
+    "ix_users_email": "EMAIL_TAKEN",
+    "users_email_key": "EMAIL_TAKEN",
+    "ix_users_nickname": "NICKNAME_TAKEN",
+    "users_nickname_key": "NICKNAME_TAKEN",
+}
+
+
 class UserService:
     def __init__(self, db: Session):
         self.db = db
         self.dao = UserDAO(db)
 
     def create_user(self, dto: UserCreateDTO) -> UserReadDTO:
+        # Pre-chequeo de email: evita el costo de bcrypt cuando ya existe (la base lo garantiza igual)
         if self.dao.get_by_email(dto.email):
             raise ValueError("EMAIL_TAKEN")
-        if dto.nickname and self.dao.get_by_nickname(dto.nickname):
-            raise ValueError("NICKNAME_TAKEN")
         user = User(
             name=dto.name,
             email=dto.email,
@@ -25,26 +36,28 @@ class UserService:
             password=hash_password(dto.password),
             company=dto.company,
         )
-        user = self.dao.create(user)
+        with constraint_errors(self.db, CONSTRAINT_ERRORS):
+            user = self.dao.create(user)
+            self.db.commit()
         return self._to_read_dto(user)
 
     def update_user(self, user_id: str, dto: UserUpdateDTO) -> UserReadDTO:
         user = self.dao.get_by_id(user_id)
         if not user:
             raise ValueError("User not found")
-        if dto.nickname:
-            other = self.dao.get_by_nickname(dto.nickname)
-            if other and other.id != user.id:
-                raise ValueError("NICKNAME_TAKEN")
         if dto.name is not None:
             user.name = dto.name
         if dto.nickname is not None:
             user.nickname = dto.nickname
         if dto.password is not None:
             user.password = hash_password(dto.password)
+            self._bump_token_version(user)
         if dto.company is not None:
             user.company = dto.company
-        user = self.dao.update(user)
+        with constraint_errors(self.db, CONSTRAINT_ERRORS):
+            user = self.dao.update(user)
+            self.db.commit()
+        self._publish_changes(user)
         return self._to_read_dto(user)
 
     def set_active(self, user_id: str, active: bool) -> UserReadDTO:
@@ -52,9 +65,34 @@ class UserService:
         if not user:
             raise ValueError("User not found")
         user.status = User.UserStatus.ACTIVE if active else User.UserStatus.INACTIVE
+        if not active:
+            self._bump_token_version(user)
         user = self.dao.update(user)
+        self.db.commit()
+        self._publish_changes(user)
         return self._to_read_dto(user)
 
+    def revoke_tokens(self, user_id: str) -> None:
+        """Invalida todos los tokens emitidos hasta ahora para el usuario (logout)."""
+        user = self.dao.get_by_id(user_id)
+        if not user:
+            raise ValueError("User not found")
+        self._bump_token_version(user)
+        user = self.dao.update(user)
+        self.db.commit()
+        self._publish_changes(user)
+
+    @staticmethod
+    def _bump_token_version(user: User) -> None:
+        user.token_version = (user.token_version or 0) + 1
+
+    @staticmethod
+    def _publish_changes(user: User) -> None:
+        # Write-through tras el commit: la siguiente petición autenticada no vuelve a la base
+        active = user.status == User.UserStatus.ACTIVE
+        principal_cache.set(user.id, Principal.from_user(user) if active else None)
+        revocations.publish(user.id, user.token_version)
+
     @staticmethod
     def _to_read_dto(user: User) -> UserReadDTO:
         return UserReadDTO(
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from functools import wraps
+from quart import request, jsonify, g
+
+from src.database_async import get_async_session
+from src.services.auth_service import AsyncAuthService
+
+
+def require_auth(fn):
+    """require_auth de src.utils.auth para las vistas async del modo ASGI."""
+
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        auth_header = request.headers.get("Authorization", "")
+        if not auth_header.startswith("Bearer "):
+            return jsonify({"error": "MISSING_TOKEN"}), 401
+        token = auth_header.split(" ", 1)[1]
+        try:
+            g.current_user = await AsyncAuthService(get_async_session()).authenticate(token)
+        except Exception:
+            return jsonify({"error": "INVALID_TOKEN"}), 401
+        return await fn(*args, **kwargs)
+
+    return wrapper
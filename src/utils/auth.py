@@ -3,7 +3,7 @@ from __future__ import annotations
 from functools import wraps
 from flask import request, jsonify, g
 
-from src.database import SessionLocal
+from src.database import get_session
 from src.services.auth_service import AuthService
 
 
@@ -14,15 +14,11 @@ def require_auth(fn):
         if not auth_header.startswith("Bearer "):
             return jsonify({"error": "MISSING_TOKEN"}), 401
         token = auth_header.split(" ", 1)[1]
-        db = SessionLocal()
         try:
-            user = AuthService(db).authenticate(token)
-            g.current_user = user
-            return fn(*args, **kwargs)
+            g.current_user = AuthService(get_session()).authenticate(token)
         except Exception:
             return jsonify({"error": "INVALID_TOKEN"}), 401
-        finally:
-            db.close()
+        return fn(*args, **kwargs)
 
     return wrapper
 
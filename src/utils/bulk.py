@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import csv
+import io
+import os
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Tuple
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover - orjson es opcional
+    from json import loads as _loads
+
+
+NDJSON_MIMETYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+CSV_MIMETYPES = {"text/csv"}
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+BULK_MAX_CHUNK_SIZE = 10000
+
+# (número de fila 1-based, registro o None, error de parseo o None)
+Record = Tuple[int, Dict[str, Any] | None, str | None]
+
+
+def iter_records(stream: IO[bytes], mimetype: str) -> Iterator[Record]:
+    """Lee NDJSON o CSV de forma incremental; las filas vacías no cuentan."""
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    if mimetype in NDJSON_MIMETYPES:
+        return _iter_ndjson(text)
+    if mimetype in CSV_MIMETYPES:
+        return _iter_csv(text)
+    raise ValueError("UNSUPPORTED_MEDIA_TYPE")
+
+
+def _iter_ndjson(text: IO[str]) -> Iterator[Record]:
+    row = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            value = _loads(line)
+        except ValueError:
+            yield row, None, "INVALID_JSON"
+            continue
+        if not isinstance(value, dict):
+            yield row, None, "INVALID_JSON"
+            continue
+        yield row, value, None
+
+
+def _iter_csv(text: IO[str]) -> Iterator[Record]:
+    row = 0
+    for values in csv.DictReader(text):
+        if not any(values.values()):
+            continue
+        row += 1
+        if None in values:
+            yield row, None, "INVALID_CSV"
+            continue
+        # celdas vacías = campo no informado
+        yield row, {k.strip(): (v.strip() or None) for k, v in values.items() if v is not None}, None
+
+
+def chunked(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    it = iter(records)
+    while chunk := list(islice(it, size)):
+        yield chunk
@@ -0,0 +1,313 @@
+"""Caché de búsquedas pequeñas y calientes (compañías por id, usuario del token).
+
+Backends (CACHE_BACKEND):
+- local (por defecto): LRU con TTL por proceso (worker); cada worker invalida sólo su copia.
+- redis: cualquier servidor con protocolo Redis en CACHE_REDIS_URL (requiere `pip install redis`);
+  compartido entre workers, así la invalidación de un worker la ven todos.
+- fake: cliente Redis en memoria (FakeRedis), para tests sin servidor.
+
+Convención de valores: `get` devuelve MISS si no hay entrada, None si está cacheada la
+ausencia (caché negativa, con TTL propio) y el valor en otro caso.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import os
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from src.utils.metrics import cache_latency_seconds, cache_requests
+
+
+log = logging.getLogger(__name__)
+
+
+class _Miss:
+    def __repr__(self) -> str:
+        return "MISS"
+
+
+MISS: Any = _Miss()
+
+# Cachés construidas con build_cache, por nombre (para /internal/pool y tests)
+caches: Dict[str, "Cache"] = {}
+
+
+class Cache(ABC):
+    """Interfaz común: get/set/delete/clear más contadores y métricas por nombre de caché.
+
+    Los backends implementan `_get`/`_set`/`_delete`/`_clear`; sus errores los maneja esta clase.
+
+    - ttl_seconds: vida de una entrada; 0 deshabilita la caché.
+    - negative_ttl_seconds: vida de una ausencia cacheada (`set(key, None)`); 0 no las guarda.
+    """
+
+    backend = "none"
+
+    def __init__(self, name: str, *, ttl_seconds: float, negative_ttl_seconds: float = 0.0):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._requests = {result: cache_requests.labels(name, result) for result in ("hit", "negative_hit", "miss", "error")}
+        self._latency = {op: cache_latency_seconds.labels(name, op) for op in ("get", "set", "delete")}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: str) -> Any:
+        if not self.enabled:
+            return MISS
+        started = time.perf_counter()
+        try:
+            value = self._get(key)
+        except Exception as e:  # backend caído: se lee de la base
+            self._error("get", e)
+            return MISS
+        finally:
+            self._latency["get"].observe(time.perf_counter() - started)
+        if value is MISS:
+            self.misses += 1
+            self._requests["miss"].inc()
+        elif value is None:
+            self.negative_hits += 1
+            self._requests["negative_hit"].inc()
+        else:
+            self.hits += 1
+            self._requests["hit"].inc()
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Guarda `value` (None = ausencia, con negative_ttl_seconds)."""
+        ttl = self.ttl_seconds if value is not None else min(self.negative_ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            if value is None:
+                self.delete(key)
+            return
+        started = time.perf_counter()
+        try:
+            self._set(key, value, ttl)
+        except Exception as e:
+            self._error("set", e)
+        finally:
+            self._latency["set"].observe(time.perf_counter() - started)
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        started = time.perf_counter()
+        try:
+            self._delete(keys)
+        except Exception as e:
+            # La entrada vieja vive, como mucho, hasta su TTL
+            self._error("delete", e)
+        finally:
+            self._latency["delete"].observe(time.perf_counter() - started)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is MISS:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        self._clear()
+        self.hits = self.negative_hits = self.misses = self.errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round((self.hits + self.negative_hits) / lookups, 4) if lookups else None,
+            "ttl_seconds": self.ttl_seconds,
+            "negative_ttl_seconds": self.negative_ttl_seconds,
+        }
+
+    def _error(self, op: str, error: Exception) -> None:
+        self.errors += 1
+        self._requests["error"].inc()
+        log.warning("cache %s: %s falló: %s", self.name, op, error)
+
+    @abstractmethod
+    def _get(self, key: str) -> Any:
+        """Valor guardado, None (ausencia cacheada) o MISS."""
+
+    @abstractmethod
+    def _set(self, key: str, value: Any, ttl: float) -> None:
+        """Guarda `value` durante `ttl` segundos."""
+
+    @abstractmethod
+    def _delete(self, keys: Iterable[str]) -> None:
+        """Borra las claves (las inexistentes se ignoran)."""
+
+    @abstractmethod
+    def _clear(self) -> None:
+        """Borra todas las entradas de esta caché."""
+
+
+class LocalCache(Cache):
+    """LRU acotado con TTL, por proceso; guarda los objetos tal cual (sin serializar)."""
+
+    backend = "local"
+
+    def __init__(self, name: str, *, ttl_seconds: float, max_size: int, negative_ttl_seconds: float = 0.0):
+        super().__init__(name, ttl_seconds=ttl_seconds, negative_ttl_seconds=negative_ttl_seconds)
+        self.max_size = max_size
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._entries)
+        return {**super().stats(), "evictions": self.evictions, "size": size, "max_size": self.max_size}
+
+    def _get(self, key: str) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            if entry[0] <= now:
+                del self._entries[key]
+                return MISS
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.evictions = 0
+
+
+class RedisCache(Cache):
+    """Backend con protocolo Redis (redis-py o FakeRedis); valores serializados con pickle.
+
+    Los errores del servidor no fallan la petición: `get` se comporta como MISS y se cuentan en `errors`.
+    """
+
+    backend = "redis"
+
+    def __init__(self, name: str, client: Any, *, ttl_seconds: float, negative_ttl_seconds: float = 0.0, prefix: str = "myagenda"):
+        super().__init__(name, ttl_seconds=ttl_seconds, negative_ttl_seconds=negative_ttl_seconds)
+        self.client = client
+        self.prefix = f"{prefix}:{name}:"
+
+    def _get(self, key: str) -> Any:
+        data = self.client.get(self.prefix + key)
+        return MISS if data is None else pickle.loads(data)
+
+    def _set(self, key: str, value: Any, ttl: float) -> None:
+        self.client.set(self.prefix + key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), px=max(1, int(ttl * 1000)))
+
+    def _delete(self, keys: Iterable[str]) -> None:
+        self.client.delete(*(self.prefix + key for key in keys))
+
+    def _clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class FakeRedis:
+    """Subconjunto en memoria del cliente redis-py usado por RedisCache (get/set px/delete/scan_iter)."""
+
+    def __init__(self):
+        self._data: Dict[str, tuple[Optional[float], bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] <= time.monotonic():
+                del self._data[name]
+                return None
+            return entry[1]
+
+    def set(self, name: str, value: bytes, px: Optional[int] = None) -> bool:
+        with self._lock:
+            self._data[name] = (time.monotonic() + px / 1000 if px else None, value)
+        return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match: str = "*"):
+        with self._lock:
+            return iter([name for name in self._data if fnmatch.fnmatchcase(name, match)])
+
+
+_fake_client: Optional[FakeRedis] = None
+_redis_client: Any = None
+
+
+def _client(backend: str) -> Any:
+    global _fake_client, _redis_client
+    if backend == "fake":
+        if _fake_client is None:
+            _fake_client = FakeRedis()
+        return _fake_client
+    if _redis_client is None:
+        import redis  # dependencia opcional: sólo con CACHE_BACKEND=redis
+
+        timeout = float(os.getenv("CACHE_REDIS_TIMEOUT_SECONDS", "0.05"))
+        _redis_client = redis.Redis.from_url(
+            os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"),
+            socket_timeout=timeout,
+            socket_connect_timeout=timeout,
+        )
+    return _redis_client
+
+
+def build_cache(name: str, *, ttl_seconds: float, max_size: int, negative_ttl_seconds: float = 0.0, backend: str | None = None) -> Cache:
+    """Caché `name` con el backend de CACHE_BACKEND (local | redis | fake), registrada en `caches`."""
+    backend = (backend or os.getenv("CACHE_BACKEND", "local")).lower()
+    if backend == "local":
+        cache: Cache = LocalCache(name, ttl_seconds=ttl_seconds, max_size=max_size, negative_ttl_seconds=negative_ttl_seconds)
+    elif backend in ("redis", "fake"):
+        cache = RedisCache(
+            name,
+            _client(backend),
+            ttl_seconds=ttl_seconds,
+            negative_ttl_seconds=negative_ttl_seconds,
+            prefix=os.getenv("CACHE_KEY_PREFIX", "myagenda"),
+        )
+    else:
+        raise ValueError(f"CACHE_BACKEND inválido: {backend}")
+    caches[name] = cache
+    return cache
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite devuelve datetimes naive (guardados en UTC); PostgreSQL con la zona de la sesión
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.blake2b("|".join(str(p) for p in parts).encode(), digest_size=12).hexdigest()
+
+
+def entity_etag(entity_id: str, updated_at: datetime) -> str:
+    """ETag fuerte (sin comillas) de un registro: cambia con cada escritura (updated_at en µs)."""
+    return _digest(entity_id, _as_utc(updated_at).isoformat())
+
+
+def list_etag(version: tuple, *scope: Any) -> str:
+    """ETag débil (sin comillas) de un listado: (count, max(updated_at)...) del filtro más lo que
+    distingue la respuesta (usuario, query string con página, tamaño, cursor, include)."""
+    values = [_as_utc(v).isoformat() if isinstance(v, datetime) else v for v in version]
+    return _digest(*values, *(s.decode() if isinstance(s, bytes) else s for s in scope))
+
+
+def last_modified(updated_at: datetime) -> datetime:
+    return _as_utc(updated_at).replace(microsecond=0)
+
+
+def is_not_modified(request: Any, etag: str, modified: Optional[datetime] = None) -> bool:
+    """If-None-Match (comparación débil) o, si no viene, If-Modified-Since (precisión de segundos).
+
+    `request` es el de Flask o el de Quart (misma API de cabeceras de werkzeug).
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    if since is not None and modified is not None:
+        return last_modified(modified) <= since
+    return False
+
+
+def has_validators(request: Any) -> bool:
+    return bool(request.if_none_match) or request.if_modified_since is not None
+
+
+def if_match_satisfied(if_match: Any, etag: str) -> bool:
+    """If-Match con comparación fuerte; "*" acepta cualquier versión existente."""
+    return if_match.star_tag or if_match.contains(etag)
+
+
+def not_modified(response_class: Any, etag: str, modified: Optional[datetime] = None, *, weak: bool = False) -> Any:
+    """304 sin cuerpo, con los mismos validadores que tendría el 200."""
+    return set_validators(response_class(status=304), etag, modified, weak=weak)
+
+
+def set_validators(response: Any, etag: str, modified: Optional[datetime] = None, *, weak: bool = False) -> Any:
+    response.set_etag(etag, weak=weak)
+    if modified is not None:
+        response.last_modified = last_modified(modified)
+    return response
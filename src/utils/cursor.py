@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Cursor opaco (base64url) para paginación keyset sobre (created_at, id)."""
+    raw = json.dumps({"c": created_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Retorna (created_at, id). Lanza ValueError("INVALID_CURSOR") si no es válido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["c"]), str(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("INVALID_CURSOR")
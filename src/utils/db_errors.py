@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import re
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Mapping, NamedTuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+class ConstraintViolation(NamedTuple):
+    kind: str  # "unique" | "foreign_key" | "other"
+    name: str | None
+
+
+_SQLITE_UNIQUE = re.compile(r"UNIQUE constraint failed: (\w+)\.(\w+)")
+
+
+def violated_constraint(exc: IntegrityError) -> ConstraintViolation:
+    """Constraint violada según el driver.
+
+    PostgreSQL (psycopg) informa el nombre en `diag`. SQLite sólo da el mensaje: para UNIQUE se
+    reconstruye el nombre con la convención de PostgreSQL (`<tabla>_<columna>_key`); para FOREIGN
+    KEY el nombre no está disponible.
+    """
+    orig = exc.orig
+    diag = getattr(orig, "diag", None)
+    name = getattr(diag, "constraint_name", None) if diag is not None else None
+    if name:
+        sqlstate = getattr(orig, "sqlstate", None)
+        kind = {"23505": "unique", "23503": "foreign_key"}.get(sqlstate or "", "other")
+        return ConstraintViolation(kind, name)
+    message = str(orig)
+    match = _SQLITE_UNIQUE.search(message)
+    if match:
+        return ConstraintViolation("unique", f"{match[1]}_{match[2]}_key")
+    if "FOREIGN KEY constraint failed" in message:
+        return ConstraintViolation("foreign_key", None)
+    return ConstraintViolation("other", None)
+
+
+def error_code(exc: IntegrityError, codes: Mapping[str, str], *, foreign_key: str | None = None) -> str | None:
+    """Código de error de la API para la violación, o None si no está mapeada.
+
+    - codes: nombre de constraint -> código (p.ej. "clients_email_key" -> "EMAIL_TAKEN").
+    - foreign_key: código para una FK sin nombre (SQLite), cuando la operación sólo puede violar una.
+    """
+    violation = violated_constraint(exc)
+    if violation.name is not None:
+        return codes.get(violation.name)
+    if violation.kind == "foreign_key":
+        return foreign_key
+    return None
+
+
+@contextmanager
+def constraint_errors(db: Session, codes: Mapping[str, str], *, foreign_key: str | None = None) -> Iterator[None]:
+    """Ante un IntegrityError hace rollback y lo traduce a ValueError(código) si está mapeado."""
+    try:
+        yield
+    except IntegrityError as e:
+        db.rollback()
+        code = error_code(e, codes, foreign_key=foreign_key)
+        if code is None:
+            raise
+        raise ValueError(code) from e
+
+
+@asynccontextmanager
+async def async_constraint_errors(db: AsyncSession, codes: Mapping[str, str], *, foreign_key: str | None = None) -> AsyncIterator[None]:
+    """constraint_errors para AsyncSession."""
+    try:
+        yield
+    except IntegrityError as e:
+        await db.rollback()
+        code = error_code(e, codes, foreign_key=foreign_key)
+        if code is None:
+            raise
+        raise ValueError(code) from e
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import csv
+import io
+import os
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Iterator, Sequence
+
+from flask import Response, current_app, stream_with_context
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+from src.database import begin_read_only_snapshot
+
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Filas por lectura del cursor de servidor (y por chunk de la respuesta)
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+
+def export_response(db: Session, stmt: Select, *, fmt: str, filename: str) -> Response:
+    """Respuesta en streaming de `stmt` (select de columnas) en NDJSON o CSV.
+
+    Las filas se leen con yield_per (cursor de servidor en PostgreSQL) dentro de un snapshot de
+    sólo lectura sobre la sesión de la petición; la memoria no depende del número de filas.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError("INVALID_FORMAT")
+    begin_read_only_snapshot(db)
+    fields = [c.key for c in stmt.selected_columns]
+    encode = _ndjson_chunk if fmt == "ndjson" else _csv_chunk
+
+    def generate() -> Iterator[bytes]:
+        if fmt == "csv":
+            yield _csv_chunk([fields])
+        result = db.execute(stmt, execution_options={"yield_per": EXPORT_BATCH_SIZE})
+        for partition in result.partitions():
+            yield encode(partition, fields)
+
+    response = Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
+
+
+def _ndjson_chunk(rows: Sequence[Any], fields: list[str]) -> bytes:
+    dumps = current_app.json.dumps
+    return "".join(f"{dumps(dict(zip(fields, row)))}\n" for row in rows).encode()
+
+
+def _csv_chunk(rows: Sequence[Any], fields: list[str] | None = None) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_csv_value(v) for v in row])
+    return buffer.getvalue().encode()
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # mismo criterio que el JSON de la app: naive (SQLite) = UTC
+        return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
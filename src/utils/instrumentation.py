@@ -0,0 +1,200 @@
+"""Métricas Prometheus por petición y por sentencia SQL (METRICS_ENABLED, deshabilitadas por defecto).
+
+- Peticiones: latencia, en curso y códigos de estado por blueprint/endpoint (la regla, no la
+  URL, para acotar la cardinalidad; las URLs sin ruta van a "<unmatched>").
+- Sentencias: listeners before/after_cursor_execute en los engines. Cada sentencia suma al
+  total de la petición en curso (cantidad y tiempo en la base) y a un histograma etiquetado
+  con el método de DAO que la emitió (`instrument_dao` / `query_label`; "-" fuera de un DAO).
+
+Con gunicorn y PROMETHEUS_MULTIPROC_DIR los valores de cada worker se agregan en /metrics
+(ver gunicorn.conf.py).
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.utils.metrics import (
+    db_query_duration_seconds,
+    http_request_db_queries,
+    http_request_db_seconds,
+    http_request_duration_seconds,
+    http_requests,
+    http_requests_in_flight,
+)
+
+
+enabled = os.getenv("METRICS_ENABLED", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+UNMATCHED = "<unmatched>"
+
+# [sentencias, segundos en la base] de la petición en curso; None fuera de una petición medida
+_request_db: ContextVar[Optional[list]] = ContextVar("request_db", default=None)
+# Estado de start_request de la petición en curso (sin `g`: cada acceso al proxy cuesta)
+_request_state: ContextVar[Optional[tuple]] = ContextVar("request_state", default=None)
+# Método de DAO en curso ("ClientDAO.get_by_id")
+_query_label: ContextVar[str] = ContextVar("query_label", default="-")
+
+# Hijos de las métricas por combinación de labels: evita .labels() (lock + dict) en cada petición
+_endpoint_children: Dict[Tuple[str, str, str], tuple] = {}
+_status_children: Dict[Tuple[str, str, str, int], Any] = {}
+_dao_children: Dict[str, Any] = {}
+
+
+def _children(key: Tuple[str, str, str]) -> tuple:
+    children = _endpoint_children.get(key)
+    if children is None:
+        blueprint, endpoint, method = key
+        children = _endpoint_children[key] = (
+            http_request_duration_seconds.labels(blueprint, endpoint, method),
+            http_requests_in_flight.labels(blueprint, endpoint),
+            http_request_db_queries.labels(blueprint, endpoint),
+            http_request_db_seconds.labels(blueprint, endpoint),
+        )
+    return children
+
+
+def start_request(blueprint: str | None, endpoint: str | None, method: str) -> None:
+    """Abre la medición de la petición en curso (la cierra `finish_request`)."""
+    key = (blueprint or "", endpoint or UNMATCHED, method)
+    children = _children(key)
+    children[1].inc()
+    stats = [0, 0.0]
+    _request_db.set(stats)
+    _request_state.set((time.perf_counter(), key, children, stats))
+
+
+def finish_request(status: int) -> None:
+    """Registra la petición en curso con `status`; no hace nada si no se está midiendo."""
+    state = _request_state.get()
+    if state is None:
+        return
+    _request_state.set(None)
+    started, key, children, stats = state
+    duration, in_flight, queries, db_seconds = children
+    duration.observe(time.perf_counter() - started)
+    in_flight.dec()
+    queries.observe(stats[0])
+    db_seconds.observe(stats[1])
+    status_key = (*key, status)
+    counter = _status_children.get(status_key)
+    if counter is None:
+        counter = _status_children[status_key] = http_requests.labels(*key, str(status))
+    counter.inc()
+    _request_db.set(None)
+
+
+def request_db_stats() -> Optional[list]:
+    """[sentencias, segundos] acumulados por la petición en curso (None si no se mide)."""
+    return _request_db.get()
+
+
+def query_label(label: str) -> Callable:
+    """Decorador: las sentencias emitidas dentro de la función se etiquetan con `label`."""
+
+    def decorate(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                token = _query_label.set(label)
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    _query_label.reset(token)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = _query_label.set(label)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _query_label.reset(token)
+
+        return wrapper
+
+    return decorate
+
+
+def instrument_dao(cls: type) -> type:
+    """Decorador de clase: etiqueta las sentencias de cada método público con "Clase.metodo"."""
+    for name, attr in list(vars(cls).items()):
+        # staticmethod/classmethod no son funciones en vars(): no emiten sentencias
+        if not name.startswith("_") and inspect.isfunction(attr):
+            setattr(cls, name, query_label(f"{cls.__name__}.{name}")(attr))
+    return cls
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    if enabled:
+        conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    started = conn.info.pop("query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    label = _query_label.get()
+    child = _dao_children.get(label)
+    if child is None:
+        child = _dao_children[label] = db_query_duration_seconds.labels(label)
+    child.observe(elapsed)
+    stats = _request_db.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += elapsed
+
+
+def instrument_engine(target: Engine) -> None:
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+def init_app(app: Any) -> None:
+    """Hooks de medición para la app Flask (registrar antes que el resto de hooks)."""
+    from flask import request
+
+    @app.before_request
+    def _start_metrics() -> None:
+        if enabled:
+            start_request(request.blueprint, request.endpoint, request.method)
+
+    @app.after_request
+    def _finish_metrics(response: Any) -> Any:
+        finish_request(response.status_code)
+        return response
+
+    @app.teardown_request
+    def _abort_metrics(exc: BaseException | None) -> None:
+        # Sin after_request (error no manejado al generar la respuesta): cuenta como 500
+        finish_request(500)
+
+
+def init_async_app(app: Any) -> None:
+    """Mismos hooks para la app Quart del modo ASGI."""
+    from quart import request
+
+    @app.before_request
+    async def _start_metrics() -> None:
+        if enabled:
+            start_request(request.blueprint, request.endpoint, request.method)
+
+    @app.after_request
+    async def _finish_metrics(response: Any) -> Any:
+        finish_request(response.status_code)
+        return response
+
+    @app.teardown_request
+    async def _abort_metrics(exc: BaseException | None) -> None:
+        finish_request(500)
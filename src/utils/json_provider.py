@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import decimal
+from typing import Any
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+
+# datetimes naive (SQLite) se emiten como UTC: igual que los timestamptz de PostgreSQL
+_OPTIONS = (orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _default(o: Any) -> Any:
+    # Tipos que orjson no serializa de forma nativa (mismo criterio que el provider de Flask)
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON de la app con orjson: datetime (RFC 3339), date, UUID, Enum y dataclasses nativos."""
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=_OPTIONS).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        # bytes directo al Response, sin pasar por str
+        return self._app.response_class(orjson.dumps(obj, default=_default, option=_OPTIONS), mimetype=self.mimetype)
+
+
+def init_app(app: Flask) -> None:
+    """Registra OrjsonProvider si orjson está instalado; si no, se mantiene el de Flask."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    else:  # pragma: no cover
+        app.json = DefaultJSONProvider(app)
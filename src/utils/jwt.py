@@ -7,6 +7,9 @@ from typing import Any, Dict
 import jwt
 
 
+ACCESS_TOKEN_EXPIRES_MINUTES = 30
+
+
 def _get_secret() -> str:
     secret = os.getenv("JWT_SECRET") or os.getenv("SECRET_KEY")
     if not secret:
@@ -15,7 +18,7 @@ def _get_secret() -> str:
     return secret
 
 
-def create_access_token(payload: Dict[str, Any], expires_minutes: int = 30) -> str:
+def create_access_token(payload: Dict[str, Any], expires_minutes: int = ACCESS_TOKEN_EXPIRES_MINUTES) -> str:
     to_encode = payload.copy()
     now = datetime.now(timezone.utc)
     to_encode.update({"iat": int(now.timestamp()), "exp": int((now + timedelta(minutes=expires_minutes)).timestamp())})
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Iterable
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.metrics import MetricWrapperBase
+
+
+# Pool de conexiones (un valor por worker; en modo multiproceso los gauges se suman entre workers vivos)
+db_pool_checkout_seconds = Histogram(
+    "db_pool_checkout_seconds",
+    "Tiempo de espera para obtener una conexión del pool",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+db_pool_checkout_timeouts = Counter("db_pool_checkout_timeouts", "Checkouts que agotaron pool_timeout")
+db_pool_connections_created = Counter("db_pool_connections_created", "Conexiones DBAPI nuevas abiertas por el pool")
+db_pool_invalidations = Counter("db_pool_invalidations", "Conexiones invalidadas (errores, pre_ping fallido)")
+db_pool_in_use = Gauge("db_pool_in_use", "Conexiones prestadas en este momento", multiprocess_mode="livesum")
+db_pool_overflow = Gauge("db_pool_overflow", "Conexiones abiertas por encima de pool_size", multiprocess_mode="livesum")
+
+POOL_METRICS = (
+    db_pool_checkout_seconds,
+    db_pool_checkout_timeouts,
+    db_pool_connections_created,
+    db_pool_invalidations,
+    db_pool_in_use,
+    db_pool_overflow,
+)
+
+
+# Cachés de búsquedas (src/utils/cache.py), por nombre de caché
+cache_requests = Counter("cache_requests", "Lecturas de caché por resultado (hit, negative_hit, miss, error)", ["cache", "result"])
+cache_latency_seconds = Histogram(
+    "cache_latency_seconds",
+    "Latencia de operaciones de caché",
+    ["cache", "op"],
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05),
+)
+
+CACHE_METRICS = (cache_requests, cache_latency_seconds)
+
+
+# Peticiones HTTP y consultas SQL (src/utils/instrumentation.py, con METRICS_ENABLED)
+_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de las peticiones por blueprint/endpoint",
+    ["blueprint", "endpoint", "method"],
+    buckets=_LATENCY_BUCKETS,
+)
+http_requests = Counter("http_requests", "Peticiones atendidas por código de estado", ["blueprint", "endpoint", "method", "status"])
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "Peticiones en curso",
+    ["blueprint", "endpoint"],
+    multiprocess_mode="livesum",
+)
+http_request_db_queries = Histogram(
+    "http_request_db_queries",
+    "Sentencias SQL por petición",
+    ["blueprint", "endpoint"],
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 50, 100),
+)
+http_request_db_seconds = Histogram(
+    "http_request_db_seconds",
+    "Tiempo en la base (ejecución de sentencias) por petición",
+    ["blueprint", "endpoint"],
+    buckets=_LATENCY_BUCKETS,
+)
+db_query_duration_seconds = Histogram(
+    "db_query_duration_seconds",
+    "Duración de cada sentencia SQL por método de DAO que la emite",
+    ["dao"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+REQUEST_METRICS = (
+    http_request_duration_seconds,
+    http_requests,
+    http_requests_in_flight,
+    http_request_db_queries,
+    http_request_db_seconds,
+    db_query_duration_seconds,
+)
+
+
+def snapshot(metrics: Iterable[MetricWrapperBase]) -> Dict[str, Any]:
+    """Valores actuales del proceso como dict plano {sample{labels}: valor}."""
+    result: Dict[str, Any] = {"pid": os.getpid()}
+    for metric in metrics:
+        for family in metric.collect():
+            for sample in family.samples:
+                if sample.name.endswith("_created"):
+                    continue
+                labels = ",".join(f"{k}={v}" for k, v in sorted(sample.labels.items()))
+                key = f"{sample.name}{{{labels}}}" if labels else sample.name
+                result[key] = sample.value
+    return result
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
 import re
+from typing import Any, Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy es opcional (validate_nits cae al cálculo escalar)
+    np = None
 
 
 # DIAN weighting factors for NIT DV calculation (right-to-left)
@@ -19,6 +25,11 @@ def _compute_dv(base_digits: str) -> int:
     return 11 - remainder
 
 
+# Pesos de una base de 9 dígitos leída de izquierda a derecha
+_BASE_WEIGHTS = _WEIGHTS[:9][::-1]
+_ALLOWED = re.compile(r"[0-9.\-\s]+")
+
+
 def compute_check_digit(base_digits: str) -> int:
     """Calcula el dígito de verificación (DV) para un NIT base de 9 dígitos.
 
@@ -31,33 +42,58 @@ def compute_check_digit(base_digits: str) -> int:
     return _compute_dv(base_digits)
 
 
-def validate_and_normalize_nit(nit: str) -> str:
-    """Validate Colombian NIT format and DV, return canonical 9-digit base.
+def compute_check_digits(bases: Any) -> "np.ndarray":
+    """Calcula los DV de un lote de bases de 9 dígitos (producto matriz-pesos con NumPy).
 
-    Accepted inputs (with optional separators ".- "):
-    - 9 base digits + DV (total 10 digits), e.g. "XXXXXXXXX-D" or "XXXXXXXXXD".
-
-    Returns the 9-digit base (without DV), numeric string without separators.
-    Raises ValueError if invalid.
+    - bases: matriz (n, 9) de dígitos, arreglo 1-D de enteros (100000000..999999999 o con
+      ceros a la izquierda implícitos), o secuencia de cadenas de 9 dígitos.
+    - Retorna un arreglo int64 de n DV.
+    - Lanza ValueError si alguna base no es válida.
     """
+    if np is None:
+        raise RuntimeError("compute_check_digits requiere numpy")
+    digits = _digit_matrix(bases)
+    remainder = (digits @ np.asarray(_BASE_WEIGHTS, dtype=np.int64)) % 11
+    return np.where(remainder < 2, remainder, 11 - remainder)
+
+
+def _digit_matrix(bases: Any) -> "np.ndarray":
+    if isinstance(bases, np.ndarray) and bases.ndim == 2:
+        if bases.shape[1] != 9 or ((bases < 0) | (bases > 9)).any():
+            raise ValueError("Base del NIT debe ser una cadena de 9 dígitos")
+        return bases.astype(np.int64, copy=False)
+    if isinstance(bases, np.ndarray) and bases.dtype.kind in "iu":
+        if ((bases < 0) | (bases > 999_999_999)).any():
+            raise ValueError("Base del NIT debe ser una cadena de 9 dígitos")
+        return (bases.astype(np.int64)[:, None] // 10 ** np.arange(8, -1, -1, dtype=np.int64)) % 10
+    bases = list(bases)
+    if not all(isinstance(b, str) and len(b) == 9 and b.isdigit() and b.isascii() for b in bases):
+        raise ValueError("Base del NIT debe ser una cadena de 9 dígitos")
+    if not bases:
+        return np.empty((0, 9), dtype=np.int64)
+    # Un solo buffer ASCII -> matriz de dígitos (sin int() por carácter)
+    raw = np.frombuffer("".join(bases).encode("ascii"), dtype=np.uint8).reshape(-1, 9)
+    return raw.astype(np.int64) - ord("0")
+
+
+def _extract_digits(nit: str) -> str:
+    """Valida formato y retorna los dígitos sin separadores (base + DV, 10 dígitos)."""
     if nit is None:
         raise ValueError("NIT is required")
+    if not isinstance(nit, str):
+        raise ValueError("NIT must be a string")
 
     candidate = nit.strip()
     if not candidate:
         raise ValueError("NIT cannot be empty")
 
     # Only digits, spaces, dots and hyphen are allowed in input
-    if not re.fullmatch(r"[0-9.\-\s]+", candidate):
+    if not _ALLOWED.fullmatch(candidate):
         raise ValueError("NIT must contain only digits and optional separators (.-)")
 
     digits = re.sub(r"\D", "", candidate)
     if len(digits) == 10:
-        base, dv_char = digits[:-1], digits[-1]
-        dv_expected = _compute_dv(base)
-        if int(dv_char) != dv_expected:
-            raise ValueError("Invalid NIT check digit (DV)")
-        return base
+        return digits
 
     # If exactly 9 digits provided, treat as invalid input (base only is ambiguous)
     if len(digits) == 9:
@@ -66,3 +102,49 @@ def validate_and_normalize_nit(nit: str) -> str:
     raise ValueError("NIT must be 9 base digits plus 1 check digit (total 10 digits)")
 
 
+def validate_and_normalize_nit(nit: str) -> str:
+    """Validate Colombian NIT format and DV, return canonical 9-digit base.
+
+    Accepted inputs (with optional separators ".- "):
+    - 9 base digits + DV (total 10 digits), e.g. "XXXXXXXXX-D" or "XXXXXXXXXD".
+
+    Returns the 9-digit base (without DV), numeric string without separators.
+    Raises ValueError if invalid.
+    """
+    digits = _extract_digits(nit)
+    base, dv_char = digits[:-1], digits[-1]
+    if int(dv_char) != _compute_dv(base):
+        raise ValueError("Invalid NIT check digit (DV)")
+    return base
+
+
+def validate_nits(values: Iterable[str]) -> List[Tuple[str | None, str | None]]:
+    """Valida un lote de NITs; por cada entrada retorna (base normalizada, None) o (None, error).
+
+    Mismos resultados y mensajes que `validate_and_normalize_nit`; con NumPy los DV del lote
+    se calculan en una sola operación vectorizada.
+    """
+    results: List[Tuple[str | None, str | None]] = []
+    pending: List[int] = []
+    candidates: List[str] = []
+    for value in values:
+        try:
+            digits = _extract_digits(value)
+        except ValueError as e:
+            results.append((None, str(e)))
+            continue
+        pending.append(len(results))
+        candidates.append(digits)
+        results.append((None, None))
+    if not candidates:
+        return results
+    if np is None:  # pragma: no cover
+        expected: Sequence[int] = [_compute_dv(d[:9]) for d in candidates]
+        given: Sequence[int] = [int(d[9]) for d in candidates]
+    else:
+        matrix = np.frombuffer("".join(candidates).encode("ascii"), dtype=np.uint8).reshape(-1, 10).astype(np.int64) - ord("0")
+        expected = compute_check_digits(matrix[:, :9]).tolist()
+        given = matrix[:, 9].tolist()
+    for index, digits, dv, dv_given in zip(pending, candidates, expected, given):
+        results[index] = (digits[:9], None) if dv == dv_given else (None, "Invalid NIT check digit (DV)")
+    return results
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import ColumnElement, Select, func, select
+from sqlalchemy.orm import Session
+
+from src.utils.instrumentation import query_label
+
+
+TOTAL_MODES = ("exact", "estimate", "none")
+
+
+class Page(NamedTuple):
+    total: Optional[int]
+    items: List[Any]
+    has_more: bool
+    next_cursor: Optional[str] = None
+    # (count, max(columna)...) del filtro con total="exact" y version_columns (ver fetch_version)
+    version: Optional[tuple] = None
+
+
+class CountCache:
+    """Conteos recientes por filtro normalizado (TTL corto, por worker)."""
+
+    def __init__(self, *, ttl_seconds: float, max_size: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[1]
+
+    def put(self, key: Hashable, value: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache(ttl_seconds=float(os.getenv("COUNT_CACHE_TTL_SECONDS", "30")))
+
+
+@query_label("fetch_page")
+def fetch_page(
+    db: Session,
+    stmt: Select,
+    *,
+    size: int,
+    offset: int = 0,
+    after: ColumnElement[bool] | None = None,
+    total: str = "exact",
+    count_key: Hashable | None = None,
+    version_columns: Sequence[Any] = (),
+) -> Page:
+    """Ejecuta una página de `stmt` (select ya ordenado de una entidad o de columnas; en
+    este último caso los items son Row y se leen por nombre).
+
+    - total="exact": conteo en el mismo SELECT con count(*) OVER () (salvo keyset, ver abajo).
+    - total="estimate": conteo cacheado por `count_key`; si no hay, estimación del planner
+      (PostgreSQL) o conteo exacto (otros motores), que queda en caché.
+    - total="none": sin conteo; se piden size+1 filas para informar `has_more`.
+    - after: predicado keyset (cursor); el conteo exacto se hace aparte porque el OVER ()
+      sólo vería las filas posteriores al cursor.
+    - version_columns: con total="exact", también max(columna) del filtro (OVER () en el mismo
+      SELECT, o junto al conteo aparte) para Page.version.
+    """
+    if total not in TOTAL_MODES:
+        raise ValueError("INVALID_TOTAL_MODE")
+    page_stmt = stmt if after is None else stmt.where(after)
+    page_stmt = page_stmt.offset(offset) if offset else page_stmt
+    width = len(stmt.column_descriptions)
+
+    if total == "exact" and after is None:
+        windows = [func.count().over(), *(func.max(c).over() for c in version_columns)]
+        rows = db.execute(page_stmt.add_columns(*windows).limit(size)).all()
+        # conteo y versión van como últimas columnas: los Row conservan el acceso por nombre
+        items = [row[0] for row in rows] if width == 1 else rows
+        if rows:
+            version = tuple(rows[0][width:])
+        elif offset:
+            # OFFSET fuera de rango: no hay fila que traiga el conteo
+            version = fetch_version(db, stmt, *version_columns)
+        else:
+            version = (0,) + (None,) * len(version_columns)
+        count = version[0]
+        return Page(count, items, offset + len(items) < count, version=version if version_columns else None)
+
+    result = db.execute(page_stmt.limit(size + 1))
+    rows = result.scalars().all() if width == 1 else result.all()
+    items, has_more = list(rows[:size]), len(rows) > size
+    if total == "none":
+        return Page(None, items, has_more)
+    if total == "exact":
+        if version_columns:
+            version = fetch_version(db, stmt, *version_columns)
+            return Page(version[0], items, has_more, version=version)
+        return Page(_exact_count(db, stmt), items, has_more)
+    return Page(_estimated_count(db, stmt, count_key), items, has_more)
+
+
+@query_label("fetch_version")
+def fetch_version(db: Session, stmt: Select, *columns: Any) -> tuple:
+    """(count, max(columna)...) de las filas de `stmt` en una sola consulta: versión del
+    resultado para ETags débiles de listados (cambia con altas, bajas y modificaciones)."""
+    version = stmt.with_only_columns(func.count(), *(func.max(c) for c in columns)).order_by(None)
+    return tuple(db.execute(version).one())
+
+
+def page_body(page: Page, items: List[Any], *, keyset: bool, total_mode: str) -> dict:
+    """Cuerpo de respuesta de los listados: `has_more` sólo cuando el total no es exacto."""
+    body: dict = {"total": page.total, "items": items}
+    if total_mode != "exact":
+        body["has_more"] = page.has_more
+    if keyset:
+        body["next_cursor"] = page.next_cursor
+    return body
+
+
+def _exact_count(db: Session, stmt: Select) -> int:
+    return db.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar_one()
+
+
+def _estimated_count(db: Session, stmt: Select, key: Hashable | None) -> int:
+    if key is not None:
+        cached = count_cache.get(key)
+        if cached is not None:
+            return cached
+    if db.get_bind().dialect.name == "postgresql":
+        count = _planner_estimate(db, stmt.order_by(None))
+    else:
+        count = _exact_count(db, stmt)
+    if key is not None:
+        count_cache.put(key, count)
+    return count
+
+
+def _planner_estimate(db: Session, stmt: Select) -> int:
+    dialect = db.get_bind().dialect
+    compiled = stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar_one()
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.models.user import User
+from src.utils.cache import build_cache
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Usuario autenticado resuelto a partir del token (sin password).
+
+    En modo stateless sólo se conocen `id`, `status` y `token_version` (los del token).
+    """
+
+    id: str
+    status: User.UserStatus
+    token_version: int = 0
+    name: str | None = None
+    email: str | None = None
+    nickname: str | None = None
+    company: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            status=user.status,
+            token_version=user.token_version or 0,
+            name=user.name,
+            email=user.email,
+            nickname=user.nickname,
+            company=user.company,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+# Usuario resuelto por `sub` del token (UserDAO.get_by_id de cada petición autenticada). La
+# ausencia (usuario inexistente o no ACTIVE) se cachea con un TTL más corto; UserService
+# escribe la versión nueva tras cada cambio (write-through).
+principal_cache = build_cache(
+    "users",
+    ttl_seconds=float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30")),
+    max_size=int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000")),
+    negative_ttl_seconds=float(os.getenv("AUTH_CACHE_NEGATIVE_TTL_SECONDS", "5")),
+)
@@ -0,0 +1,225 @@
+"""Presupuesto de sentencias SQL por petición, detector de N+1 y EXPLAIN de sentencias lentas.
+
+Herramienta de desarrollo y tests (QUERY_BUDGET_MODE, "off" por defecto):
+- warn: registra en el log las peticiones que superan el presupuesto de su endpoint o repiten
+  la misma sentencia (N+1), y agrega `X-Query-Count` a la respuesta.
+- raise: además responde 500 `{"error": "QUERY_BUDGET_EXCEEDED", ...}` en lugar de la respuesta.
+
+El presupuesto de cada vista se declara con `@query_budget(n)` (peor caso: caché de
+autenticación fría); sin decorador se usa QUERY_BUDGET_DEFAULT y `@query_budget(None)` exime
+a los endpoints por lotes, cuyas sentencias crecen con la cantidad de chunks. Con SLOW_QUERY_MS > 0, cada
+SELECT más lento que el umbral se vuelve a ejecutar con EXPLAIN (ANALYZE, BUFFERS) en
+PostgreSQL (EXPLAIN QUERY PLAN en SQLite) y el plan queda en el log y en el reporte.
+
+En tests, `capture_queries()` junta los reportes de las peticiones atendidas dentro del bloque.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+log = logging.getLogger(__name__)
+
+mode = os.getenv("QUERY_BUDGET_MODE", "off").strip().lower()
+default_budget = int(os.getenv("QUERY_BUDGET_DEFAULT", "10"))
+# Veces que una misma sentencia (mismo SQL, otros parámetros) puede repetirse antes de marcarla N+1
+n_plus_one_threshold = int(os.getenv("QUERY_N_PLUS_ONE_THRESHOLD", "3"))
+slow_query_ms = float(os.getenv("SLOW_QUERY_MS", "0"))
+
+_EXPLAIN_PREFIX = {"postgresql": "EXPLAIN (ANALYZE, BUFFERS) ", "sqlite": "EXPLAIN QUERY PLAN "}
+
+
+@dataclass
+class QueryReport:
+    endpoint: Optional[str]
+    budget: Optional[int]
+    # (sentencia, segundos) en orden de ejecución
+    statements: List[tuple] = field(default_factory=list)
+    explains: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def exceeded(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def repeated(self) -> Dict[str, int]:
+        """Sentencias ejecutadas `n_plus_one_threshold` veces o más (patrón N+1)."""
+        counts = Counter(statement for statement, _ in self.statements)
+        return {statement: n for statement, n in counts.items() if n >= n_plus_one_threshold}
+
+    @property
+    def ok(self) -> bool:
+        return self.budget is None or (not self.exceeded and not self.repeated())
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "endpoint": self.endpoint,
+            "count": self.count,
+            "budget": self.budget,
+            "db_ms": round(sum(elapsed for _, elapsed in self.statements) * 1000, 3),
+            "repeated": self.repeated(),
+        }
+
+
+_report: ContextVar[Optional[QueryReport]] = ContextVar("query_report", default=None)
+_captures: List[List[QueryReport]] = []
+_captures_lock = threading.Lock()
+
+
+def active() -> bool:
+    return mode in ("warn", "raise") or bool(_captures)
+
+
+def query_budget(limit: Optional[int]) -> Callable:
+    """Máximo de sentencias SQL de la vista, con la caché de autenticación fría (None: sin control)."""
+
+    def decorate(fn: Callable) -> Callable:
+        fn.query_budget = limit
+        return fn
+
+    return decorate
+
+
+@contextmanager
+def capture_queries() -> Iterator[List[QueryReport]]:
+    """Reportes de las peticiones atendidas (en cualquier hilo) mientras el bloque está abierto."""
+    reports: List[QueryReport] = []
+    with _captures_lock:
+        _captures.append(reports)
+    try:
+        yield reports
+    finally:
+        with _captures_lock:
+            _captures.remove(reports)
+
+
+def start_request(endpoint: Optional[str], budget: Optional[int]) -> None:
+    _report.set(QueryReport(endpoint=endpoint, budget=budget))
+
+
+def finish_request() -> Optional[QueryReport]:
+    report = _report.get()
+    if report is None:
+        return None
+    _report.set(None)
+    with _captures_lock:
+        for reports in _captures:
+            reports.append(report)
+    return report
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    if _report.get() is not None:
+        conn.info["budget_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    started = conn.info.pop("budget_started", None)
+    report = _report.get()
+    if started is None or report is None:
+        return
+    elapsed = time.perf_counter() - started
+    report.statements.append((statement, elapsed))
+    # Sólo SELECT: ANALYZE ejecuta la sentencia otra vez
+    if slow_query_ms > 0 and elapsed * 1000 >= slow_query_ms and statement.lstrip()[:6].upper() == "SELECT":
+        report.explains.append(_explain(conn, cursor, statement, parameters, elapsed))
+
+
+def _explain(conn: Any, cursor: Any, statement: str, parameters: Any, elapsed: float) -> Dict[str, Any]:
+    # Directo sobre la conexión DBAPI (sin eventos): mismos parámetros, misma transacción
+    result: Dict[str, Any] = {"statement": statement, "ms": round(elapsed * 1000, 3)}
+    prefix = _EXPLAIN_PREFIX.get(conn.dialect.name)
+    if prefix is None:
+        return result
+    explain_cursor = cursor.connection.cursor()
+    try:
+        # Dentro de un savepoint: en PostgreSQL un EXPLAIN fallido (p.ej. statement_timeout)
+        # abortaría la transacción y con ella el resto de la petición
+        explain_cursor.execute("SAVEPOINT query_budget_explain")
+        try:
+            explain_cursor.execute(prefix + statement, parameters)
+            result["plan"] = "\n".join(" ".join(str(col) for col in row) for row in explain_cursor.fetchall())
+        except Exception as e:  # el plan es informativo: nunca falla la petición
+            result["error"] = str(e)
+            explain_cursor.execute("ROLLBACK TO SAVEPOINT query_budget_explain")
+        explain_cursor.execute("RELEASE SAVEPOINT query_budget_explain")
+    except Exception as e:
+        result.setdefault("error", str(e))
+    finally:
+        explain_cursor.close()
+    log.warning("sentencia lenta (%.1f ms):\n%s\n%s", result["ms"], statement, result.get("plan") or result.get("error"))
+    return result
+
+
+def watch_engine(target: Engine) -> None:
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+def _check_response(response: Any, jsonify: Callable) -> Any:
+    report = finish_request()
+    if report is None or mode not in ("warn", "raise"):
+        return response
+    response.headers["X-Query-Count"] = str(report.count)
+    if report.ok:
+        return response
+    summary = report.summary()
+    log.warning("presupuesto de sentencias: %s", summary)
+    if mode == "raise":
+        failed = jsonify({"error": "QUERY_BUDGET_EXCEEDED", **summary})
+        failed.status_code = 500
+        return failed
+    return response
+
+
+def init_app(app: Any) -> None:
+    from flask import jsonify, request
+
+    @app.before_request
+    def _start_budget() -> None:
+        if active():
+            view = app.view_functions.get(request.endpoint) if request.endpoint else None
+            start_request(request.endpoint, getattr(view, "query_budget", default_budget))
+
+    @app.after_request
+    def _check_budget(response: Any) -> Any:
+        return _check_response(response, jsonify)
+
+    @app.teardown_request
+    def _drop_budget(exc: BaseException | None) -> None:
+        finish_request()
+
+
+def init_async_app(app: Any, views: Dict[str, Callable]) -> None:
+    """Mismos hooks para la app Quart; los presupuestos salen de `views` (las vistas Flask
+    equivalentes, con los mismos nombres de endpoint y las mismas sentencias)."""
+    from quart import jsonify, request
+
+    @app.before_request
+    async def _start_budget() -> None:
+        if active():
+            view = views.get(request.endpoint) if request.endpoint else None
+            start_request(request.endpoint, getattr(view, "query_budget", default_budget))
+
+    @app.after_request
+    async def _check_budget(response: Any) -> Any:
+        return _check_response(response, jsonify)
+
+    @app.teardown_request
+    async def _drop_budget(exc: BaseException | None) -> None:
+        finish_request()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+
+from src.utils.cache import Cache
+
+
+# Lag de una réplica PostgreSQL en segundos (0 si ya aplicó todo lo recibido; NULL si no es réplica)
+_LAG_SQL = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaSet:
+    """Réplicas de lectura en round-robin con health checks perezosos, por proceso (worker).
+
+    - check_interval: cada réplica se verifica (SELECT 1 y, en PostgreSQL, el lag) como mucho
+      una vez por intervalo, en la petición que la elige; las demás usan el último estado.
+    - retry_seconds: una réplica caída (check fallido o error de conexión) no se elige hasta pasado este tiempo.
+    - max_lag_seconds: lag máximo aceptado (0 = no se mide).
+    """
+
+    def __init__(self, engines: Sequence[Engine], *, check_interval: float, retry_seconds: float, max_lag_seconds: float = 0.0):
+        self.engines = list(engines)
+        self.check_interval = check_interval
+        self.retry_seconds = retry_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self._counter = itertools.count()
+        self._checked_until = [0.0] * len(self.engines)
+        self._down_until = [0.0] * len(self.engines)
+        self._locks = [threading.Lock() for _ in self.engines]
+
+    def choose(self) -> Optional[Engine]:
+        """Siguiente réplica sana, o None si no hay (se lee del primario)."""
+        count = len(self.engines)
+        if not count:
+            return None
+        start = next(self._counter)
+        now = time.monotonic()
+        for i in range(count):
+            index = (start + i) % count
+            if self._usable(index, now):
+                return self.engines[index]
+        return None
+
+    def mark_down(self, target: Engine) -> None:
+        for index, candidate in enumerate(self.engines):
+            if candidate is target:
+                self._down_until[index] = time.monotonic() + self.retry_seconds
+
+    def status(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {
+                "url": e.url.render_as_string(hide_password=True),
+                "healthy": self._down_until[i] <= now,
+                "retry_in_s": round(max(0.0, self._down_until[i] - now), 3),
+            }
+            for i, e in enumerate(self.engines)
+        ]
+
+    def _usable(self, index: int, now: float) -> bool:
+        if now < self._down_until[index]:
+            return False
+        if now < self._checked_until[index]:
+            return True
+        # Un solo hilo verifica; los demás siguen con el último estado (no está caída)
+        lock = self._locks[index]
+        if not lock.acquire(blocking=False):
+            return True
+        try:
+            healthy = self._check(self.engines[index])
+            now = time.monotonic()
+            self._checked_until[index] = now + self.check_interval
+            self._down_until[index] = 0.0 if healthy else now + self.retry_seconds
+            return healthy
+        finally:
+            lock.release()
+
+    def _check(self, target: Engine) -> bool:
+        try:
+            with target.connect() as conn:
+                if target.dialect.name == "postgresql" and self.max_lag_seconds > 0:
+                    lag = conn.exec_driver_sql(_LAG_SQL).scalar()
+                    return lag is None or float(lag) <= self.max_lag_seconds
+                conn.exec_driver_sql("SELECT 1")
+                return True
+        except exc.DBAPIError:
+            return False
+
+
+class RecentWrites:
+    """Usuarios que escribieron (o iniciaron sesión) hace menos del TTL de `store`: sus lecturas
+    van al primario (read-your-writes).
+
+    La marca vive en una Cache (build_cache): con CACHE_BACKEND=redis la ven todos los workers;
+    con el backend local sólo el worker que atendió la escritura.
+    """
+
+    def __init__(self, store: Cache):
+        self.store = store
+
+    def mark(self, user_id: str) -> None:
+        self.store.set(user_id, True)
+
+    def active(self, user_id: str) -> bool:
+        return self.store.get(user_id) is True
+
+    def clear(self) -> None:
+        self.store.clear()
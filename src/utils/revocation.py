@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Tuple
+
+from sqlalchemy import select
+
+from src.database import SessionLocal
+from src.models.user import User
+from src.utils.jwt import ACCESS_TOKEN_EXPIRES_MINUTES
+
+
+class RevocationMap:
+    """Mapa en memoria user_id -> token_version vigente, refrescado de forma incremental.
+
+    Sólo contiene usuarios modificados dentro de la vida útil de un token: si un usuario no
+    aparece, ningún token aún vigente puede tener una versión anterior a la actual.
+    """
+
+    def __init__(self, *, refresh_interval: float, overlap_seconds: float = 5.0):
+        self.refresh_interval = refresh_interval
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.window = timedelta(minutes=ACCESS_TOKEN_EXPIRES_MINUTES)
+        self._versions: Dict[str, Tuple[int, datetime]] = {}
+        self._since: datetime | None = None
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def is_revoked(self, user_id: str, version: int, *, refresh: bool = True) -> bool:
+        """`refresh=False`: no refresca aquí (el llamador ya lo hizo, p.ej. con `refresh_if_due`)."""
+        if refresh:
+            self._maybe_refresh()
+        entry = self._versions.get(user_id)
+        return entry is not None and version < entry[0]
+
+    def publish(self, user_id: str, version: int) -> None:
+        """Aplica localmente un cambio hecho por este worker (sin esperar al refresco)."""
+        self._store(user_id, version, datetime.now(timezone.utc))
+
+    def refresh(self) -> None:
+        now = datetime.now(timezone.utc)
+        since = self._since - self.overlap if self._since else now - self.window
+        stmt = select(User.id, User.token_version, User.updated_at).where(User.updated_at >= since)
+        db = SessionLocal()
+        try:
+            rows = db.execute(stmt).all()
+        finally:
+            db.close()
+        for user_id, version, updated_at in rows:
+            self._store(user_id, version, updated_at)
+        self._since = now
+        cutoff = now - self.window
+        for user_id, (_, updated_at) in list(self._versions.items()):
+            if _as_utc(updated_at) < cutoff:
+                self._versions.pop(user_id, None)
+
+    async def refresh_if_due(self) -> None:
+        """Refresco para el modo ASGI: la consulta usa el engine síncrono, así que corre en un
+        hilo (asyncio.to_thread) y no bloquea el event loop."""
+        if time.monotonic() >= self._next_refresh:
+            await asyncio.to_thread(self._maybe_refresh)
+
+    def clear(self) -> None:
+        self._versions.clear()
+        self._since = None
+        self._next_refresh = 0.0
+
+    def _store(self, user_id: str, version: int, updated_at: datetime) -> None:
+        current = self._versions.get(user_id)
+        if current is None or version >= current[0]:
+            self._versions[user_id] = (version, updated_at)
+
+    def _maybe_refresh(self) -> None:
+        if time.monotonic() < self._next_refresh:
+            return
+        # Un solo hilo refresca; los demás siguen con el mapa actual
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() >= self._next_refresh:
+                self.refresh()
+                self._next_refresh = time.monotonic() + self.refresh_interval
+        finally:
+            self._lock.release()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite devuelve datetimes naive; Postgres (timestamptz) con zona
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+revocations = RevocationMap(refresh_interval=float(os.getenv("AUTH_REVOCATION_REFRESH_SECONDS", "5")))
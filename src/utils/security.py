@@ -1,16 +1,130 @@
 from __future__ import annotations
 
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
 from passlib.context import CryptContext
 
 
-_pwd = CryptContext(schemes=["bcrypt"], deprecated="auto")
+log = logging.getLogger(__name__)
 
 
-def hash_password(plain_password: str) -> str:
+def _build_context(rounds: int) -> CryptContext:
+    # min/max iguales al costo configurado: cualquier hash con otro costo "necesita update"
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+_rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))
+_pwd = _build_context(_rounds)
+
+# Pool de procesos dedicado a bcrypt (0 = ejecutar en el hilo de la petición)
+_workers = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+# Máximo de operaciones en curso + en cola antes de rechazar con AUTH_BUSY (0 = sin límite)
+_max_pending = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(_max_pending) if _max_pending > 0 else None
+_executor: ProcessPoolExecutor | None = None
+_executor_pid: int | None = None
+
+
+def configure(*, workers: int | None = None, max_pending: int | None = None, rounds: int | None = None) -> None:
+    """Reconfigura el pool de hashing (tests/benchmarks). Cierra el pool actual."""
+    global _workers, _max_pending, _slots, _rounds, _pwd
+    with _lock:
+        _shutdown_locked()
+        if workers is not None:
+            _workers = workers
+        if max_pending is not None:
+            _max_pending = max_pending
+            _slots = threading.BoundedSemaphore(max_pending) if max_pending > 0 else None
+        if rounds is not None:
+            _rounds = rounds
+            _pwd = _build_context(rounds)
+
+
+def _shutdown_locked() -> None:
+    global _executor, _executor_pid
+    if _executor is not None and _executor_pid == os.getpid():
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _executor_pid = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor, _executor_pid
+    with _lock:
+        # Tras un fork (gunicorn) el pool del padre no es utilizable: se crea uno propio
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(max_workers=_workers, initializer=_init_worker, initargs=(_rounds,))
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _init_worker(rounds: int) -> None:
+    global _pwd
+    _pwd = _build_context(rounds)
+
+
+def _run(fn: Callable[..., Any], *args: Any) -> Any:
+    if _workers <= 0:
+        return fn(*args)
+    slots = _slots
+    if slots is None:
+        return _submit(fn, *args)
+    if not slots.acquire(blocking=False):
+        raise ValueError("AUTH_BUSY")
+    try:
+        return _submit(fn, *args)
+    finally:
+        slots.release()
+
+
+def _submit(fn: Callable[..., Any], *args: Any) -> Any:
+    # Un worker muerto rompe el pool: se reconstruye y se reintenta una vez. Nunca se ejecuta
+    # en el hilo de la petición (saltaría el control de admisión).
+    for attempt in range(2):
+        executor = _get_executor()
+        try:
+            return executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            log.warning("pool de hashing roto (intento %d); se reconstruye", attempt + 1)
+            with _lock:
+                if _executor is executor:
+                    _shutdown_locked()
+    raise ValueError("AUTH_BUSY")
+
+
+def _hash(plain_password: str) -> str:
     return _pwd.hash(plain_password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _verify(plain_password: str, hashed_password: str) -> bool:
     return _pwd.verify(plain_password, hashed_password)
 
 
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return _pwd.verify_and_update(plain_password, hashed_password)
+
+
+def hash_password(plain_password: str) -> str:
+    return _run(_hash, plain_password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _run(_verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verifica y, si el costo configurado cambió, retorna también el hash nuevo."""
+    return _run(_verify_and_update, plain_password, hashed_password)
@@ -1,5 +1,8 @@
 import os
 import sys
+from contextlib import contextmanager
+
+import pytest
 
 
 # Add project root to sys.path so that `import src...` works
@@ -8,3 +11,33 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 
+class Statements(list):
+    """SQL enviado al engine dentro de un bloque `with statements() as seen`."""
+
+    @property
+    def verbs(self) -> list:
+        return [statement.split(None, 1)[0].upper() for statement in self]
+
+
+@pytest.fixture
+def statements():
+    """`with statements() as seen:` registra las sentencias de `target` (por defecto, el engine síncrono)."""
+    from sqlalchemy import event
+
+    from src.database import engine
+
+    @contextmanager
+    def capture(target=None):
+        target = target or engine
+        seen = Statements()
+
+        def _record(conn, cursor, statement, params, context, executemany):
+            seen.append(statement)
+
+        event.listen(target, "before_cursor_execute", _record)
+        try:
+            yield seen
+        finally:
+            event.remove(target, "before_cursor_execute", _record)
+
+    return capture
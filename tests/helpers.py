@@ -0,0 +1,34 @@
+import uuid
+
+from src.utils.nit import compute_check_digit
+
+
+def nit_base() -> str:
+    """Base de NIT aleatoria de 9 dígitos."""
+    return str(uuid.uuid4().int)[:9].rjust(9, "1")
+
+
+def valid_nit(base: str | None = None) -> str:
+    """NIT `base-DV` con el dígito de verificación correcto (base aleatoria si no se da)."""
+    base = base or nit_base()
+    return f"{base}-{compute_check_digit(base)}"
+
+
+def auth_headers(client, password: str = "pass123456") -> dict:
+    """Registra un usuario nuevo con `client`, inicia sesión y retorna la cabecera Bearer."""
+    email = f"u{uuid.uuid4().hex[:8]}@example.com"
+    assert client.post("/users", json={"name": "Ops", "email": email, "password": password}).status_code == 201
+    r = client.post("/login", json={"identifier": email, "password": password})
+    assert r.status_code == 200, r.get_json()
+    return {"Authorization": f"Bearer {r.get_json()['access_token']}"}
+
+
+def account_with_company(client, **company) -> tuple[dict, str]:
+    """(headers, company_id): usuario nuevo con sesión y una compañía con NIT válido.
+
+    `company`: campos del POST /companies que reemplazan los de defecto (nit aleatorio, "Ops S.A.S.").
+    """
+    headers = auth_headers(client)
+    r = client.post("/companies", json={"nit": valid_nit(), "business_name": "Ops S.A.S.", **company}, headers=headers)
+    assert r.status_code == 201, r.get_json()
+    return headers, r.get_json()["id"]
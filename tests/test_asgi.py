@@ -0,0 +1,177 @@
+import asyncio
+import json as jsonlib
+import threading
+from urllib.parse import urlsplit
+
+import pytest
+
+pytest.importorskip("quart")
+pytest.importorskip("asgiref")
+pytest.importorskip("aiosqlite")
+
+import test_auth
+import test_clients_endpoints
+import test_users_endpoints
+from helpers import auth_headers, valid_nit
+from werkzeug.datastructures import Headers
+
+from src.asgi import app as asgi_app, served_async
+from src.database_async import async_engine
+from src.utils.query_budget import capture_queries
+
+
+class _Response:
+    def __init__(self, status_code: int, headers: Headers, data: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.data = data
+
+    def get_data(self) -> bytes:
+        return self.data
+
+    def get_json(self):
+        return jsonlib.loads(self.data) if self.data else None
+
+
+class ASGITestClient:
+    """Cliente síncrono con la interfaz de app.test_client() usada por los tests, sobre src.asgi:app.
+
+    Un único event loop en un hilo propio (el pool del AsyncEngine queda ligado a él); admite
+    llamadas desde varios hilos a la vez.
+    """
+
+    _loop = None
+
+    @classmethod
+    def loop(cls):
+        if cls._loop is None:
+            cls._loop = asyncio.new_event_loop()
+            threading.Thread(target=cls._loop.run_forever, daemon=True).start()
+        return cls._loop
+
+    def open(self, url, method="GET", json=None, data=None, headers=None):
+        headers = dict(headers or {})
+        if json is not None:
+            data = jsonlib.dumps(json)
+            headers.setdefault("Content-Type", "application/json")
+        body = data.encode() if isinstance(data, str) else (data or b"")
+        future = asyncio.run_coroutine_threadsafe(self._request(method, url, headers, body), self.loop())
+        return future.result(timeout=60)
+
+    def get(self, url, **kwargs):
+        return self.open(url, "GET", **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.open(url, "POST", **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.open(url, "PUT", **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.open(url, "PATCH", **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.open(url, "DELETE", **kwargs)
+
+    async def _request(self, method, url, headers, body):
+        parts = urlsplit(url)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": parts.path,
+            "raw_path": parts.path.encode(),
+            "query_string": parts.query.encode(),
+            "root_path": "",
+            "headers": [(k.lower().encode(), str(v).encode()) for k, v in {**headers, "Content-Length": len(body)}.items()],
+            "client": ("127.0.0.1", 1234),
+            "server": ("localhost", 80),
+            "extensions": {},
+        }
+        received = False
+        status, response_headers, chunks = 500, Headers(), []
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = Headers([(k.decode(), v.decode()) for k, v in message.get("headers", [])])
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await asgi_app(scope, receive, send)
+        return _Response(status, response_headers, b"".join(chunks))
+
+
+class _ASGIApp:
+    def test_client(self):
+        return ASGITestClient()
+
+
+@pytest.fixture
+def asgi(monkeypatch):
+    for module in (test_auth, test_clients_endpoints, test_users_endpoints):
+        monkeypatch.setattr(module, "app", _ASGIApp())
+
+
+# Tests de endpoints existentes que sólo usan HTTP (sin listeners del engine síncrono ni streaming)
+ENDPOINT_TESTS = [
+    test_clients_endpoints.test_create_update_list_delete_client,
+    test_clients_endpoints.test_list_clients_keyset_pagination,
+    test_clients_endpoints.test_list_clients_ranked_search_matches_all_tokens,
+    test_clients_endpoints.test_json_provider_datetimes_and_body_parsing,
+    test_clients_endpoints.test_bulk_import_clients_ndjson_and_csv,
+    test_clients_endpoints.test_validate_nit_batch_endpoint,
+    test_clients_endpoints.test_concurrent_creates_with_same_email,
+    test_clients_endpoints.test_conditional_requests_etag_last_modified_and_if_match,
+    test_auth.test_login_with_email_and_auth,
+    test_auth.test_login_with_nickname_and_inactive_user_denied,
+    test_auth.test_principal_cache_hits_and_invalidation_on_deactivate,
+    test_auth.test_logout_revokes_token,
+    test_users_endpoints.test_create_user_should_hash_and_hide_password,
+    test_users_endpoints.test_update_user_changes_password_and_nickname,
+    test_users_endpoints.test_activate_deactivate_user,
+    test_users_endpoints.test_duplicate_email_and_nickname_conflicts,
+]
+
+
+@pytest.mark.parametrize("test", ENDPOINT_TESTS, ids=lambda t: f"{t.__module__}.{t.__name__}")
+def test_endpoint_semantics_under_asgi(asgi, test):
+    # las vistas async emiten las mismas sentencias que las Flask: mismos presupuestos
+    with capture_queries() as reports:
+        test()
+    assert reports and all(report.ok for report in reports), [report.summary() for report in reports if not report.ok]
+
+
+def test_dispatch_prefers_async_views_except_wsgi_only_routes():
+    assert served_async("GET", "/clients")
+    assert served_async("POST", "/clients")
+    assert served_async("GET", "/clients/abc")
+    assert served_async("PUT", "/companies/abc")
+    assert served_async("GET", "/auth")
+    # reglas estáticas antes que /clients/<client_id>, igual que en Flask
+    assert not served_async("GET", "/clients/export")
+    assert not served_async("POST", "/clients/bulk")
+    assert not served_async("POST", "/login")
+    assert not served_async("OPTIONS", "/clients")
+    assert not served_async("GET", "/no-existe")
+
+
+def test_async_views_use_the_async_engine(asgi, statements):
+    client = ASGITestClient()
+    headers = auth_headers(client)
+
+    with statements(async_engine.sync_engine) as seen:
+        r = client.post("/companies", json={"nit": valid_nit(), "business_name": "Async S.A.S."}, headers=headers)
+        assert r.status_code == 201, r.get_json()
+        assert client.get("/clients?size=5", headers=headers).status_code == 200
+    assert "INSERT" in seen.verbs and "SELECT" in seen.verbs
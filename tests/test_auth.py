@@ -55,3 +55,162 @@ def test_login_with_nickname_and_inactive_user_denied():
     assert r.get_json()["error"] == "INVALID_CREDENTIALS"
 
 
+def test_principal_cache_hits_and_invalidation_on_deactivate():
+    from src.utils.principal_cache import principal_cache
+
+    client = app.test_client()
+    email = f"auth3_{id(object())}@example.com"
+    user_id = _create_user(email, None, password="pass123456")
+    token = _login(email, "pass123456")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    before = principal_cache.stats()
+    assert client.get("/auth", headers=headers).status_code == 200
+    assert client.get("/auth", headers=headers).status_code == 200
+    after = principal_cache.stats()
+    assert after["hits"] >= before["hits"] + 1
+
+    # la desactivación invalida la entrada: el token deja de servir de inmediato
+    r0 = client.post(f"/users/{user_id}/deactivate", headers=headers)
+    assert r0.status_code == 200
+    r = client.get("/auth", headers=headers)
+    assert r.status_code == 401
+
+
+def test_login_returns_503_when_password_pool_saturated():
+    from src.utils import security
+
+    email = f"auth4_{id(object())}@example.com"
+    _create_user(email, None, password="pass123456")
+    workers, max_pending = security._workers, security._max_pending
+    security.configure(workers=1, max_pending=1)
+    security._slots.acquire()  # la única plaza, ocupada
+    try:
+        r = app.test_client().post("/login", json={"identifier": email, "password": "pass123456"})
+        assert r.status_code == 503
+        assert r.get_json()["error"] == "AUTH_BUSY"
+        assert r.headers.get("Retry-After")
+    finally:
+        security._slots.release()
+        security.configure(workers=workers, max_pending=max_pending)
+
+
+def test_broken_password_pool_is_rebuilt_and_never_runs_inline(monkeypatch):
+    from concurrent.futures.process import BrokenProcessPool
+
+    from src.utils import security
+
+    class _Broken:
+        def submit(self, fn, *args):
+            raise BrokenProcessPool("worker muerto")
+
+    email = f"auth4c_{id(object())}@example.com"
+    _create_user(email, None, password="pass123456")
+    workers, max_pending = security._workers, security._max_pending
+    security.configure(workers=1, max_pending=4)
+    real = security._get_executor
+    try:
+        # el primer pool está roto; el reconstruido funciona
+        pools = iter([_Broken()])
+        monkeypatch.setattr(security, "_get_executor", lambda: next(pools, None) or real())
+        assert _login(email, "pass123456")
+
+        # si el pool sigue roto no se hashea en el hilo de la petición: 503 como con saturación
+        monkeypatch.setattr(security, "_get_executor", _Broken)
+        r = app.test_client().post("/login", json={"identifier": email, "password": "pass123456"})
+        assert r.status_code == 503
+        assert r.get_json()["error"] == "AUTH_BUSY"
+    finally:
+        monkeypatch.undo()
+        security.configure(workers=workers, max_pending=max_pending)
+
+
+def test_login_without_pending_limit():
+    from src.utils import security
+
+    email = f"auth4b_{id(object())}@example.com"
+    _create_user(email, None, password="pass123456")
+    workers, max_pending = security._workers, security._max_pending
+    security.configure(workers=1, max_pending=0)
+    try:
+        assert _login(email, "pass123456")
+    finally:
+        security.configure(workers=workers, max_pending=max_pending)
+
+
+def test_login_rehashes_password_when_cost_changes():
+    from src.utils import security
+
+    rounds = security._rounds
+    email = f"auth5_{id(object())}@example.com"
+    try:
+        security.configure(rounds=4)
+        user_id = _create_user(email, None, password="pass123456")
+        security.configure(rounds=5)
+        _login(email, "pass123456")
+        db = SessionLocal()
+        try:
+            assert db.get(User, user_id).password.startswith("$2b$05$")
+        finally:
+            db.close()
+    finally:
+        security.configure(rounds=rounds)
+
+
+def test_logout_revokes_token():
+    client = app.test_client()
+    email = f"auth6_{id(object())}@example.com"
+    _create_user(email, None, password="pass123456")
+    headers = {"Authorization": f"Bearer {_login(email, 'pass123456')}"}
+
+    assert client.get("/auth", headers=headers).status_code == 200
+    assert client.post("/logout", headers=headers).status_code == 204
+    assert client.get("/auth", headers=headers).status_code == 401
+    # un login nuevo emite un token con la versión vigente
+    assert client.get("/auth", headers={"Authorization": f"Bearer {_login(email, 'pass123456')}"}).status_code == 200
+
+
+def test_stateless_mode_runs_no_sql_and_honours_revocations(monkeypatch, statements):
+    from src.services import auth_service
+    from src.services.auth_service import AuthService
+
+    monkeypatch.setattr(auth_service, "AUTH_MODE", "stateless")
+    client = app.test_client()
+    email = f"auth7_{id(object())}@example.com"
+    user_id = _create_user(email, None, password="pass123456")
+    token = _login(email, "pass123456")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/clients", headers=headers).status_code == 200  # refresca el mapa
+
+    db = SessionLocal()
+    try:
+        with statements() as seen:
+            principal = AuthService(db).authenticate(token)
+    finally:
+        db.close()
+    assert principal.id == user_id
+    assert seen == []
+
+    assert client.post(f"/users/{user_id}/deactivate", headers=headers).status_code == 200
+    assert client.get("/clients", headers=headers).status_code == 401
+
+
+def test_async_stateless_refreshes_revocations_off_the_event_loop(monkeypatch):
+    import asyncio
+    import threading
+
+    from src.services.auth_service import AsyncAuthService
+    from src.utils.jwt import create_access_token
+    from src.utils.revocation import revocations
+
+    refreshed_in = []
+    monkeypatch.setattr(revocations, "refresh", lambda: refreshed_in.append(threading.get_ident()))
+    monkeypatch.setattr(revocations, "_next_refresh", 0.0)
+    token = create_access_token({"sub": "u-async", "ver": 0})
+
+    async def authenticate():
+        return threading.get_ident(), await AsyncAuthService(None).authenticate(token, stateless=True)
+
+    loop_thread, principal = asyncio.run(authenticate())
+    assert principal.id == "u-async"
+    assert len(refreshed_in) == 1 and refreshed_in[0] != loop_thread
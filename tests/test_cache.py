@@ -0,0 +1,130 @@
+import time
+
+import pytest
+from helpers import auth_headers, valid_nit
+
+from src.app import app
+from src.database import SessionLocal
+from src.dto.company_dto import CompanyImportDTO
+from src.services import company_service
+from src.services.company_service import CompanyService
+from src.utils.cache import MISS, Cache, FakeRedis, LocalCache, RedisCache
+
+
+def test_local_cache_lru_ttl_and_negative_entries():
+    cache = LocalCache("t_local", ttl_seconds=60, max_size=2, negative_ttl_seconds=0.05)
+    assert cache.get("a") is MISS
+    cache.set("a", 1)
+    cache.set("b", None)
+    assert cache.get("b") is None and cache.get("a") == 1
+    cache.set("c", 3)  # desaloja la menos usada ("b")
+    assert cache.get("b") is MISS
+    cache.set("b", None)
+    time.sleep(0.06)
+    assert cache.get("b") is MISS
+    stats = cache.stats()
+    assert (stats["hits"], stats["negative_hits"], stats["misses"]) == (1, 1, 3)
+    assert stats["evictions"] >= 1 and stats["hit_ratio"] == 0.4
+
+    loads = []
+    assert cache.get_or_load("d", lambda: loads.append(1) or "x") == "x"
+    assert cache.get_or_load("d", lambda: loads.append(1) or "y") == "x"
+    assert len(loads) == 1
+
+
+def test_redis_cache_serializes_namespaces_and_fails_open():
+    client = FakeRedis()
+    users = RedisCache("t_users", client, ttl_seconds=60, negative_ttl_seconds=5)
+    companies = RedisCache("t_companies", client, ttl_seconds=60, negative_ttl_seconds=0)
+    dto = CompanyImportDTO(nit=valid_nit(), business_name="ACME")
+    users.set("1", dto)
+    users.set("2", None)
+    companies.set("1", "otra")
+    companies.set("2", None)  # sin TTL negativo no se guarda la ausencia
+    assert users.get("1") == dto and users.get("1") is not dto
+    assert users.get("2") is None and companies.get("2") is MISS
+    users.clear()
+    assert users.get("1") is MISS and companies.get("1") == "otra"
+
+    class _Down:
+        def get(self, name):
+            raise ConnectionError("redis caído")
+
+        set = delete = get
+
+    broken = RedisCache("t_broken", _Down(), ttl_seconds=60)
+    broken.set("1", 1)
+    broken.delete("1")
+    assert broken.get("1") is MISS
+    assert broken.stats()["errors"] == 3
+
+
+@pytest.mark.parametrize("backend", ["local", "fake"])
+def test_company_reads_are_cached_with_write_through(monkeypatch, backend, statements):
+    if backend == "fake":
+        monkeypatch.setattr(company_service, "company_cache", RedisCache("companies", FakeRedis(), ttl_seconds=60, negative_ttl_seconds=5))
+    cache = company_service.company_cache
+    client = app.test_client()
+    headers = auth_headers(client)
+    nit = valid_nit()
+    company_id = client.post("/companies", json={"nit": nit, "business_name": "Cacheada"}, headers=headers).get_json()["id"]
+
+    # create escribe la entrada: ni el GET ni su revalidación van a la base (el usuario también está en caché)
+    with statements() as seen:
+        r = client.get(f"/companies/{company_id}", headers=headers)
+        assert r.status_code == 200 and r.get_json()["business_name"] == "Cacheada"
+        assert client.get(f"/companies/{company_id}", headers={**headers, "If-None-Match": r.headers["ETag"]}).status_code == 304
+    assert seen == []
+
+    assert client.put(f"/companies/{company_id}", json={"nit": nit, "business_name": "Nueva"}, headers=headers).status_code == 200
+    with statements() as seen:
+        assert client.get(f"/companies/{company_id}", headers=headers).get_json()["business_name"] == "Nueva"
+    assert seen == []
+
+    assert client.delete(f"/companies/{company_id}", headers=headers).status_code == 204
+    with statements() as seen:
+        assert client.get(f"/companies/{company_id}", headers=headers).status_code == 404
+    assert seen == []
+    assert cache.stats()["negative_hits"] >= 1
+
+
+def test_bulk_upsert_invalidates_updated_companies():
+    client = app.test_client()
+    headers = auth_headers(client)
+    nit = valid_nit()
+    company_id = client.post("/companies", json={"nit": nit, "business_name": "Antes"}, headers=headers).get_json()["id"]
+    assert client.get(f"/companies/{company_id}", headers=headers).get_json()["business_name"] == "Antes"
+
+    db = SessionLocal()
+    try:
+        result = CompanyService(db).bulk_upsert([(1, {"nit": nit, "business_name": "Después"}, None)])
+    finally:
+        db.close()
+    assert result.updated == 1
+    assert client.get(f"/companies/{company_id}", headers=headers).get_json()["business_name"] == "Después"
+
+
+def test_unknown_and_inactive_users_are_negatively_cached(statements):
+    from src.utils.principal_cache import principal_cache
+
+    client = app.test_client()
+    headers = auth_headers(client)
+    user_id = client.get("/auth", headers=headers).get_json()["id"]
+    principal_cache.clear()
+    assert client.get("/auth", headers=headers).status_code == 200
+
+    # desactivar escribe la ausencia en la caché: el token se rechaza sin consultar la base
+    assert client.post(f"/users/{user_id}/deactivate", headers=headers).status_code == 200
+    with statements() as seen:
+        assert client.get("/clients", headers=headers).status_code == 401
+    assert seen == []
+    assert principal_cache.stats()["negative_hits"] >= 1
+
+
+def test_backends_must_implement_the_storage_hooks():
+    class Partial(Cache):
+        def _get(self, key):
+            return MISS
+
+    with pytest.raises(TypeError):
+        Partial("t_partial", ttl_seconds=1)
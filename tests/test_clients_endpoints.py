@@ -1,6 +1,21 @@
 import uuid
 
+import pytest
+
+from helpers import account_with_company, auth_headers, valid_nit
 from src.app import app
+from src.utils.query_budget import capture_queries
+
+
+@pytest.fixture(autouse=True)
+def query_budget_check():
+    # Cada petición de estos tests respeta el presupuesto de su endpoint y no repite sentencias (N+1)
+    with capture_queries() as reports:
+        yield reports
+    for report in reports:
+        assert report.ok, report.summary()
+
+
 def _login(email_or_nick: str, password: str) -> str:
     client = app.test_client()
     r = client.post("/login", json={"identifier": email_or_nick, "password": password})
@@ -8,24 +23,11 @@ def _login(email_or_nick: str, password: str) -> str:
     return r.get_json()["access_token"]
 
 
-_WEIGHTS = [3, 7, 13, 17, 19, 23, 29, 37, 41]
-
-
-def build_valid_nit(base: str) -> str:
-    total = 0
-    for i, ch in enumerate(reversed(base)):
-        total += int(ch) * _WEIGHTS[i]
-    remainder = total % 11
-    dv = remainder if remainder in (0, 1) else 11 - remainder
-    return f"{base}-{dv}"
-
-
 def test_create_update_list_delete_client():
     client = app.test_client()
 
     # create company first with valid NIT
-    base = ''.join(str(int(x, 16) % 10) for x in uuid.uuid4().hex[:9])
-    comp_nit = build_valid_nit(base)
+    comp_nit = valid_nit()
     # crear usuario y token para auth
     uemail = f"u{uuid.uuid4().hex[:8]}@example.com"
     ures = client.post("/users", json={"name": "Ops", "email": uemail, "password": "pass123456"})
@@ -95,3 +97,430 @@ def test_create_update_list_delete_client():
     assert r5.status_code == 204
 
 
+def test_list_clients_checks_out_a_single_connection():
+    from sqlalchemy import event
+
+    from src.database import engine
+    from src.utils.principal_cache import principal_cache
+
+    client = app.test_client()
+    headers = auth_headers(client)
+
+    checkouts = []
+
+    def _on_checkout(dbapi_conn, record, proxy):
+        checkouts.append(record)
+
+    # sin caché: auth y listado consultan la base con la misma sesión/conexión
+    principal_cache.clear()
+    event.listen(engine, "checkout", _on_checkout)
+    try:
+        r = client.get("/clients?page=1&size=10", headers=headers)
+    finally:
+        event.remove(engine, "checkout", _on_checkout)
+    assert r.status_code == 200
+    assert len(checkouts) == 1
+
+
+def test_list_clients_keyset_pagination():
+    client = app.test_client()
+    headers, company_id = account_with_company(client)
+    created = []
+    for _ in range(3):
+        r = client.post("/clients", json={"company_id": company_id, "email": f"k_{uuid.uuid4().hex[:8]}@example.com"}, headers=headers)
+        assert r.status_code == 201
+        created.append(r.get_json()["id"])
+
+    r1 = client.get("/clients?size=2&cursor=", headers=headers)
+    assert r1.status_code == 200
+    page1 = r1.get_json()
+    assert page1["total"] == 3
+    assert len(page1["items"]) == 2 and page1["next_cursor"]
+
+    r2 = client.get(f"/clients?size=2&cursor={page1['next_cursor']}", headers=headers)
+    page2 = r2.get_json()
+    assert len(page2["items"]) == 1 and page2["next_cursor"] is None
+    seen = [i["id"] for i in page1["items"] + page2["items"]]
+    assert sorted(seen) == sorted(created)
+
+    assert client.get("/clients?cursor=not-a-cursor", headers=headers).status_code == 400
+    # sin `cursor` se mantiene el contrato page/size
+    assert "next_cursor" not in client.get("/clients?page=1&size=2", headers=headers).get_json()
+
+
+def test_list_clients_total_modes(statements):
+    from src.database import engine
+
+    client = app.test_client()
+    headers, company_id = account_with_company(client)
+    for _ in range(3):
+        r = client.post("/clients", json={"company_id": company_id, "email": f"t_{uuid.uuid4().hex[:8]}@example.com"}, headers=headers)
+        assert r.status_code == 201
+
+    client.get("/auth", headers=headers)  # calienta la caché de principal
+    with statements() as seen:
+        exact = client.get("/clients?size=2", headers=headers).get_json()
+    # total exacto en el mismo SELECT (window function), sin consulta de conteo aparte
+    assert exact["total"] == 3 and len(exact["items"]) == 2
+    assert len(seen) == 1
+
+    none = client.get("/clients?size=2&total=none", headers=headers).get_json()
+    assert none["total"] is None and none["has_more"] is True
+    last = client.get("/clients?size=2&page=2&total=none", headers=headers).get_json()
+    assert len(last["items"]) == 1 and last["has_more"] is False
+
+    estimate = client.get("/clients?size=2&total=estimate", headers=headers).get_json()
+    assert isinstance(estimate["total"], int) and estimate["total"] >= 0 and estimate["has_more"] is True
+    if engine.dialect.name == "sqlite":
+        # sin estimación del planner se cuenta exacto
+        assert estimate["total"] == 3
+
+    assert client.get("/clients?total=bogus", headers=headers).status_code == 400
+
+
+def test_list_clients_ranked_search_matches_all_tokens():
+    client = app.test_client()
+    headers, company_id = account_with_company(client)
+    tag = str(uuid.uuid4().int)[:6]
+    both = client.post("/clients", json={"company_id": company_id, "contact_name": f"Ana {tag}", "phone": f"+57-300{tag}"}, headers=headers).get_json()["id"]
+    other = client.post(
+        "/clients",
+        json={"company_id": company_id, "contact_name": f"Ana {tag}", "phone": f"+57-311{tag}", "email": f"ref{tag}x@example.com"},
+        headers=headers,
+    ).get_json()["id"]
+
+    r = client.get(f"/clients?q=ana 300{tag}&search=ranked", headers=headers)
+    assert r.status_code == 200, r.get_json()
+    assert [i["id"] for i in r.get_json()["items"]] == [both]
+    # token alfanumérico mixto: subcadena (trigram), no FTS
+    r = client.get(f"/clients?q=ana ref{tag}x&search=ranked", headers=headers)
+    assert [i["id"] for i in r.get_json()["items"]] == [other]
+
+    assert client.get("/clients?q=ana&search=fuzzy", headers=headers).status_code == 400
+    assert client.get("/clients?q=ana&search=ranked&cursor=", headers=headers).status_code == 400
+
+
+def test_list_clients_include_company_single_query(statements):
+    client = app.test_client()
+    headers = auth_headers(client)
+    company_ids = []
+    for name in ("Uno", "Dos"):
+        rcomp = client.post("/companies", json={"nit": valid_nit(), "business_name": name, "city": "Cali"}, headers=headers)
+        assert rcomp.status_code == 201
+        company_ids.append(rcomp.get_json()["id"])
+    for company_id in company_ids * 2:
+        r = client.post("/clients", json={"company_id": company_id, "email": f"i_{uuid.uuid4().hex[:8]}@example.com"}, headers=headers)
+        assert r.status_code == 201
+
+    client.get("/auth", headers=headers)  # calienta la caché de principal
+    with statements() as seen:
+        body = client.get("/clients?size=10&include=company", headers=headers).get_json()
+    # clientes + compañías + total en un único SELECT
+    assert len(seen) == 1
+    assert body["total"] == 4
+    for item in body["items"]:
+        assert item["company"]["id"] == item["company_id"]
+        assert item["company"]["city"] == "Cali" and item["company"]["status"] == "ACTIVE"
+        assert set(item["company"]) == {"id", "nit", "business_name", "city", "status"}
+
+    legacy = client.get("/clients?size=10&include_company=true", headers=headers).get_json()
+    assert legacy["items"] == body["items"]
+
+    keyset = client.get("/clients?size=3&cursor=&include=company", headers=headers).get_json()
+    assert len(keyset["items"]) == 3 and "company" in keyset["items"][0] and keyset["next_cursor"]
+    rest = client.get(f"/clients?size=3&cursor={keyset['next_cursor']}&include=company", headers=headers).get_json()
+    assert len(rest["items"]) == 1 and rest["next_cursor"] is None
+
+    assert "company" not in client.get("/clients?size=10", headers=headers).get_json()["items"][0]
+    assert client.get("/clients?include=owner", headers=headers).status_code == 400
+
+
+def test_json_provider_datetimes_and_body_parsing():
+    from datetime import datetime
+
+    client = app.test_client()
+    headers = auth_headers(client)
+    rcomp = client.post("/companies", json={"nit": valid_nit(), "business_name": "Json"}, headers=headers)
+    assert rcomp.status_code == 201
+    body = rcomp.get_json()
+    # date-time RFC 3339 (openapi), con zona; enums como su valor
+    assert datetime.fromisoformat(body["created_at"]).tzinfo is not None
+    assert body["status"] == "ACTIVE"
+
+    r = client.post("/clients", data=b'{"company_id": ', headers={**headers, "Content-Type": "application/json"})
+    assert r.status_code == 400
+
+
+def test_bulk_import_clients_ndjson_and_csv():
+    import json
+
+    client = app.test_client()
+    headers, company_id = account_with_company(client)
+    taken = f"b_{uuid.uuid4().hex[:8]}@example.com"
+    assert client.post("/clients", json={"company_id": company_id, "email": taken}, headers=headers).status_code == 201
+
+    tag = uuid.uuid4().hex[:8]
+    lines = [
+        {"company_id": company_id, "contact_name": "Uno", "email": f"b1_{tag}@example.com", "phone": f"+57-1{tag}"},
+        {"company_id": company_id, "email": taken},
+        {"company_id": company_id, "email": f"b1_{tag}@example.com"},
+        {"company_id": "missing", "email": f"b3_{tag}@example.com"},
+        {"company_id": company_id, "email": "not-an-email"},
+        {"company_id": company_id, "contact_name": "Dos", "email": f"b2_{tag}@example.com"},
+    ]
+    body = "\n".join(json.dumps(x) for x in lines) + "\n{broken\n"
+    r = client.post("/clients/bulk?chunk_size=2", data=body, headers={**headers, "Content-Type": "application/x-ndjson"})
+    assert r.status_code == 200, r.get_json()
+    result = r.get_json()
+    assert result["received"] == 7 and result["created"] == 2 and result["failed"] == 5
+    assert [(e["row"], e["error"]) for e in result["errors"] if isinstance(e["error"], str)] == [
+        (2, "EMAIL_TAKEN"), (3, "EMAIL_TAKEN"), (4, "COMPANY_NOT_FOUND"), (7, "INVALID_JSON"),
+    ]
+    assert result["rows_per_second"] > 0
+
+    csv_body = f"company_id,contact_name,email,phone\n{company_id},Tres,b4_{tag}@example.com,\n{company_id},Cuatro,,+57-1{tag}\n"
+    r = client.post("/clients/bulk", data=csv_body, headers={**headers, "Content-Type": "text/csv"})
+    result = r.get_json()
+    assert result["created"] == 1 and result["errors"] == [{"row": 2, "error": "PHONE_TAKEN"}]
+
+    # los creados quedan asociados al usuario que importa
+    listed = client.get("/clients?size=50", headers=headers).get_json()
+    assert listed["total"] == 4
+
+    assert client.post("/clients/bulk", data="x", headers={**headers, "Content-Type": "text/plain"}).status_code == 415
+    for chunk_size in ("abc", "0"):
+        r = client.post(f"/clients/bulk?chunk_size={chunk_size}", data=csv_body, headers={**headers, "Content-Type": "text/csv"})
+        assert (r.status_code, r.get_json()) == (400, {"error": "INVALID_CHUNK_SIZE"})
+
+
+def test_export_clients_streams_with_flat_memory():
+    import json
+    import tracemalloc
+    from datetime import datetime, timedelta, timezone
+
+    from sqlalchemy import insert
+
+    from src.database import SessionLocal
+    from src.models.client import Client, ClientStatus as ModelStatus
+    from src.models.user_client import UserClient
+
+    client = app.test_client()
+    headers, company_id = account_with_company(client, business_name="Export")
+    user_id = client.get("/auth", headers=headers).get_json()["id"]
+
+    count = 20000
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "company_id": company_id,
+            "contact_name": f"Export {i}",
+            "email": f"e{i}_{uuid.uuid4().hex[:8]}@example.com",
+            "status": ModelStatus.INACTIVE if i % 10 == 0 else ModelStatus.ACTIVE,
+            "created_at": now - timedelta(milliseconds=i),
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+    db = SessionLocal()
+    try:
+        db.execute(insert(Client), rows)
+        db.execute(insert(UserClient), [{"user_id": user_id, "client_id": row["id"]} for row in rows])
+        db.commit()
+    finally:
+        db.close()
+    del rows
+
+    tracemalloc.start()
+    try:
+        r = client.get("/clients/export", headers=headers, buffered=False)
+        assert r.status_code == 200 and r.mimetype == "application/x-ndjson"
+        lines = 0
+        first = None
+        for chunk in r.response:
+            lines += chunk.count(b"\n")
+            first = first or chunk.split(b"\n", 1)[0]
+        r.close()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert lines == count
+    assert json.loads(first)["contact_name"] == "Export 0"
+    # el cuerpo completo (~5 MB) no cabe en el techo: en streaming sólo vive un lote a la vez
+    assert peak < 4 * 1024 * 1024, peak
+
+    csv_body = client.get("/clients/export?format=csv&status=INACTIVE", headers=headers).get_data(as_text=True)
+    csv_lines = csv_body.splitlines()
+    assert csv_lines[0].startswith("id,company_id,contact_name")
+    assert len(csv_lines) == 1 + count // 10
+
+    assert client.get("/clients/export?format=xml", headers=headers).status_code == 400
+    companies = client.get("/companies/export?format=csv&q=Export", headers=headers).get_data(as_text=True).splitlines()
+    assert len(companies) >= 2
+
+
+def test_validate_nit_batch_endpoint():
+    client = app.test_client()
+    headers = auth_headers(client)
+    r = client.post("/companies/nit/validate", json={"nits": ["800.197.268-4", "800197268-5", "abc"]}, headers=headers)
+    assert r.status_code == 200
+    body = r.get_json()
+    assert body["valid"] == 1 and body["invalid"] == 2
+    assert body["results"][0] == {"input": "800.197.268-4", "valid": True, "nit": "800197268"}
+    assert body["results"][1]["error"] == "Invalid NIT check digit (DV)"
+
+    assert client.post("/companies/nit/validate", json={"nit": "x"}, headers=headers).status_code == 400
+    r = client.post("/companies/nit/validate", json={"nits": ["800197268-4", 123]}, headers=headers)
+    assert r.status_code == 400 and r.get_json() == {"error": "NIT_MUST_BE_STRING"}
+    assert client.post("/companies/nit/validate", json={"nits": []}).status_code == 401
+
+
+def test_create_client_relies_on_constraints(statements):
+    client = app.test_client()
+    headers, company_id = account_with_company(client)
+    tag = uuid.uuid4().hex[:8]
+    payload = {"company_id": company_id, "email": f"c_{tag}@example.com", "phone": f"+57-9{tag}"}
+
+    client.get("/auth", headers=headers)  # calienta la caché de principal
+    with statements() as seen:
+        r = client.post("/clients", json=payload, headers=headers)
+    assert r.status_code == 201, r.get_json()
+    # INSERT del cliente (RETURNING) + INSERT de la asociación; sin SELECT previos ni refresh
+    assert seen.verbs == ["INSERT", "INSERT"]
+
+    r = client.post("/clients", json={**payload, "phone": None}, headers=headers)
+    assert (r.status_code, r.get_json()["error"]) == (409, "EMAIL_TAKEN")
+    r = client.post("/clients", json={**payload, "email": f"d_{tag}@example.com"}, headers=headers)
+    assert (r.status_code, r.get_json()["error"]) == (409, "PHONE_TAKEN")
+    r = client.post("/clients", json={"company_id": str(uuid.uuid4()), "email": f"e_{tag}@example.com"}, headers=headers)
+    assert (r.status_code, r.get_json()["error"]) == (400, "COMPANY_NOT_FOUND")
+    # la transacción fallida no deja asociaciones huérfanas
+    assert client.get("/clients?size=50", headers=headers).get_json()["total"] == 1
+
+
+def test_concurrent_creates_with_same_email():
+    import threading
+
+    client = app.test_client()
+    headers, company_id = account_with_company(client)
+    email = f"race_{uuid.uuid4().hex[:8]}@example.com"
+
+    barrier = threading.Barrier(8)
+    statuses = []
+
+    def create():
+        c = app.test_client()
+        barrier.wait()
+        r = c.post("/clients", json={"company_id": company_id, "email": email}, headers=headers)
+        statuses.append((r.status_code, (r.get_json() or {}).get("error")))
+
+    threads = [threading.Thread(target=create) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(statuses, key=str) == sorted([(201, None)] + [(409, "EMAIL_TAKEN")] * 7, key=str)
+
+
+def test_write_endpoints_skip_refresh_selects(statements):
+    client = app.test_client()
+    headers = auth_headers(client)
+    client.get("/auth", headers=headers)  # calienta la caché de principal
+
+    def verbs(call):
+        with statements() as seen:
+            r = call()
+        return r, seen.verbs
+
+    nit = valid_nit()
+    r, seen = verbs(lambda: client.post("/companies", json={"nit": nit, "business_name": "UoW"}, headers=headers))
+    assert r.status_code == 201 and seen == ["INSERT"]
+    company_id = r.get_json()["id"]
+
+    r, seen = verbs(lambda: client.put(f"/companies/{company_id}", json={"nit": nit, "business_name": "UoW 2"}, headers=headers))
+    assert r.status_code == 200 and seen == ["SELECT", "UPDATE"]
+    assert r.get_json()["business_name"] == "UoW 2"
+
+    r = client.post("/clients", json={"company_id": company_id, "email": f"w_{uuid.uuid4().hex[:8]}@example.com"}, headers=headers)
+    client_id = r.get_json()["id"]
+    payload = {"company_id": company_id, "contact_name": "Nuevo", "email": r.get_json()["email"]}
+    r, seen = verbs(lambda: client.put(f"/clients/{client_id}", json=payload, headers=headers))
+    assert r.status_code == 200 and seen == ["SELECT", "UPDATE"]
+    assert r.get_json()["contact_name"] == "Nuevo"
+
+    r, seen = verbs(lambda: client.post(f"/clients/{client_id}/deactivate", headers=headers))
+    assert r.status_code == 200 and seen == ["SELECT", "UPDATE"]
+    assert r.get_json()["status"] == "INACTIVE"
+
+    r, seen = verbs(lambda: client.delete(f"/clients/{client_id}", headers=headers))
+    assert r.status_code == 204 and seen == ["SELECT", "DELETE"]
+
+    # la unicidad la reporta la base (sin SELECT previo por nit)
+    other = valid_nit()
+    assert client.post("/companies", json={"nit": other, "business_name": "Otra"}, headers=headers).status_code == 201
+    r = client.put(f"/companies/{company_id}", json={"nit": other, "business_name": "UoW"}, headers=headers)
+    assert (r.status_code, r.get_json()["error"]) == (409, "NIT_TAKEN")
+
+
+def test_conditional_requests_etag_last_modified_and_if_match():
+    client = app.test_client()
+    nit = valid_nit()
+    headers, company_id = account_with_company(client, nit=nit)
+    r = client.post("/clients", json={"company_id": company_id, "email": f"e_{uuid.uuid4().hex[:8]}@example.com"}, headers=headers)
+    client_id, email = r.get_json()["id"], r.get_json()["email"]
+
+    # ETag fuerte y Last-Modified en GET por id; 304 sin cuerpo al revalidar
+    r = client.get(f"/clients/{client_id}", headers=headers)
+    etag, modified = r.headers["ETag"], r.headers["Last-Modified"]
+    assert r.status_code == 200 and not etag.startswith("W/")
+    r = client.get(f"/clients/{client_id}", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304 and r.get_data() == b"" and r.headers["ETag"] == etag
+    assert client.get(f"/clients/{client_id}", headers={**headers, "If-Modified-Since": modified}).status_code == 304
+    assert client.get(f"/clients/{client_id}", headers={**headers, "If-None-Match": '"otro"'}).status_code == 200
+
+    r = client.get(f"/companies/{company_id}", headers=headers)
+    assert client.get(f"/companies/{company_id}", headers={**headers, "If-None-Match": r.headers["ETag"]}).status_code == 304
+
+    # listados: ETag débil por filtro y página
+    r = client.get("/clients?size=5", headers=headers)
+    list_etag = r.headers["ETag"]
+    assert list_etag.startswith("W/")
+    assert client.get("/clients?size=5", headers={**headers, "If-None-Match": list_etag}).status_code == 304
+    assert client.get("/clients?size=5&page=2", headers={**headers, "If-None-Match": list_etag}).status_code == 200
+    assert client.get("/clients?size=5&total=none", headers=headers).headers.get("ETag") is None
+
+    # If-Match: una versión vieja no pisa la escritura de otro
+    payload = {"company_id": company_id, "contact_name": "Primero", "email": email}
+    r = client.put(f"/clients/{client_id}", json=payload, headers={**headers, "If-Match": etag})
+    assert r.status_code == 200
+    new_etag = r.headers["ETag"]
+    assert new_etag != etag
+    r = client.put(f"/clients/{client_id}", json={**payload, "contact_name": "Perdido"}, headers={**headers, "If-Match": etag})
+    assert r.status_code == 412 and r.get_json()["error"] == "PRECONDITION_FAILED"
+    assert client.put(f"/clients/{client_id}", json=payload, headers={**headers, "If-Match": "*"}).status_code == 200
+    assert client.put(f"/companies/{company_id}", json={"nit": nit, "business_name": "X"}, headers={**headers, "If-Match": '"viejo"'}).status_code == 412
+
+    # el registro y el listado cambiaron: los validadores anteriores ya no aplican
+    assert client.get(f"/clients/{client_id}", headers={**headers, "If-None-Match": etag}).status_code == 200
+    assert client.get("/clients?size=5", headers={**headers, "If-None-Match": list_etag}).status_code == 200
+
+
+def test_not_modified_skips_loading_the_entity(statements):
+    from src.services.company_service import company_cache
+
+    client = app.test_client()
+    nit = valid_nit()
+    headers, company_id = account_with_company(client, nit=nit)
+    client.post("/clients", json={"company_id": company_id, "email": f"e_{uuid.uuid4().hex[:8]}@example.com"}, headers=headers)
+    etag = client.get(f"/companies/{company_id}", headers=headers).headers["ETag"]
+    list_etag = client.get("/clients", headers=headers).headers["ETag"]
+    # sin la compañía en caché: la revalidación consulta sólo updated_at
+    company_cache.clear()
+
+    with statements() as seen:
+        assert client.get(f"/companies/{company_id}", headers={**headers, "If-None-Match": etag}).status_code == 304
+        assert client.get("/clients", headers={**headers, "If-None-Match": list_etag}).status_code == 304
+    # una consulta por petición: updated_at del registro; count/max del filtro (sin la página)
+    assert len(seen) == 2
+    assert seen[0].split("FROM")[0].strip() == "SELECT companies.updated_at"
+    assert "LIMIT" not in seen[1].upper()
@@ -0,0 +1,76 @@
+import json
+import uuid
+from collections import Counter
+
+from sqlalchemy import func, select
+
+from scripts.generate_data import BLOCK, Spec, generate_block, load, main
+from src.app import app
+from src.database import SessionLocal
+from src.dto.client_dto import ClientCreateDTO
+from src.models.client import Client
+from src.models.user_client import UserClient
+from src.utils.nit import compute_check_digit, validate_and_normalize_nit
+
+
+_SPEC = Spec(seed=7, companies=300, clients=BLOCK + 500, users=400, password_hash="x")
+
+
+def _rows(spec: Spec, table: str, total: int) -> dict:
+    rows: dict = {}
+    for block in range(-(-total // BLOCK)):
+        for name, values in generate_block(spec, table, block).items():
+            rows.setdefault(name, []).extend(values)
+    return rows
+
+
+def test_rows_are_valid_unique_and_deterministic():
+    companies = _rows(_SPEC, "companies", _SPEC.companies)["companies"]
+    generated = _rows(_SPEC, "clients", _SPEC.clients)
+    clients, owners = generated["clients"], generated["user_clients"]
+    assert _rows(_SPEC, "clients", _SPEC.clients) == generated
+
+    bases = [row[1] for row in companies]
+    assert len(set(bases)) == len(bases)
+    assert all(validate_and_normalize_nit(f"{b}-{compute_check_digit(b)}") == b for b in bases)
+    assert len(clients) == len(owners) == _SPEC.clients
+    assert len({row[3] for row in clients}) == len({row[4] for row in clients}) == _SPEC.clients
+    company_ids = {row[0] for row in companies}
+    assert all(row[1] in company_ids for row in clients)
+    ClientCreateDTO(company_id=clients[0][1], contact_name=clients[0][2], email=clients[0][3], phone=clients[0][4])
+
+    # Zipf: el usuario más cargado tiene muchos más clientes que la mediana
+    per_user = sorted(Counter(row[2] for row in owners).values(), reverse=True)
+    assert per_user[0] > 20 * per_user[len(per_user) // 2]
+
+
+def test_output_does_not_depend_on_shards_or_workers(tmp_path):
+    spec = Spec(seed=3, companies=20, clients=2 * BLOCK + 10, users=50, password_hash="x")
+    contents = []
+    for name, workers, shard_size in (("a", 1, BLOCK), ("b", 2, 3 * BLOCK)):
+        out = tmp_path / name
+        out.mkdir()
+        summary = load(spec, target="files", destination=str(out), workers=workers, shard_size=shard_size)
+        assert summary["rows"] == {"companies": 20, "users": 50, "clients": 2 * BLOCK + 10, "user_clients": 2 * BLOCK + 10}
+        contents.append({table: "".join(p.read_text(encoding="utf-8") for p in sorted(out.glob(f"{table}.*"))) for table in ("companies", "users", "clients", "user_clients")})
+    assert contents[0] == contents[1]
+
+
+def test_inserts_rows_that_the_api_serves(capsys):
+    domain = f"gen{uuid.uuid4().hex[:8]}.example.com"
+    seed = uuid.uuid4().int % 10**6
+    assert main(["--companies", "5", "--users", "10", "--clients", "50", "--seed", str(seed), "--domain", domain, "--password", "genpass123", "--target", "insert"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["target"] == "insert" and summary["total_rows"] == 115
+
+    client = app.test_client()
+    email = next(row[2] for row in generate_block(Spec(seed=seed, companies=5, clients=50, users=10, password_hash="", domain=domain), "users", 0)["users"])
+    r = client.post("/login", json={"identifier": email, "password": "genpass123"})
+    assert r.status_code == 200, r.get_json()
+    db = SessionLocal()
+    try:
+        stored = db.execute(select(func.count()).select_from(Client).where(Client.email.like(f"%@{domain}"))).scalar_one()
+        owned = db.execute(select(func.count()).select_from(UserClient).join(Client, Client.id == UserClient.client_id).where(Client.email.like(f"%@{domain}"))).scalar_one()
+    finally:
+        db.close()
+    assert stored == owned == 50
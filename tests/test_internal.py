@@ -0,0 +1,24 @@
+from src.app import app
+
+
+def test_internal_pool_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("INTERNAL_ENDPOINTS_ENABLED", raising=False)
+    r = app.test_client().get("/internal/pool")
+    assert r.status_code == 404
+
+
+def test_internal_pool_reports_pool_state_and_metrics(monkeypatch):
+    monkeypatch.setenv("INTERNAL_ENDPOINTS_ENABLED", "true")
+    client = app.test_client()
+    # fuerza al menos un checkout
+    client.post("/login", json={"identifier": "nobody@example.com", "password": "x"})
+
+    r = client.get("/internal/pool")
+    assert r.status_code == 200
+    data = r.get_json()
+    assert data["pool"]["class"]
+    assert data["metrics"]["db_pool_checkout_seconds_count"] >= 1
+    assert "db_pool_checkout_timeouts_total" in data["metrics"]
+    assert {"hits", "misses"} <= set(data["auth_cache"])
+    assert {"users", "companies"} <= set(data["caches"])
+    assert "hit_ratio" in data["caches"]["companies"]
@@ -0,0 +1,113 @@
+import json
+import uuid
+
+from helpers import nit_base, valid_nit
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+
+from scripts.load_companies import main
+from src.dao.company_dao import CompanyDAO
+from src.database import SessionLocal
+from src.models.company import Company, CompanyStatus
+
+
+def _nit() -> tuple[str, str]:
+    base = nit_base()
+    return base, valid_nit(base)
+
+
+def _companies(bases):
+    db = SessionLocal()
+    try:
+        return {c.nit: c for c in db.execute(select(Company).where(Company.nit.in_(bases))).scalars()}
+    finally:
+        db.close()
+
+
+def test_load_companies_upserts_by_nit(tmp_path, capsys):
+    (b1, n1), (b2, n2) = _nit(), _nit()
+    path = tmp_path / "companies.csv"
+    path.write_text(
+        "nit,business_name,city\n"
+        f"{n1},Uno S.A.S.,Cali\n"
+        f"{n2},Dos S.A.S.,\n"
+        f"{b2}9,Bad DV,\n"
+        f"{n1},Repetida,\n",
+        encoding="utf-8",
+    )
+    assert main([str(path), "--batch-size", "2"]) == 1
+    out = json.loads(capsys.readouterr().out)
+    assert out["received"] == 4 and out["created"] == 2 and out["updated"] == 0
+    assert [e["row"] for e in out["errors"]] == [3, 4]
+    assert out["errors"][1]["error"] == "DUPLICATE_NIT"
+    assert out["rows_per_second"] > 0
+    stored = _companies([b1, b2])
+    assert stored[b1].city == "Cali" and stored[b2].city is None
+
+    path.write_text(f"nit,business_name,city\n{n2},Dos Renombrada,Bogotá\n", encoding="utf-8")
+    assert main([str(path)]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["created"] == 0 and out["updated"] == 1
+    assert _companies([b2])[b2].business_name == "Dos Renombrada"
+
+
+def test_load_companies_dry_run_does_not_write(tmp_path, capsys):
+    base, nit = _nit()
+    path = tmp_path / "companies.csv"
+    path.write_text(f"nit,business_name\n{nit},Seca\n", encoding="utf-8")
+    assert main([str(path), "--dry-run"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["dry_run"] is True and out["failed"] == 0 and out["created"] == 0
+    assert _companies([base]) == {}
+
+
+def test_partial_reimport_keeps_missing_columns(tmp_path, capsys):
+    base, nit = _nit()
+    db = SessionLocal()
+    try:
+        db.add(Company(
+            id=str(uuid.uuid4()), nit=base, business_name="Completa", description="Desc",
+            address="Calle 1", phone="3001234567", city="Cali", status=CompanyStatus.INACTIVE,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+    path = tmp_path / "companies.csv"
+    path.write_text(f"nit,business_name\n{nit},Completa Renombrada\n", encoding="utf-8")
+    assert main([str(path)]) == 0
+    assert json.loads(capsys.readouterr().out)["updated"] == 1
+    stored = _companies([base])[base]
+    assert stored.business_name == "Completa Renombrada"
+    assert (stored.description, stored.address, stored.phone, stored.city) == ("Desc", "Calle 1", "3001234567", "Cali")
+    assert stored.status == CompanyStatus.INACTIVE
+
+
+def test_failed_batch_nits_are_not_reported_as_duplicates(tmp_path, capsys, monkeypatch):
+    (b1, n1), (b2, n2) = _nit(), _nit()
+    original = CompanyDAO.upsert_many
+    calls = []
+
+    def flaky(self, rows, update_columns):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise DBAPIError("INSERT", {}, Exception("caída"))
+        return original(self, rows, update_columns)
+
+    monkeypatch.setattr(CompanyDAO, "upsert_many", flaky)
+    path = tmp_path / "companies.csv"
+    path.write_text(f"nit,business_name\n{n1},Uno\n{n2},Dos\n{n1},Uno otra vez\n", encoding="utf-8")
+    assert main([str(path), "--batch-size", "2"]) == 1
+    out = json.loads(capsys.readouterr().out)
+    assert [(e["row"], e["error"]) for e in out["errors"]] == [(1, "BATCH_FAILED"), (2, "BATCH_FAILED")]
+    assert out["created"] == 1 and set(_companies([b1, b2])) == {b1}
+
+
+def test_large_batch_stays_under_the_bind_parameter_limit(tmp_path, capsys):
+    # 7000 filas x ~10 columnas pasan los 65535 parámetros de PostgreSQL en una sola sentencia
+    bases = sorted({nit_base() for _ in range(7000)})
+    path = tmp_path / "companies.csv"
+    path.write_text("nit,business_name,city\n" + "".join(f"{valid_nit(b)},Lote {b},Cali\n" for b in bases), encoding="utf-8")
+    assert main([str(path), "--batch-size", "10000"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["failed"] == 0 and out["created"] + out["updated"] == len(bases)
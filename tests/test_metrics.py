@@ -0,0 +1,107 @@
+import os
+import subprocess
+import sys
+import uuid
+
+import pytest
+from helpers import auth_headers
+from prometheus_client.parser import text_string_to_metric_families
+
+from src.app import app
+from src.utils import instrumentation
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _samples(text: str) -> dict:
+    return {
+        (s.name, tuple(sorted(s.labels.items()))): s.value
+        for family in text_string_to_metric_families(text)
+        for s in family.samples
+    }
+
+
+def _value(samples: dict, name: str, **labels) -> float:
+    return samples.get((name, tuple(sorted(labels.items()))), 0.0)
+
+
+@pytest.fixture
+def metrics_enabled(monkeypatch):
+    monkeypatch.setattr(instrumentation, "enabled", True)
+
+
+def test_metrics_endpoint_disabled_by_default():
+    assert app.test_client().get("/metrics").status_code == 404
+
+
+def test_request_and_query_metrics(metrics_enabled):
+    client = app.test_client()
+    headers = auth_headers(client)
+    list_labels = dict(blueprint="clients", endpoint="clients.list_clients")
+    assert client.get("/auth", headers=headers).status_code == 200
+
+    before = _samples(client.get("/metrics").get_data(as_text=True))
+    # el usuario ya está en la caché: el listado es una sola sentencia
+    assert client.get("/clients?size=5", headers=headers).status_code == 200
+    assert client.get("/clients?size=abc", headers=headers).status_code == 400
+    assert client.get("/no-existe").status_code == 404
+    after = _samples(client.get("/metrics").get_data(as_text=True))
+
+    def delta(name, **labels):
+        return _value(after, name, **labels) - _value(before, name, **labels)
+
+    assert delta("http_requests_total", **list_labels, method="GET", status="200") == 1
+    assert delta("http_requests_total", **list_labels, method="GET", status="400") == 1
+    assert delta("http_requests_total", blueprint="", endpoint="<unmatched>", method="GET", status="404") == 1
+    assert delta("http_request_duration_seconds_count", **list_labels, method="GET") == 2
+    assert _value(after, "http_requests_in_flight", **list_labels) == 0
+    assert delta("http_request_db_queries_count", **list_labels) == 2
+    assert delta("http_request_db_queries_sum", **list_labels) == 1
+    assert delta("http_request_db_seconds_sum", **list_labels) > 0
+    assert delta("db_query_duration_seconds_count", dao="fetch_page") == 1
+    assert _value(after, "db_query_duration_seconds_count", dao="UserDAO.get_by_email") >= 1
+
+
+def test_dao_methods_label_their_statements(metrics_enabled):
+    from src.dao.user_dao import UserDAO
+    from src.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        before = _samples(app.test_client().get("/metrics").get_data(as_text=True))
+        UserDAO(db).get_by_nickname(f"nadie_{uuid.uuid4().hex[:8]}")
+    finally:
+        db.close()
+    after = _samples(app.test_client().get("/metrics").get_data(as_text=True))
+    name, labels = "db_query_duration_seconds_count", {"dao": "UserDAO.get_by_nickname"}
+    assert _value(after, name, **labels) - _value(before, name, **labels) == 1
+    assert UserDAO.get_by_nickname.__name__ == "get_by_nickname"
+
+
+_WORKER = """
+import sys
+from src.app import app
+client = app.test_client()
+for _ in range(int(sys.argv[1])):
+    assert client.get("/").status_code == 200
+"""
+
+_SCRAPE = """
+from src.app import app
+print(app.test_client().get("/metrics").get_data(as_text=True))
+"""
+
+
+def test_multiprocess_mode_aggregates_workers(tmp_path):
+    env = {**os.environ, "METRICS_ENABLED": "true", "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+
+    def run(code, *args):
+        return subprocess.run([sys.executable, "-c", code, *args], cwd=PROJECT_ROOT, env=env, check=True, capture_output=True, text=True).stdout
+
+    run(_WORKER, "3")
+    run(_WORKER, "4")
+    samples = _samples(run(_SCRAPE))
+    labels = dict(blueprint="", endpoint="healthcheck", method="GET")
+    assert _value(samples, "http_requests_total", **labels, status="200") == 7
+    assert _value(samples, "http_request_duration_seconds_count", **labels) == 7
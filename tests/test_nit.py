@@ -27,3 +27,59 @@ def test_nit_invalid_format_or_length(raw):
         validate_and_normalize_nit(raw)
 
 
+def test_validate_nits_batch():
+    from src.utils.nit import validate_nits
+
+    results = validate_nits(["800.197.268-4", "800197268-5", "", "8001972684", 8001972684])
+    assert results[0] == ("800197268", None)
+    assert results[1][0] is None and "DV" in results[1][1]
+    assert results[2][0] is None
+    assert results[3] == ("800197268", None)
+    assert results[4] == (None, "NIT must be a string")
+
+
+def test_compute_check_digits_matches_scalar():
+    import random
+
+    np = pytest.importorskip("numpy")
+    from src.utils.nit import compute_check_digit, compute_check_digits
+
+    rng = random.Random(1234)
+    bases = [f"{rng.randrange(10**9):09d}" for _ in range(5000)] + ["000000000", "999999999"]
+    expected = [compute_check_digit(b) for b in bases]
+    assert compute_check_digits(bases).tolist() == expected
+    assert compute_check_digits(np.array([int(b) for b in bases])).tolist() == expected
+    digits = np.array([[int(ch) for ch in b] for b in bases])
+    assert compute_check_digits(digits).tolist() == expected
+    with pytest.raises(ValueError):
+        compute_check_digits(["12345678"])
+
+
+def test_validate_nits_matches_scalar():
+    import random
+
+    from src.utils.nit import compute_check_digit, validate_nits
+
+    rng = random.Random(99)
+    values = []
+    for _ in range(3000):
+        base = f"{rng.randrange(10**9):09d}"
+        dv = compute_check_digit(base)
+        values.append(rng.choice([
+            f"{base}-{dv}",
+            f"{base[:3]}.{base[3:6]}.{base[6:]}-{dv}",
+            f" {base}{dv} ",
+            f"{base}-{(dv + 1) % 10}",
+            base,
+            f"{base}-{dv}x",
+            f"{base}{dv}{dv}",
+            "",
+        ]))
+
+    def scalar(value):
+        try:
+            return validate_and_normalize_nit(value), None
+        except ValueError as e:
+            return None, str(e)
+
+    assert validate_nits(values) == [scalar(v) for v in values]
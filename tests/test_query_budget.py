@@ -0,0 +1,86 @@
+import uuid
+
+from helpers import auth_headers
+
+from src import database
+from src.app import app
+from src.dao.user_dao import UserDAO
+from src.database import SessionLocal
+from src.utils import query_budget
+from src.utils.principal_cache import principal_cache
+from src.utils.query_budget import capture_queries
+
+
+def _headers(client) -> dict:
+    headers = auth_headers(client)
+    assert client.get("/auth", headers=headers).status_code == 200  # usuario en caché
+    return headers
+
+
+def test_warn_mode_reports_query_count(monkeypatch):
+    monkeypatch.setattr(query_budget, "mode", "warn")
+    client = app.test_client()
+    headers = _headers(client)
+    with capture_queries() as reports:
+        r = client.get("/clients?size=5&include_company=true", headers=headers)
+    assert r.status_code == 200
+    # con el usuario en caché, el listado con su compañía es una sola sentencia
+    assert r.headers["X-Query-Count"] == "1"
+    assert [(report.endpoint, report.count, report.ok) for report in reports] == [("clients.list_clients", 1, True)]
+
+
+def test_headers_only_in_warn_or_raise_mode():
+    client = app.test_client()
+    r = client.get("/clients", headers=_headers(client))
+    assert r.status_code == 200 and "X-Query-Count" not in r.headers
+
+
+def test_raise_mode_fails_requests_over_budget(monkeypatch):
+    monkeypatch.setattr(query_budget, "mode", "raise")
+    monkeypatch.setattr(app.view_functions["clients.list_clients"], "query_budget", 0)
+    client = app.test_client()
+    r = client.get("/clients", headers=_headers(client))
+    assert r.status_code == 500
+    body = r.get_json()
+    assert body["error"] == "QUERY_BUDGET_EXCEEDED"
+    assert (body["endpoint"], body["count"], body["budget"]) == ("clients.list_clients", 1, 0)
+
+
+def test_repeated_statements_are_flagged_as_n_plus_one():
+    db = SessionLocal()
+    try:
+        query_budget.start_request("naive_loop", 10)
+        for _ in range(3):
+            UserDAO(db).get_by_id(str(uuid.uuid4()))
+        report = query_budget.finish_request()
+    finally:
+        db.close()
+    assert report.count == 3 and not report.exceeded
+    assert list(report.repeated().values()) == [3] and not report.ok
+    assert query_budget.finish_request() is None
+
+
+def test_slow_selects_capture_their_plan(monkeypatch):
+    monkeypatch.setattr(query_budget, "slow_query_ms", 1e-6)
+    client = app.test_client()
+    headers = _headers(client)
+    with capture_queries() as reports:
+        assert client.get("/clients?size=5", headers=headers).status_code == 200
+    (report,) = reports
+    (explain,) = report.explains
+    assert explain["statement"].lstrip().upper().startswith("SELECT")
+    assert explain["plan"] and "error" not in explain
+
+
+def test_failed_explain_does_not_break_the_request(monkeypatch):
+    monkeypatch.setattr(query_budget, "slow_query_ms", 1e-6)
+    monkeypatch.setitem(query_budget._EXPLAIN_PREFIX, database.engine.dialect.name, "EXPLAIN NO_EXISTE ")
+    client = app.test_client()
+    headers = _headers(client)
+    principal_cache.clear()  # el usuario se lee de la base: dos SELECT en la misma transacción
+    with capture_queries() as reports:
+        r = client.get("/clients?size=5", headers=headers)
+    assert r.status_code == 200, r.get_json()
+    (report,) = reports
+    assert report.count == 2 and len(report.explains) == 2
+    assert all("error" in explain and "plan" not in explain for explain in report.explains)
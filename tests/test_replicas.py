@@ -0,0 +1,157 @@
+import sqlite3
+import uuid
+
+import pytest
+from helpers import account_with_company, valid_nit
+from sqlalchemy import create_engine
+
+from src import database
+from src.app import app
+from src.utils.cache import FakeRedis, LocalCache, RedisCache
+from src.utils.replicas import RecentWrites, ReplicaSet
+
+
+# Réplica atrasada = copia del archivo SQLite; el resto de tests usa una "réplica" sobre la misma base
+needs_snapshot = pytest.mark.skipif(database.engine.dialect.name != "sqlite", reason="réplicas atrasadas simuladas con copias de SQLite")
+
+
+def _recent_writes(window_seconds: float) -> RecentWrites:
+    return RecentWrites(LocalCache("recent_writes_test", ttl_seconds=window_seconds, max_size=100))
+
+
+def _snapshot(path) -> None:
+    # Réplica "atrasada": copia del primario en este instante
+    src, dst = sqlite3.connect(database.engine.url.database), sqlite3.connect(str(path))
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+
+
+def _same_database_replica():
+    # Segundo engine sobre la base del primario: sirve para ver a qué engine va cada sentencia
+    return create_engine(database.engine.url)
+
+
+def _add_client(client, headers, company_id) -> None:
+    r = client.post("/clients", json={"company_id": company_id, "email": f"r_{uuid.uuid4().hex[:8]}@example.com"}, headers=headers)
+    assert r.status_code == 201, r.get_json()
+
+
+def test_get_is_routed_to_replica_unless_the_user_just_wrote(monkeypatch, statements):
+    client = app.test_client()
+    headers, company_id = account_with_company(client)
+    replica = _same_database_replica()
+    monkeypatch.setattr(database, "replicas", ReplicaSet([replica], check_interval=60, retry_seconds=60))
+
+    monkeypatch.setattr(database, "recent_writes", _recent_writes(0))
+    with statements(replica) as on_replica:
+        _add_client(client, headers, company_id)
+    assert not on_replica
+    with statements(replica) as on_replica:
+        assert client.get("/clients", headers=headers).get_json()["total"] == 1
+    assert on_replica
+
+    monkeypatch.setattr(database, "recent_writes", _recent_writes(30))
+    _add_client(client, headers, company_id)
+    with statements(replica) as on_replica:
+        assert client.get("/clients", headers=headers).get_json()["total"] == 2
+    assert not on_replica
+
+
+@needs_snapshot
+def test_get_reads_from_replica_and_writers_read_their_writes(monkeypatch, tmp_path):
+    client = app.test_client()
+    headers, company_id = account_with_company(client)
+    _add_client(client, headers, company_id)
+    _snapshot(tmp_path / "replica.db")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(database, "replicas", ReplicaSet([replica], check_interval=60, retry_seconds=60))
+
+    # sin ventana de read-your-writes el GET lee la réplica, que no tiene el cliente nuevo
+    monkeypatch.setattr(database, "recent_writes", _recent_writes(0))
+    _add_client(client, headers, company_id)
+    assert client.get("/clients", headers=headers).get_json()["total"] == 1
+
+    # quien escribió lee del primario durante la ventana
+    monkeypatch.setattr(database, "recent_writes", _recent_writes(30))
+    _add_client(client, headers, company_id)
+    assert client.get("/clients", headers=headers).get_json()["total"] == 3
+
+
+def test_unhealthy_replica_is_skipped(monkeypatch, tmp_path, statements):
+    client = app.test_client()
+    headers, company_id = account_with_company(client)
+    _add_client(client, headers, company_id)
+    down = create_engine(f"sqlite:///{tmp_path / 'no-existe' / 'x.db'}")
+    healthy = _same_database_replica()
+    replicas = ReplicaSet([down, healthy], check_interval=60, retry_seconds=60)
+    monkeypatch.setattr(database, "replicas", replicas)
+    monkeypatch.setattr(database, "recent_writes", _recent_writes(0))
+
+    with statements(healthy) as on_replica:
+        for _ in range(4):
+            r = client.get("/clients", headers=headers)
+            assert r.status_code == 200
+            assert r.get_json()["total"] == 1
+    assert on_replica
+    assert [s["healthy"] for s in replicas.status()] == [False, True]
+
+    # sin réplicas sanas se lee del primario
+    monkeypatch.setattr(database, "replicas", ReplicaSet([down], check_interval=60, retry_seconds=60))
+    with statements() as on_primary:
+        assert client.get("/clients", headers=headers).get_json()["total"] == 1
+    assert on_primary
+
+
+def test_recent_writes_are_shared_through_the_cache_backend():
+    # dos workers con su propia RecentWrites sobre el mismo servidor Redis
+    client = FakeRedis()
+    worker_a, worker_b = (RecentWrites(RedisCache("recent_writes", client, ttl_seconds=30)) for _ in range(2))
+    user_id = str(uuid.uuid4())
+    assert not worker_b.active(user_id)
+    worker_a.mark(user_id)
+    assert worker_b.active(user_id)
+
+
+def test_replica_connections_have_a_connect_timeout(monkeypatch):
+    url = database.make_url("postgresql+psycopg://u:p@replica:5432/db")
+    assert database.replica_engine_options(url)["connect_args"]["connect_timeout"] == 2
+    monkeypatch.setenv("DB_REPLICA_CONNECT_TIMEOUT_SECONDS", "0")
+    assert "connect_timeout" not in database.replica_engine_options(url)["connect_args"]
+
+
+@needs_snapshot
+def test_company_cache_fills_from_the_primary(monkeypatch, tmp_path):
+    from src.services.company_service import company_cache
+
+    client = app.test_client()
+    headers, _ = account_with_company(client)
+    _snapshot(tmp_path / "replica.db")
+    company_id = client.post("/companies", json={"nit": valid_nit(), "business_name": "Nueva"}, headers=headers).get_json()["id"]
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(database, "replicas", ReplicaSet([replica], check_interval=60, retry_seconds=60))
+    monkeypatch.setattr(database, "recent_writes", _recent_writes(0))
+
+    # la réplica no tiene la compañía; la caché no debe guardar esa ausencia
+    company_cache.delete(company_id)
+    assert client.get(f"/companies/{company_id}", headers=headers).status_code == 200
+    assert company_cache.get(company_id).business_name == "Nueva"
+
+
+@needs_snapshot
+def test_principal_cache_fills_from_the_primary(monkeypatch, tmp_path):
+    from src.utils.principal_cache import principal_cache
+
+    client = app.test_client()
+    headers, _ = account_with_company(client)
+    _snapshot(tmp_path / "replica.db")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(database, "replicas", ReplicaSet([replica], check_interval=60, retry_seconds=60))
+    monkeypatch.setattr(database, "recent_writes", _recent_writes(0))
+
+    # la réplica aún tiene el token_version anterior al logout; la caché no debe guardarlo
+    assert client.post("/logout", headers=headers).status_code == 204
+    principal_cache.clear()
+    assert client.get("/clients", headers=headers).status_code == 401
@@ -169,3 +169,19 @@ def test_duplicate_email_and_nickname_conflicts():
     assert r5.get_json()["error"] == "NICKNAME_TAKEN"
 
 
+def test_user_writes_skip_refresh_selects(statements):
+    client = app.test_client()
+    email = _unique_email()
+    with statements() as seen:
+        r = client.post("/users", json={"name": "UoW", "email": email, "password": "pass123456"})
+    assert r.status_code == 201
+    # pre-chequeo de email (evita bcrypt si ya existe) + INSERT, sin refresh
+    assert seen.verbs == ["SELECT", "INSERT"]
+
+    uid = r.get_json()["id"]
+    headers = {"Authorization": f"Bearer {_login(email, 'pass123456')}"}
+    client.get("/auth", headers=headers)  # calienta la caché de principal
+    with statements() as seen:
+        r = client.patch(f"/users/{uid}", json={"name": "UoW 2"}, headers=headers)
+    assert r.status_code == 200 and r.get_json()["name"] == "UoW 2"
+    assert seen.verbs == ["SELECT", "UPDATE"]